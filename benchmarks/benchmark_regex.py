@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""
+Benchmark the per line cost of the version line regex
+
+Compares the former `re.search(pattern_string, line)` call, which has to look
+up the pattern in the module level cache of `re` on every call, with the
+precompiled pattern used by `ExtractVersion` and the complete changelog scan
+of the "line" and "mmap" engines.
+
+Usage: python benchmarks/benchmark_regex.py [--lines 100000]
+"""
+
+import argparse
+import re
+import tempfile
+import timeit
+from pathlib import Path
+
+from changelog2version.extract_version import ExtractVersion
+
+
+def create_changelog(file_path: Path,
+                     line_count: int,
+                     section_lines: int = 10) -> None:
+    """
+    Create a changelog with a release section every given number of lines
+
+    :param      file_path:      The path to the changelog file
+    :type       file_path:      Path
+    :param      line_count:     The number of lines
+    :type       line_count:     int
+    :param      section_lines:  The number of lines per release section
+    :type       section_lines:  int
+    """
+    lines = ["# Changelog", ""]
+    release = line_count // section_lines
+    while len(lines) < line_count:
+        lines.append("## [{}.{}.{}] - 2022-10-26".format(
+            release // 100, (release // 10) % 10, release % 10))
+        lines.append("### Fixed")
+        lines.extend("- Something fixed, see #{}".format(idx)
+                     for idx in range(max(section_lines - 3, 0)))
+        lines.append("")
+        release -= 1
+    file_path.write_text("\n".join(lines[:line_count]) + "\n")
+
+
+def main() -> None:
+    """Run the benchmark and print the results"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--lines', type=int, default=100000,
+                        help='Number of changelog lines')
+    parser.add_argument('--section_lines', type=int, default=10,
+                        help='Number of lines per release section')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='Number of repetitions, best one is reported')
+    args = parser.parse_args()
+
+    ev = ExtractVersion()
+    ev._logger.disabled = True
+    mmap_ev = ExtractVersion(logger=ev._logger)
+    mmap_ev.engine = "mmap"
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        changelog_file = Path(tmp_dir) / "changelog.md"
+        create_changelog(file_path=changelog_file,
+                         line_count=args.lines,
+                         section_lines=args.section_lines)
+        lines = changelog_file.read_text().splitlines(keepends=True)
+
+        version_line_regex = ev.version_line_regex
+        version_line_pattern = ev.version_line_pattern
+
+        def search_string() -> None:
+            for line in lines:
+                re.search(version_line_regex, line)
+
+        def search_compiled() -> None:
+            for line in lines:
+                version_line_pattern.search(line)
+
+        def parse_completely() -> None:
+            ev.parse_changelog_completely(changelog_file=changelog_file)
+
+        def parse_completely_mmap() -> None:
+            mmap_ev.parse_changelog_completely(changelog_file=changelog_file)
+
+        results = [
+            ("re.search(str, line)", search_string),
+            ("pattern.search(line)", search_compiled),
+            ("parse_changelog_completely", parse_completely),
+            ("parse_changelog_completely mmap", parse_completely_mmap),
+        ]
+        print("{} lines, best of {}".format(len(lines), args.repeat))
+        for name, func in results:
+            best = min(timeit.repeat(func, number=1, repeat=args.repeat))
+            print("{:<32} {:8.1f} ms {:8.1f} ns/line".format(
+                name, best * 1e3, best * 1e9 / len(lines)))
+
+
+if __name__ == '__main__':
+    main()
@@ -181,6 +181,9 @@ setup(
         "console_scripts": [
             "changelog2version=changelog2version.update_version:main",
         ],
+        "distutils.setup_keywords": [
+            "changelog2version=changelog2version.setuptools_plugin:changelog2version_keyword",  # noqa: E501
+        ],
     },
     # List additional URLs that are relevant to your project as a dict.
     #
@@ -0,0 +1,539 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""Parse changelogs and render version files in-process without the CLI"""
+
+import copy
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import (TYPE_CHECKING, Any, Dict, Iterable, List, Optional,
+                    Union)
+
+from .changelog_data import ParsedChangelog, Release
+
+if TYPE_CHECKING:
+    from .extract_version import ExtractVersion
+    from .release_query import ReleaseQuery
+    from .render_version_file import RenderTarget
+
+# default maximum number of parsed changelogs kept by a cache
+CACHE_SIZE = 256
+
+
+@dataclass(frozen=True)
+class VersionFile(object):
+    """Version file to render from a changelog"""
+    #: Path to the version file
+    file_path: Path
+    #: Path to a custom template file, the package template of the type if
+    #: None
+    template_file: Optional[Path] = None
+    #: Type of version file to generate, "py" or "c"
+    version_file_type: str = "py"
+
+
+@dataclass(frozen=True)
+class VersionFileResult(object):
+    """Result of rendering or validating a single version file"""
+    #: Path to the version file
+    file_path: Path
+    #: Template file the version file is rendered with
+    template: Union[Path, str]
+    #: Validation result, None if the version file has been rendered
+    valid: Optional[bool] = None
+
+
+@dataclass(frozen=True)
+class UpdateResult(object):
+    """Parsed changelog and the results of its version files"""
+    #: Parsed changelog
+    changelog: ParsedChangelog
+    #: Results of the version files in the given order
+    version_files: List[VersionFileResult]
+
+    @property
+    def ok(self) -> bool:
+        """
+        Get status of the version files
+
+        :returns:   True if no validated version file differs
+        :rtype:     bool
+        """
+        return not self.mismatches
+
+    @property
+    def mismatches(self) -> List[Path]:
+        """
+        Get version files differing from the latest changelog version
+
+        :returns:   Paths to the differing version files
+        :rtype:     List[Path]
+        """
+        return [result.file_path for result in self.version_files
+                if result.valid is False]
+
+
+def create_version_extractor(
+        version_line_regex: Optional[str] = None,
+        semver_line_regex: Optional[str] = None,
+        engine: str = "line",
+        index_file: Optional[Union[Path, str]] = None,
+        logger: Optional[logging.Logger] = None) -> 'ExtractVersion':
+    """
+    Create a configured changelog parser
+
+    :param      version_line_regex:  Regex of the complete version line, the
+                                     default one if None
+    :type       version_line_regex:  Optional[str]
+    :param      semver_line_regex:   Regex of the semver part of a version
+                                     line, the default one if None
+    :type       semver_line_regex:   Optional[str]
+    :param      engine:              Engine to scan the changelog
+    :type       engine:              str
+    :param      index_file:          Path to the index file of the releases
+    :type       index_file:          Optional[Union[Path, str]]
+    :param      logger:              Logger object
+    :type       logger:              Optional[logging.Logger]
+
+    :returns:   Changelog parser
+    :rtype:     ExtractVersion
+    """
+    from .extract_version import ExtractVersion
+
+    version_extractor = ExtractVersion(logger=logger)
+    if semver_line_regex:
+        version_extractor.semver_line_regex = semver_line_regex
+    if version_line_regex:
+        version_extractor.version_line_regex = version_line_regex
+    version_extractor.engine = engine
+    version_extractor.index_file = index_file
+
+    return version_extractor
+
+
+def parse_changelog(changelog_file: Union[Path, str],
+                    version_line_regex: Optional[str] = None,
+                    semver_line_regex: Optional[str] = None,
+                    engine: str = "line",
+                    index_file: Optional[Union[Path, str]] = None,
+                    logger: Optional[logging.Logger] = None,
+                    query: Optional['ReleaseQuery'] = None,
+                    descriptions: bool = False) -> ParsedChangelog:
+    """
+    Parse a changelog file
+
+    :param      changelog_file:      The path to the changelog file
+    :type       changelog_file:      Union[Path, str]
+    :param      version_line_regex:  Regex of the complete version line, the
+                                     default one if None
+    :type       version_line_regex:  Optional[str]
+    :param      semver_line_regex:   Regex of the semver part of a version
+                                     line, the default one if None
+    :type       semver_line_regex:   Optional[str]
+    :param      engine:              Engine to scan the changelog
+    :type       engine:              str
+    :param      index_file:          Path to the index file of the releases
+    :type       index_file:          Optional[Union[Path, str]]
+    :param      logger:              Logger object
+    :type       logger:              Optional[logging.Logger]
+    :param      query:               The release query, all releases if
+                                     None
+    :type       query:               Optional[ReleaseQuery]
+    :param      descriptions:        Flag to keep the descriptions of all
+                                     releases
+    :type       descriptions:        bool
+
+    :returns:   Parsed changelog
+    :rtype:     ParsedChangelog
+    """
+    version_extractor = create_version_extractor(
+        version_line_regex=version_line_regex,
+        semver_line_regex=semver_line_regex,
+        engine=engine,
+        index_file=index_file,
+        logger=logger)
+
+    return version_extractor.parse(changelog_file=Path(changelog_file),
+                                   query=query,
+                                   descriptions=descriptions)
+
+
+def get_release(changelog_file: Union[Path, str],
+                version: Optional[str] = None,
+                version_line_regex: Optional[str] = None,
+                semver_line_regex: Optional[str] = None,
+                engine: str = "line",
+                index_file: Optional[Union[Path, str]] = None,
+                logger: Optional[logging.Logger] = None) -> Optional[Release]:
+    """
+    Get a single release of a changelog file
+
+    With an index file only the section of the release is read, otherwise
+    the changelog is scanned up to the release.
+
+    :param      changelog_file:      The path to the changelog file
+    :type       changelog_file:      Union[Path, str]
+    :param      version:             The semantic version string, e.g.
+                                     "0.2.0", the latest release if None
+    :type       version:             Optional[str]
+    :param      version_line_regex:  Regex of the complete version line, the
+                                     default one if None
+    :type       version_line_regex:  Optional[str]
+    :param      semver_line_regex:   Regex of the semver part of a version
+                                     line, the default one if None
+    :type       semver_line_regex:   Optional[str]
+    :param      engine:              Engine to scan the changelog
+    :type       engine:              str
+    :param      index_file:          Path to the index file of the releases
+    :type       index_file:          Optional[Union[Path, str]]
+    :param      logger:              Logger object
+    :type       logger:              Optional[logging.Logger]
+
+    :returns:   Release, None if the version is not found
+    :rtype:     Optional[Release]
+    """
+    version_extractor = create_version_extractor(
+        version_line_regex=version_line_regex,
+        semver_line_regex=semver_line_regex,
+        engine=engine,
+        index_file=index_file,
+        logger=logger)
+
+    return version_extractor.get_release(changelog_file=Path(changelog_file),
+                                         version=version)
+
+
+class ChangelogCache(object):
+    """Parsed changelogs kept until the content of their file changes"""
+    def __init__(self, max_size: int = CACHE_SIZE):
+        """
+        Init ChangelogCache class
+
+        :param      max_size:  The maximum number of parsed changelogs, the
+                               least recently used ones are dropped
+        :type       max_size:  int
+        """
+        self._max_size = max_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """
+        Get number of cached changelogs
+
+        :returns:   Number of cached changelogs
+        :rtype:     int
+        """
+        return len(self._cache)
+
+    def clear(self) -> None:
+        """Drop all cached changelogs"""
+        with self._lock:
+            self._cache.clear()
+
+    def parse(self,
+              changelog_file: Union[Path, str],
+              version_line_regex: Optional[str] = None,
+              semver_line_regex: Optional[str] = None,
+              engine: str = "line",
+              index_file: Optional[Union[Path, str]] = None,
+              logger: Optional[logging.Logger] = None,
+              query: Optional['ReleaseQuery'] = None,
+              descriptions: bool = False) -> ParsedChangelog:
+        """
+        Parse a changelog file or get its cached result
+
+        The cached result is used as long as the fingerprint of the changelog
+        file is unchanged. The cache is safe to use from several threads.
+        All releases are cached, a release query bisects them. Each call gets
+        its own copy of the meta data, changing it does not change the
+        cached result.
+
+        :param      changelog_file:      The path to the changelog file
+        :type       changelog_file:      Union[Path, str]
+        :param      version_line_regex:  Regex of the complete version line,
+                                         the default one if None
+        :type       version_line_regex:  Optional[str]
+        :param      semver_line_regex:   Regex of the semver part of a
+                                         version line, the default one if
+                                         None
+        :type       semver_line_regex:   Optional[str]
+        :param      engine:              Engine to scan the changelog
+        :type       engine:              str
+        :param      index_file:          Path to the index file of the
+                                         releases
+        :type       index_file:          Optional[Union[Path, str]]
+        :param      logger:              Logger object
+        :type       logger:              Optional[logging.Logger]
+        :param      query:               The release query, all releases if
+                                         None
+        :type       query:               Optional[ReleaseQuery]
+        :param      descriptions:        Flag to keep the descriptions of all
+                                         releases
+        :type       descriptions:        bool
+
+        :returns:   Parsed changelog
+        :rtype:     ParsedChangelog
+        """
+        changelog = self._parse(changelog_file=changelog_file,
+                                version_line_regex=version_line_regex,
+                                semver_line_regex=semver_line_regex,
+                                engine=engine,
+                                index_file=index_file,
+                                logger=logger,
+                                descriptions=descriptions)
+
+        releases = changelog.releases
+        if query is not None:
+            releases = changelog.query_releases(query)
+
+        return replace(changelog,
+                       meta=copy.deepcopy(changelog.meta),
+                       releases=releases)
+
+    def _parse(self,
+               changelog_file: Union[Path, str],
+               version_line_regex: Optional[str],
+               semver_line_regex: Optional[str],
+               engine: str,
+               index_file: Optional[Union[Path, str]],
+               logger: Optional[logging.Logger],
+               descriptions: bool) -> ParsedChangelog:
+        """
+        Parse a changelog file with all releases or get its cached result
+
+        :param      changelog_file:      The path to the changelog file
+        :type       changelog_file:      Union[Path, str]
+        :param      version_line_regex:  Regex of the complete version line
+        :type       version_line_regex:  Optional[str]
+        :param      semver_line_regex:   Regex of the semver part of a
+                                         version line
+        :type       semver_line_regex:   Optional[str]
+        :param      engine:              Engine to scan the changelog
+        :type       engine:              str
+        :param      index_file:          Path to the index file of the
+                                         releases
+        :type       index_file:          Optional[Union[Path, str]]
+        :param      logger:              Logger object
+        :type       logger:              Optional[logging.Logger]
+        :param      descriptions:        Flag to keep the descriptions of all
+                                         releases
+        :type       descriptions:        bool
+
+        :returns:   Parsed changelog
+        :rtype:     ParsedChangelog
+        """
+        from .fingerprint import FileFingerprint
+
+        changelog_file = Path(changelog_file).resolve()
+        key = (str(changelog_file), version_line_regex, semver_line_regex,
+               engine, None if index_file is None else str(index_file),
+               descriptions)
+
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+
+        if cached is not None:
+            fingerprint, changelog = cached
+            current_fingerprint = fingerprint.refresh(changelog_file)
+            if current_fingerprint is not None:
+                if current_fingerprint != fingerprint:
+                    with self._lock:
+                        self._cache[key] = (current_fingerprint, changelog)
+                return changelog
+
+        # take the fingerprint before parsing, a change while parsing
+        # outdates the cached result on its next usage
+        fingerprint = FileFingerprint.from_file(changelog_file)
+
+        changelog = parse_changelog(changelog_file=changelog_file,
+                                    version_line_regex=version_line_regex,
+                                    semver_line_regex=semver_line_regex,
+                                    engine=engine,
+                                    index_file=index_file,
+                                    logger=logger,
+                                    descriptions=descriptions)
+
+        with self._lock:
+            self._cache[key] = (fingerprint, changelog)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self._max_size:
+                self._cache.popitem(last=False)
+
+        return changelog
+
+
+def create_render_targets(
+        version_files: Iterable[VersionFile]) -> List['RenderTarget']:
+    """
+    Create the render targets of version files with their templates
+
+    :param      version_files:  The version files
+    :type       version_files:  Iterable[VersionFile]
+
+    :returns:   Version files with their templates
+    :rtype:     List[RenderTarget]
+    """
+    version_files = list(version_files)
+    if not version_files:
+        return []
+
+    from .render_version_file import RenderTarget, select_template_file
+
+    return [
+        RenderTarget(
+            file_path=Path(version_file.file_path).resolve(),
+            template=select_template_file(
+                template_file=version_file.template_file,
+                version_file_type=version_file.version_file_type))
+        for version_file in version_files
+    ]
+
+
+def render_version_files(
+        changelog: ParsedChangelog,
+        version_files: Iterable[VersionFile],
+        additional_version_info: Optional[str] = None,
+        additional_template_data: Optional[Dict[str, Any]] = None,
+        validate: bool = False,
+        workers: int = 1,
+        bytecode_cache_dir: Optional[Union[Path, str]] = None,
+        logger: Optional[logging.Logger] = None) -> List[VersionFileResult]:
+    """
+    Render or validate version files of the latest version of a changelog
+
+    :param      changelog:                 The parsed changelog
+    :type       changelog:                 ParsedChangelog
+    :param      version_files:             The version files
+    :type       version_files:             Iterable[VersionFile]
+    :param      additional_version_info:   Additional version info like
+                                           "-rc1234"
+    :type       additional_version_info:   Optional[str]
+    :param      additional_template_data:  Additional data to render the
+                                           templates
+    :type       additional_template_data:  Optional[Dict[str, Any]]
+    :param      validate:                  Validate the existing version
+                                           files instead of rendering them
+    :type       validate:                  bool
+    :param      workers:                   The maximum number of threads
+    :type       workers:                   int
+    :param      bytecode_cache_dir:        Directory to cache compiled
+                                           templates
+    :type       bytecode_cache_dir:        Optional[Union[Path, str]]
+    :param      logger:                    Logger object
+    :type       logger:                    Optional[logging.Logger]
+
+    :returns:   Result of each version file in the given order
+    :rtype:     List[VersionFileResult]
+    """
+    targets = create_render_targets(version_files=version_files)
+    if not targets:
+        return []
+
+    from .render_version_file import (create_version_file_content,
+                                      render_files, validate_files)
+
+    version_file_content = create_version_file_content(
+        semver_data=changelog.semver_data,
+        additional_version_info=additional_version_info,
+        additional_template_data=additional_template_data)
+
+    if validate:
+        results = validate_files(targets=targets,
+                                 content=version_file_content,
+                                 workers=workers,
+                                 logger=logger,
+                                 bytecode_cache_dir=bytecode_cache_dir)
+    else:
+        render_files(targets=targets,
+                     content=version_file_content,
+                     workers=workers,
+                     logger=logger,
+                     bytecode_cache_dir=bytecode_cache_dir)
+        results = [None] * len(targets)
+
+    return [VersionFileResult(file_path=target.file_path,
+                              template=target.template,
+                              valid=valid)
+            for target, valid in zip(targets, results)]
+
+
+def update_version_files(
+        changelog_file: Union[Path, str],
+        version_files: Iterable[VersionFile],
+        additional_version_info: Optional[str] = None,
+        additional_template_data: Optional[Dict[str, Any]] = None,
+        validate: bool = False,
+        version_line_regex: Optional[str] = None,
+        semver_line_regex: Optional[str] = None,
+        engine: str = "line",
+        index_file: Optional[Union[Path, str]] = None,
+        workers: int = 1,
+        bytecode_cache_dir: Optional[Union[Path, str]] = None,
+        logger: Optional[logging.Logger] = None) -> UpdateResult:
+    """
+    Parse a changelog and render or validate its version files
+
+    This is the in-process equivalent of a call of the CLI. Nothing is
+    printed and no logging is configured, mismatching version files are
+    reported by the result instead of an exit code.
+
+    :param      changelog_file:            The path to the changelog file
+    :type       changelog_file:            Union[Path, str]
+    :param      version_files:             The version files
+    :type       version_files:             Iterable[VersionFile]
+    :param      additional_version_info:   Additional version info like
+                                           "-rc1234"
+    :type       additional_version_info:   Optional[str]
+    :param      additional_template_data:  Additional data to render the
+                                           templates
+    :type       additional_template_data:  Optional[Dict[str, Any]]
+    :param      validate:                  Validate the existing version
+                                           files instead of rendering them
+    :type       validate:                  bool
+    :param      version_line_regex:        Regex of the complete version
+                                           line, the default one if None
+    :type       version_line_regex:        Optional[str]
+    :param      semver_line_regex:         Regex of the semver part of a
+                                           version line, the default one if
+                                           None
+    :type       semver_line_regex:         Optional[str]
+    :param      engine:                    Engine to scan the changelog
+    :type       engine:                    str
+    :param      index_file:                Path to the index file of the
+                                           releases
+    :type       index_file:                Optional[Union[Path, str]]
+    :param      workers:                   The maximum number of threads
+    :type       workers:                   int
+    :param      bytecode_cache_dir:        Directory to cache compiled
+                                           templates
+    :type       bytecode_cache_dir:        Optional[Union[Path, str]]
+    :param      logger:                    Logger object
+    :type       logger:                    Optional[logging.Logger]
+
+    :returns:   Parsed changelog and the result of each version file
+    :rtype:     UpdateResult
+    """
+    changelog = parse_changelog(changelog_file=changelog_file,
+                                version_line_regex=version_line_regex,
+                                semver_line_regex=semver_line_regex,
+                                engine=engine,
+                                index_file=index_file,
+                                logger=logger)
+
+    results = render_version_files(
+        changelog=changelog,
+        version_files=version_files,
+        additional_version_info=additional_version_info,
+        additional_template_data=additional_template_data,
+        validate=validate,
+        workers=workers,
+        bytecode_cache_dir=bytecode_cache_dir,
+        logger=logger)
+
+    return UpdateResult(changelog=changelog, version_files=results)
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""Process many changelogs at once on a pool of worker processes"""
+
+import glob
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, fields
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from .api import VersionFile, parse_changelog, render_version_files
+
+# number of chunks per worker to balance the load of differently sized jobs
+CHUNKS_PER_WORKER = 4
+# default options relative to the directory of each changelog
+CHANGELOG_RELATIVE_OPTIONS = ("version_file", "index_file")
+
+
+class BatchError(Exception):
+    """Base class for exceptions in this module."""
+    pass
+
+
+@dataclass(frozen=True)
+class BatchJob(object):
+    """Changelog and the version file to render from it"""
+    #: Path to the changelog file
+    changelog_file: Path
+    #: Path to the rendered version file, nothing is rendered if None
+    version_file: Optional[Path] = None
+    #: Path to a custom template file
+    template_file: Optional[Path] = None
+    #: Type of version file to generate, "py" or "c"
+    version_file_type: str = "py"
+    #: Additional data to render the template
+    additional_template_data: Optional[Dict[str, Any]] = None
+    #: Additional version informations like "-rc1234"
+    additional_version_info: Optional[str] = None
+    #: Regex to extract the complete version line from the changelog
+    version_line_regex: Optional[str] = None
+    #: Regex to extract the semver part of a version line
+    semver_line_regex: Optional[str] = None
+    #: Engine to scan the changelog
+    engine: str = "line"
+    #: Path to the index file of the changelog releases
+    index_file: Optional[Path] = None
+    #: Validate the existing version file instead of rendering it
+    validate: bool = False
+    #: Directory to cache compiled templates across processes
+    bytecode_cache_dir: Optional[Path] = None
+
+    @classmethod
+    def from_dict(cls,
+                  data: Dict[str, Any],
+                  root: Optional[Path] = None) -> 'BatchJob':
+        """
+        Create a job from its dictionary representation
+
+        :param      data:  The job data, at least "changelog_file"
+        :type       data:  Dict[str, Any]
+        :param      root:  The directory relative paths are based on
+        :type       root:  Optional[Path]
+
+        :returns:   Batch job
+        :rtype:     BatchJob
+        """
+        known_fields = {field.name for field in fields(cls)}
+        unknown_fields = set(data.keys()) - known_fields
+        if unknown_fields:
+            raise BatchError("Unknown job options: {}".format(
+                ", ".join(sorted(unknown_fields))))
+
+        data = dict(data)
+        for key in ("changelog_file", "version_file", "template_file",
+                    "index_file", "bytecode_cache_dir"):
+            if data.get(key) is not None:
+                path = Path(data[key])
+                if root is not None and not path.is_absolute():
+                    path = root / path
+                data[key] = path
+
+        return cls(**data)
+
+
+@dataclass(frozen=True)
+class BatchResult(object):
+    """Result of a single batch job"""
+    #: The processed job
+    job: BatchJob
+    #: Semantic version string of the latest release, None on failure
+    version: Optional[str] = None
+    #: Error message, None on success
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        """
+        Get status of the job
+
+        :returns:   True if the job succeeded, False otherwise
+        :rtype:     bool
+        """
+        return self.error is None
+
+    def to_dict(self) -> Dict[str, Optional[str]]:
+        """
+        Get the result in a JSON serializable format
+
+        :returns:   Result with changelog and version file as strings
+        :rtype:     Dict[str, Optional[str]]
+        """
+        version_file = self.job.version_file
+        return {
+            "changelog_file": str(self.job.changelog_file),
+            "version_file": None if version_file is None else str(
+                version_file),
+            "version": self.version,
+            "error": self.error,
+        }
+
+
+def process_job(job: BatchJob) -> BatchResult:
+    """
+    Parse the changelog of a job and render or validate its version file
+
+    Errors are reported in the result instead of being raised, to not abort
+    the other jobs of a batch.
+
+    :param      job:  The job
+    :type       job:  BatchJob
+
+    :returns:   Result of the job
+    :rtype:     BatchResult
+    """
+    logger = logging.getLogger(__name__)
+
+    try:
+        parsed_changelog = parse_changelog(
+            changelog_file=job.changelog_file,
+            version_line_regex=job.version_line_regex,
+            semver_line_regex=job.semver_line_regex,
+            engine=job.engine,
+            index_file=job.index_file,
+            logger=logger)
+
+        if job.version_file is not None:
+            version_file = VersionFile(
+                file_path=job.version_file,
+                template_file=job.template_file,
+                version_file_type=job.version_file_type)
+            results = render_version_files(
+                changelog=parsed_changelog,
+                version_files=[version_file],
+                additional_version_info=job.additional_version_info,
+                additional_template_data=job.additional_template_data,
+                validate=job.validate,
+                bytecode_cache_dir=job.bytecode_cache_dir,
+                logger=logger)
+
+            if results[0].valid is False:
+                return BatchResult(
+                    job=job,
+                    version=parsed_changelog.version,
+                    error='Mismatch between version file and latest '
+                          'changelog version')
+    except Exception as e:
+        logger.debug("Processing '{}' failed: {}".format(
+            job.changelog_file, e))
+        return BatchResult(job=job,
+                           error="{}: {}".format(type(e).__name__, e))
+
+    return BatchResult(job=job, version=parsed_changelog.version)
+
+
+def run_batch(jobs: Iterable[BatchJob],
+              workers: Optional[int] = None) -> List[BatchResult]:
+    """
+    Process the jobs on a pool of worker processes
+
+    Every worker process imports the package and its dependencies only once
+    for all of its jobs. A single worker processes the jobs in this process.
+
+    :param      jobs:     The jobs
+    :type       jobs:     Iterable[BatchJob]
+    :param      workers:  The number of worker processes, the number of CPUs
+                          if None
+    :type       workers:  Optional[int]
+
+    :returns:   Results in the order of the jobs
+    :rtype:     List[BatchResult]
+    """
+    jobs = list(jobs)
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise BatchError("Number of workers has to be at least 1")
+
+    workers = min(workers, len(jobs))
+    if workers <= 1:
+        return [process_job(job) for job in jobs]
+
+    chunksize = max(1, len(jobs) // (workers * CHUNKS_PER_WORKER))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(process_job, jobs, chunksize=chunksize))
+
+
+def summary_exit_code(results: Iterable[BatchResult]) -> int:
+    """
+    Get the exit code of a batch
+
+    :param      results:  The results of the batch
+    :type       results:  Iterable[BatchResult]
+
+    :returns:   0 if all jobs succeeded, 1 otherwise
+    :rtype:     int
+    """
+    return 0 if all(result.ok for result in results) else 1
+
+
+def create_job(data: Dict[str, Any],
+               defaults: Optional[Dict[str, Any]] = None,
+               root: Optional[Path] = None) -> BatchJob:
+    """
+    Create a job with default options for all unspecified options
+
+    Relative paths of the default version file and index file are based on
+    the directory of the changelog, all other relative paths on the root.
+
+    :param      data:      The job data, at least "changelog_file"
+    :type       data:      Dict[str, Any]
+    :param      defaults:  The default options of all jobs
+    :type       defaults:  Optional[Dict[str, Any]]
+    :param      root:      The directory relative paths are based on
+    :type       root:      Optional[Path]
+
+    :returns:   Batch job
+    :rtype:     BatchJob
+    """
+    if not isinstance(data, dict):
+        raise BatchError("Job has to be an object: {}".format(data))
+    if "changelog_file" not in data:
+        raise BatchError("Job without 'changelog_file': {}".format(data))
+
+    changelog_file = Path(data["changelog_file"])
+    if root is not None:
+        # the paths based on the changelog of the default options are joined
+        # with the root once here, the job keeps them as absolute paths
+        root = Path(root).absolute()
+        changelog_file = root / changelog_file
+
+    options = {}
+    for key, value in (defaults or {}).items():
+        if key in CHANGELOG_RELATIVE_OPTIONS and value is not None:
+            value = changelog_file.parent / value
+        options[key] = value
+    options.update(data)
+
+    return BatchJob.from_dict(data=options, root=root)
+
+
+def load_jobs(jobs_file: Union[Path, str],
+              defaults: Optional[Dict[str, Any]] = None) -> List[BatchJob]:
+    """
+    Load the jobs of a JSON file
+
+    The file contains a list of job objects with at least "changelog_file"
+    and the other options of a BatchJob. Relative paths are based on the
+    directory of the jobs file.
+
+    :param      jobs_file:  The path to the JSON jobs file
+    :type       jobs_file:  Union[Path, str]
+    :param      defaults:   The default options of all jobs
+    :type       defaults:   Optional[Dict[str, Any]]
+
+    :returns:   Batch jobs
+    :rtype:     List[BatchJob]
+
+    :raises     BatchError:  The jobs file is no valid JSON list of jobs
+    """
+    jobs_file = Path(jobs_file)
+    try:
+        data = json.loads(jobs_file.read_text())
+    except ValueError as e:
+        raise BatchError("Jobs file '{}' is no valid JSON: {}".format(
+            jobs_file, e))
+    if not isinstance(data, list):
+        raise BatchError("Jobs file '{}' has to contain a list of jobs".
+                         format(jobs_file))
+
+    return [create_job(data=job, defaults=defaults, root=jobs_file.parent)
+            for job in data]
+
+
+def find_jobs(pattern: str,
+              defaults: Optional[Dict[str, Any]] = None) -> List[BatchJob]:
+    """
+    Create a job for each changelog file matching a glob pattern
+
+    :param      pattern:   The glob pattern, e.g. "packages/*/CHANGELOG.md"
+    :type       pattern:   str
+    :param      defaults:  The default options of all jobs
+    :type       defaults:  Optional[Dict[str, Any]]
+
+    :returns:   Batch jobs sorted by changelog file
+    :rtype:     List[BatchJob]
+    """
+    jobs = []
+
+    for changelog_file in sorted(glob.glob(pattern, recursive=True)):
+        changelog_file = Path(changelog_file).resolve()
+        if changelog_file.is_file():
+            jobs.append(create_job(data={"changelog_file": changelog_file},
+                                   defaults=defaults))
+
+    return jobs
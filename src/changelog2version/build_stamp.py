@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""Stamp of the inputs and outputs of a call to skip unchanged calls"""
+
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Union
+
+from .file_utils import write_file_if_changed
+from .fingerprint import FileFingerprint
+
+# version of the stamp file format, increase on incompatible changes
+STAMP_FORMAT_VERSION = 1
+
+
+def options_sha1(options: Dict[str, Any]) -> str:
+    """
+    Get the SHA1 hex digest of JSON serializable options
+
+    :param      options:  The options
+    :type       options:  Dict[str, Any]
+
+    :returns:   SHA1 hex digest
+    :rtype:     str
+    """
+    data = json.dumps(options, sort_keys=True, default=str)
+    return hashlib.sha1(data.encode()).hexdigest()
+
+
+def fingerprint_files(
+        files: Iterable[Union[Path, str]]) -> Dict[str, FileFingerprint]:
+    """
+    Get the fingerprints of files
+
+    :param      files:  The paths to the files
+    :type       files:  Iterable[Union[Path, str]]
+
+    :returns:   Fingerprint of each file
+    :rtype:     Dict[str, FileFingerprint]
+    """
+    return {str(file): FileFingerprint.from_file(file) for file in files}
+
+
+class BuildStamp(object):
+    """Fingerprints of the input and output files and options of a call"""
+    def __init__(self,
+                 stamp_file: Union[Path, str],
+                 logger: Optional[logging.Logger] = None):
+        """
+        Init BuildStamp class
+
+        :param      stamp_file:  The path to the stamp file
+        :type       stamp_file:  Union[Path, str]
+        :param      logger:      Logger object
+        :type       logger:      Optional[logging.Logger]
+        """
+        if logger is None:
+            logger = logging.getLogger(__name__)
+        self._logger = logger
+
+        self._stamp_file = Path(stamp_file)
+
+    @property
+    def stamp_file(self) -> Path:
+        """
+        Get path to the stamp file
+
+        :returns:   Path to the stamp file
+        :rtype:     Path
+        """
+        return self._stamp_file
+
+    def is_up_to_date(self, options: Dict[str, Any]) -> bool:
+        """
+        Check the stamp file matches the options and all stamped files
+
+        The files are compared by size and modification time first, their
+        content is only hashed if the modification time changed. Refreshed
+        modification times of unchanged files are saved to the stamp file.
+
+        :param      options:  The options of this call
+        :type       options:  Dict[str, Any]
+
+        :returns:   True if nothing changed since the stamp was saved
+        :rtype:     bool
+        """
+        try:
+            data = json.loads(self.stamp_file.read_text())
+            if data["format"] != STAMP_FORMAT_VERSION:
+                return False
+            stored_options_sha1 = data["options_sha1"]
+            inputs = {file: FileFingerprint.from_dict(fingerprint)
+                      for file, fingerprint in data["inputs"].items()}
+            outputs = {file: FileFingerprint.from_dict(fingerprint)
+                       for file, fingerprint in data["outputs"].items()}
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            self._logger.debug("Stamp file '{}' not usable: {}".
+                               format(self.stamp_file, e))
+            return False
+
+        if stored_options_sha1 != options_sha1(options):
+            self._logger.debug("Options changed since stamp file '{}'".
+                               format(self.stamp_file))
+            return False
+
+        refreshed = False
+        for fingerprints in (inputs, outputs):
+            for file, fingerprint in fingerprints.items():
+                current_fingerprint = fingerprint.refresh(file)
+                if current_fingerprint is None:
+                    self._logger.debug("File '{}' changed since stamp file "
+                                       "'{}'".format(file, self.stamp_file))
+                    return False
+                if current_fingerprint != fingerprint:
+                    fingerprints[file] = current_fingerprint
+                    refreshed = True
+
+        if refreshed:
+            # content is unchanged, keep the stamp valid for the new mtimes
+            self._write(options=options, inputs=inputs, outputs=outputs)
+
+        return True
+
+    def save(self,
+             options: Dict[str, Any],
+             inputs: Dict[str, FileFingerprint],
+             output_files: Iterable[Union[Path, str]]) -> None:
+        """
+        Save the stamp of a successful call
+
+        The fingerprints of the input files shall be taken before they are
+        read, a change while reading outdates the stamp on its next usage.
+
+        :param      options:       The options of the call
+        :type       options:       Dict[str, Any]
+        :param      inputs:        The fingerprints of the input files
+        :type       inputs:        Dict[str, FileFingerprint]
+        :param      output_files:  The paths to the output files
+        :type       output_files:  Iterable[Union[Path, str]]
+        """
+        self._write(options=options,
+                    inputs=inputs,
+                    outputs=fingerprint_files(output_files))
+
+        self._logger.debug("Saved stamp file '{}'".format(self.stamp_file))
+
+    def _write(self,
+               options: Dict[str, Any],
+               inputs: Dict[str, FileFingerprint],
+               outputs: Dict[str, FileFingerprint]) -> None:
+        """
+        Write the stamp file atomically
+
+        :param      options:  The options of the call
+        :type       options:  Dict[str, Any]
+        :param      inputs:   The fingerprints of the input files
+        :type       inputs:   Dict[str, FileFingerprint]
+        :param      outputs:  The fingerprints of the output files
+        :type       outputs:  Dict[str, FileFingerprint]
+        """
+        data = {
+            "format": STAMP_FORMAT_VERSION,
+            "options_sha1": options_sha1(options),
+            "inputs": {file: fingerprint.to_dict()
+                       for file, fingerprint in inputs.items()},
+            "outputs": {file: fingerprint.to_dict()
+                        for file, fingerprint in outputs.items()},
+        }
+
+        write_file_if_changed(file_path=self.stamp_file,
+                              data=json.dumps(data, indent=4).encode())
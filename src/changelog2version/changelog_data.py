@@ -0,0 +1,490 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""Data containers for the results of a parsed changelog"""
+
+import ast
+import copy
+import json
+import logging
+import mmap
+import re
+import sys
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union
+
+from semver import VersionInfo
+
+if TYPE_CHECKING:
+    from .release_query import ReleaseIndex, ReleaseQuery
+
+# encoding of changelog files read as bytes
+ENCODING = "utf-8"
+# line endings of universal newlines mode
+NEWLINE_PATTERN = re.compile(r"\r\n|\r|\n")
+# line endings of universal newlines mode in undecoded content
+NEWLINE_BYTES_PATTERN = re.compile(NEWLINE_PATTERN.pattern.encode(ENCODING))
+# meta comment like "<!-- meta = {'type': 'feature'} -->" on a single line
+META_COMMENT_PATTERN = re.compile(
+    r"(<!--[ \t]meta[ \t]=[ \t])([^\r\n]*?)([ \t]-->)")
+# meta comment in an undecoded section
+META_COMMENT_BYTES_PATTERN = re.compile(
+    META_COMMENT_PATTERN.pattern.encode(ENCODING))
+# number of distinct meta comments kept decoded
+META_CACHE_SIZE = 1024
+# complete semantic version string of the SemVer 2.0.0 specification
+SEMVER_PATTERN = re.compile(
+    r"(?:0|[1-9]\d*)\.(?:0|[1-9]\d*)\.(?:0|[1-9]\d*)"
+    r"(?:-(?:0|[1-9]\d*|\d*[a-zA-Z-][0-9a-zA-Z-]*)"
+    r"(?:\.(?:0|[1-9]\d*|\d*[a-zA-Z-][0-9a-zA-Z-]*))*)?"
+    r"(?:\+[0-9a-zA-Z-]+(?:\.[0-9a-zA-Z-]+)*)?")
+
+
+def is_valid_semver(version: str) -> bool:
+    """
+    Check a string to be a valid semantic version
+
+    Like "VersionInfo.isvalid" without creating a VersionInfo object, a
+    trailing line break is invalid as well.
+
+    :param      version:  The version string, e.g. "0.2.0"
+    :type       version:  str
+
+    :returns:   True if the version is valid, False otherwise
+    :rtype:     bool
+    """
+    return SEMVER_PATTERN.fullmatch(version) is not None
+
+
+def split_lines(text: str) -> List[str]:
+    """
+    Split text into lines like reading a file in universal newlines mode
+
+    :param      text:  The text
+    :type       text:  str
+
+    :returns:   Lines without line endings
+    :rtype:     List[str]
+    """
+    lines = NEWLINE_PATTERN.split(text)
+    if lines[-1] == "":
+        # text ends with a line ending or is empty
+        lines.pop()
+    return lines
+
+
+def decode_description_lines(section: Union[str, bytes, memoryview]
+                             ) -> List[str]:
+    """
+    Decode a release section into stripped description lines
+
+    :param      section:  The undecoded section content
+    :type       section:  Union[str, bytes, memoryview]
+
+    :returns:   Stripped description lines
+    :rtype:     List[str]
+    """
+    if not isinstance(section, str):
+        section = str(section, ENCODING)
+    return [line.strip() for line in split_lines(section)]
+
+
+def find_meta_comment(line: str) -> str:
+    """
+    Find the meta comment of a line
+
+    :param      line:  The line
+    :type       line:  str
+
+    :returns:   Interned payload of the meta comment, e.g. "{'a': 1}", empty
+                if the line has no meta comment
+    :rtype:     str
+    """
+    if "<!--" not in line:
+        return ""
+
+    match = META_COMMENT_PATTERN.search(line)
+    if match is None:
+        return ""
+    return sys.intern(match.group(2))
+
+
+class SectionMetaScanner(object):
+    """Find the meta comments of the consecutive sections of a buffer"""
+    def __init__(self,
+                 buffer: Union[bytes, mmap.mmap],
+                 endpos: Optional[int] = None):
+        """
+        Init SectionMetaScanner class
+
+        The buffer is searched once for all meta comments on the first
+        search, the sections without a meta comment cost no further search.
+
+        :param      buffer:  The undecoded changelog content
+        :type       buffer:  Union[bytes, mmap.mmap]
+        :param      endpos:  The offset to stop searching at, the end of the
+                             buffer if None
+        :type       endpos:  Optional[int]
+        """
+        self._matches = META_COMMENT_BYTES_PATTERN.finditer(
+            buffer, 0, len(buffer) if endpos is None else endpos)
+        self._match = None
+        self._started = False
+
+    def find(self, start: int, end: int) -> str:
+        """
+        Find the first meta comment of a section
+
+        Sections have to be given in the order of the buffer.
+
+        :param      start:  The byte offset of the section
+        :type       start:  int
+        :param      end:    The byte offset of the end of the section
+        :type       end:    int
+
+        :returns:   Interned payload of the meta comment, empty if the section
+                    has no meta comment
+        :rtype:     str
+        """
+        if not self._started:
+            self._match = next(self._matches, None)
+            self._started = True
+
+        match = self._match
+        while match is not None and match.start() < start:
+            match = next(self._matches, None)
+        self._match = match
+
+        if match is None or match.start() >= end:
+            return ""
+        return sys.intern(match.group(2).decode(ENCODING))
+
+
+def decode_meta_comment(payload: str) -> Dict[str, Any]:
+    """
+    Decode the payload of a meta comment
+
+    The payload is evaluated as Python literal like "{'a': \"it's\"}"
+    without executing any code, JSON literals like "true" are accepted as
+    well. Identical payloads are decoded only once, each call gets its own
+    copy of the meta data.
+
+    :param      payload:  The payload, e.g. "{'type': 'feature'}"
+    :type       payload:  str
+
+    :returns:   Meta data
+    :rtype:     Dict[str, Any]
+
+    :raises     ValueError:  The payload is neither a literal nor JSON
+    """
+    return copy.deepcopy(_decode_meta_payload(payload))
+
+
+@lru_cache(maxsize=META_CACHE_SIZE)
+def _decode_meta_payload(payload: str) -> Dict[str, Any]:
+    """
+    Decode the payload of a meta comment once
+
+    The result is kept by the cache and never returned to callers of
+    "decode_meta_comment", only copies of it.
+
+    :param      payload:  The payload, e.g. "{'type': 'feature'}"
+    :type       payload:  str
+
+    :returns:   Meta data
+    :rtype:     Dict[str, Any]
+
+    :raises     ValueError:  The payload is neither a literal nor JSON or is
+                             no object of JSON types
+    """
+    try:
+        data = ast.literal_eval(payload)
+    except (ValueError, SyntaxError):
+        try:
+            data = json.loads(payload)
+        except ValueError:
+            # single quoted JSON like "{'stable': true}"
+            data = json.loads(payload.replace("'", "\""))
+
+    if not isinstance(data, dict) or not _is_json_data(data):
+        raise ValueError("Meta data is no object of JSON types: {}".format(
+            payload))
+
+    return data
+
+
+def _is_json_data(value: Any) -> bool:
+    """
+    Check a value to consist of JSON types only
+
+    Python literals like sets, tuples or bytes are no JSON types.
+
+    :param      value:  The value
+    :type       value:  Any
+
+    :returns:   True if the value is JSON serializable as is, False otherwise
+    :rtype:     bool
+    """
+    if isinstance(value, dict):
+        return all(isinstance(key, str) and _is_json_data(item)
+                   for key, item in value.items())
+    if isinstance(value, list):
+        return all(_is_json_data(item) for item in value)
+    return value is None or isinstance(value, (str, int, float, bool))
+
+
+def parse_meta_data(lines: List[str]) -> Dict[str, Any]:
+    """
+    Parse the first meta comment of the given description lines
+
+    :param      lines:  The description lines
+    :type       lines:  List[str]
+
+    :returns:   Meta data, empty if no meta comment has been found
+    :rtype:     Dict[str, Any]
+    """
+    for line in lines:
+        # try to extract any comment with "meta ="
+        payload = find_meta_comment(line)
+        if payload:
+            return decode_meta_comment(payload)
+
+    return {}
+
+
+@dataclass(frozen=True, repr=False)
+class Release(object):
+    """Single release of a changelog"""
+    # no instance dict, tens of thousands of releases are kept by a parse
+    __slots__ = ("version", "date", "section", "section_start",
+                 "section_end", "buffer", "meta_comment")
+
+    #: Semantic version string, e.g. "0.2.0"
+    version: str
+    #: ISO8601 datetime string, e.g. "2022-05-19"
+    date: str
+    #: Undecoded content between this and the next version line, empty if
+    #: the section has not been read
+    section: Union[str, bytes]
+    #: Byte offset of the section in the changelog file, None if unknown
+    section_start: Optional[int]
+    #: Byte offset of the end of the section, None if unknown
+    section_end: Optional[int]
+    #: Undecoded content of the whole changelog shared by all releases of a
+    #: parse, the section is taken from it by its offsets. None if the
+    #: section is kept by itself
+    buffer: Optional[bytes]
+    #: Payload of the first meta comment of the section found while scanning
+    #: the changelog, empty if there is none. None if the changelog has not
+    #: been scanned for it, the section is searched on access
+    meta_comment: Optional[str]
+
+    def __repr__(self) -> str:
+        """
+        Get the representation of this release without its section
+
+        :returns:   Representation of the release
+        :rtype:     str
+        """
+        return ("{}(version={!r}, date={!r}, section_start={!r}, "
+                "section_end={!r})".format(type(self).__name__,
+                                           self.version,
+                                           self.date,
+                                           self.section_start,
+                                           self.section_end))
+
+    @property
+    def section_content(self) -> Union[str, bytes, memoryview]:
+        """
+        Get the undecoded section content of this release
+
+        A section of the shared buffer is a view of it, no copy.
+
+        :returns:   Section content, empty if the section has not been read
+        :rtype:     Union[str, bytes, memoryview]
+        """
+        if self.buffer is not None and self.section_start is not None:
+            return memoryview(self.buffer)[self.section_start:
+                                           self.section_end]
+        return self.section
+
+    @property
+    def description_lines(self) -> List[str]:
+        """
+        Get the stripped description lines of this release
+
+        :returns:   Content of this release
+        :rtype:     List[str]
+        """
+        return decode_description_lines(self.section_content)
+
+    @property
+    def description(self) -> str:
+        """
+        Get the description of this release
+
+        :returns:   Release description
+        :rtype:     str
+        """
+        return '\n'.join(self.description_lines)
+
+    @property
+    def meta(self) -> Dict[str, Any]:
+        """
+        Get the meta data of this release
+
+        :returns:   Meta data of the meta comment, empty if there is none
+        :rtype:     Dict[str, Any]
+        """
+        if self.meta_comment is None:
+            return parse_meta_data(self.description_lines)
+        if not self.meta_comment:
+            return {}
+        return decode_meta_comment(self.meta_comment)
+
+    @property
+    def valid_meta(self) -> Dict[str, Any]:
+        """
+        Get the meta data of this release, empty if it is invalid
+
+        An invalid meta comment is logged as warning instead of failing the
+        output of all releases.
+
+        :returns:   Meta data of the meta comment, empty if there is none or
+                    it is invalid
+        :rtype:     Dict[str, Any]
+        """
+        try:
+            return self.meta
+        except (ValueError, SyntaxError) as e:
+            logging.getLogger(__name__).warning(
+                "Invalid meta comment of release {}: {}".format(self.version,
+                                                                e))
+            return {}
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Get the release in the PyPi release JSON like format
+
+        :returns:   Release data with "info" and "urls" keys
+        :rtype:     Dict[str, Any]
+        """
+        return {
+            'info': {
+                'version': self.version,
+                'description': self.description,
+                'meta': self.valid_meta,
+            },
+            'urls': [{'upload_time': self.date}]
+        }
+
+
+@dataclass(frozen=True)
+class ParsedChangelog(object):
+    """Immutable result of a single changelog parse"""
+    #: Semantic version string of the latest release, e.g. "0.2.0"
+    version: str
+    #: Description of the latest release
+    description: str
+    #: Meta data of the latest release
+    meta: Dict[str, Any]
+    #: Releases in changelog order, only the latest with its section unless
+    #: parsed with descriptions. Only the selected releases if parsed with a
+    #: release query
+    releases: Tuple[Release, ...] = field(repr=False)
+    # VersionInfo object of the latest release, created on first access
+    _semver_data: Optional[VersionInfo] = field(default=None,
+                                                init=False,
+                                                repr=False,
+                                                compare=False)
+    # releases sorted by version and date, created on the first query
+    _release_index: Optional['ReleaseIndex'] = field(default=None,
+                                                     init=False,
+                                                     repr=False,
+                                                     compare=False)
+
+    @property
+    def semver_data(self) -> VersionInfo:
+        """
+        Get the VersionInfo object of the latest release
+
+        :returns:   The version information
+        :rtype:     VersionInfo
+        """
+        if self._semver_data is None:
+            object.__setattr__(self,
+                               "_semver_data",
+                               VersionInfo.parse(self.version))
+        return self._semver_data
+
+    def query_releases(self, query: 'ReleaseQuery') -> Tuple[Release, ...]:
+        """
+        Select releases by version and date ranges
+
+        The releases are sorted once by version and date, each query bisects
+        the sorted releases.
+
+        :param      query:  The release query
+        :type       query:  ReleaseQuery
+
+        :returns:   Selected releases in changelog order
+        :rtype:     Tuple[Release, ...]
+        """
+        if self._release_index is None:
+            # the query support is imported only if used, to start fast
+            # without it
+            from .release_query import ReleaseIndex
+
+            object.__setattr__(self,
+                               "_release_index",
+                               ReleaseIndex(self.releases))
+        return self._release_index.select(query)
+
+    def releases_dict(self, descriptions: bool = False
+                      ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Get the releases in the PyPi package JSON like format
+
+        The "meta" data of a release is added if it has a meta comment. An
+        invalid meta comment is logged as warning and skipped.
+
+        :param      descriptions:  Flag to add the "description" of each
+                                   release, requires a parse with descriptions
+        :type       descriptions:  bool
+
+        :returns:   Releases like {"0.2.0": [{"upload_time": "2022-05-19"}]}
+        :rtype:     Dict[str, List[Dict[str, Any]]]
+        """
+        releases = {}
+
+        for release in self.releases:
+            data = {"upload_time": release.date}
+            if descriptions:
+                data["description"] = release.description
+            meta = release.valid_meta
+            if meta:
+                data["meta"] = meta
+            releases[release.version] = [data]
+
+        return releases
+
+    def to_dict(self, descriptions: bool = False) -> Dict[str, Any]:
+        """
+        Get the parsed changelog in the PyPi package JSON like format
+
+        :param      descriptions:  Flag to add the "description" of each
+                                   release, requires a parse with descriptions
+        :type       descriptions:  bool
+
+        :returns:   Changelog data with "info" and "releases" keys
+        :rtype:     Dict[str, Any]
+        """
+        return {
+            'info': {
+                'version': self.version,
+                'description': self.description,
+                'meta': self.meta,
+            },
+            'releases': self.releases_dict(descriptions=descriptions)
+        }
@@ -0,0 +1,451 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""Persistent index of the release sections of a changelog file"""
+
+import json
+import logging
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from .file_utils import write_file_if_changed
+from .fingerprint import FileFingerprint
+
+# version of the index file format, increase on incompatible changes
+INDEX_FORMAT_VERSION = 5
+
+
+class ChangelogIndexError(Exception):
+    """Base class for exceptions in this module."""
+    pass
+
+
+@dataclass(frozen=True)
+class IndexEntry(object):
+    """Byte offsets of a single release in the changelog file"""
+    #: Semantic version string, e.g. "0.2.0"
+    version: str
+    #: ISO8601 datetime string, e.g. "2022-05-19"
+    date: str
+    #: Byte offset of the version line
+    header_start: int
+    #: Byte offset of the section after the version line
+    section_start: int
+    #: Byte offset of the end of the section
+    section_end: int
+    #: Payload of the first meta comment of the section, empty if there is
+    #: none
+    meta_comment: str = ""
+
+    @property
+    def section_length(self) -> int:
+        """
+        Get the length of the section in bytes
+
+        :returns:   Section length
+        :rtype:     int
+        """
+        return self.section_end - self.section_start
+
+    def to_tuple(self) -> Tuple[str, str, int, int, int, str]:
+        """
+        Get the entry as tuple of its fields as stored in the index file
+
+        :returns:   Entry fields
+        :rtype:     Tuple[str, str, int, int, int, str]
+        """
+        return (self.version, self.date,
+                self.header_start, self.section_start, self.section_end,
+                self.meta_comment)
+
+    def shifted(self, offset: int) -> 'IndexEntry':
+        """
+        Get a copy of the entry with all byte offsets shifted
+
+        :param      offset:  The number of bytes to shift
+        :type       offset:  int
+
+        :returns:   Shifted index entry
+        :rtype:     IndexEntry
+        """
+        return IndexEntry(self.version, self.date,
+                          self.header_start + offset,
+                          self.section_start + offset,
+                          self.section_end + offset,
+                          self.meta_comment)
+
+
+class ChangelogIndex(object):
+    """Index of the release sections of a changelog stored in a file"""
+    def __init__(self,
+                 index_file: Union[Path, str],
+                 logger: Optional[logging.Logger] = None):
+        """
+        Init ChangelogIndex class
+
+        :param      index_file:  The path to the index file
+        :type       index_file:  Union[Path, str]
+        :param      logger:      Logger object
+        :type       logger:      Optional[logging.Logger]
+        """
+        if logger is None:
+            logger = logging.getLogger(__name__)
+        self._logger = logger
+
+        self._index_file = Path(index_file)
+        self._changelog = ""
+        self._fingerprint = None
+        self._regex = {}
+        self._entries = []
+        # undecoded entry lines of a loaded index, decoded on first usage
+        self._entry_lines = b""
+        # header line of a loaded index of which only the first entry line is
+        # read yet, empty if all entry lines are read
+        self._header_line = b""
+        self._entry_lines_size = 0
+        self._tail_sha1 = ""
+        self._versions = None
+
+    @property
+    def index_file(self) -> Path:
+        """
+        Get path to the index file
+
+        :returns:   Path to the index file
+        :rtype:     Path
+        """
+        return self._index_file
+
+    @property
+    def fingerprint(self) -> Optional[FileFingerprint]:
+        """
+        Get fingerprint of the indexed changelog file
+
+        :returns:   Fingerprint of the changelog, None if nothing is indexed
+        :rtype:     Optional[FileFingerprint]
+        """
+        return self._fingerprint
+
+    @property
+    def entries(self) -> List[IndexEntry]:
+        """
+        Get index entries in changelog order
+
+        The entries of a loaded index are read and decoded on the first
+        access.
+
+        :returns:   Index entries
+        :rtype:     List[IndexEntry]
+        """
+        if self._entries is None:
+            self._entries = list(self.iter_entries())
+            self._entry_lines = b""
+        return self._entries
+
+    @property
+    def latest(self) -> Optional[IndexEntry]:
+        """
+        Get the index entry of the latest release
+
+        Only the first entry of a loaded index is decoded.
+
+        :returns:   First index entry, None if there are no releases
+        :rtype:     Optional[IndexEntry]
+        """
+        return next(self.iter_entries(), None)
+
+    def iter_entries(self) -> Iterator[IndexEntry]:
+        """
+        Iterate the index entries in changelog order
+
+        The entries of a loaded index are decoded one by one while iterating
+        without keeping them. The entries after the first one are read from
+        the index file on demand.
+
+        :returns:   Index entries
+        :rtype:     Iterator[IndexEntry]
+        """
+        if self._entries is not None:
+            yield from self._entries
+            return
+
+        start = self._entry_lines.find(b"\n") + 1
+        if not start:
+            return
+        yield self._decode_entry(self._entry_lines[:start - 1])
+
+        entry_lines = self._read_entry_lines()
+        while start < len(entry_lines):
+            end = entry_lines.index(b"\n", start)
+            yield self._decode_entry(entry_lines[start:end])
+            start = end + 1
+
+    def _read_entry_lines(self) -> bytes:
+        """
+        Read all undecoded entry lines of the loaded index file
+
+        :returns:   Entry lines
+        :rtype:     bytes
+
+        :raises     ChangelogIndexError:  The index file changed since loading
+        """
+        if self._header_line:
+            try:
+                with open(self.index_file, "rb") as f:
+                    header_line = f.readline()
+                    entry_lines = f.read()
+            except OSError as e:
+                raise ChangelogIndexError("Index file '{}' not readable: {}".
+                                          format(self.index_file, e))
+
+            # the same header describes the same entries
+            if header_line != self._header_line or \
+                    len(entry_lines) != self._entry_lines_size:
+                raise ChangelogIndexError("Index file '{}' changed while in "
+                                          "use".format(self.index_file))
+
+            self._entry_lines = entry_lines
+            self._header_line = b""
+
+        return self._entry_lines
+
+    def _decode_entry(self, line: bytes) -> IndexEntry:
+        """
+        Decode a single entry line of the index file
+
+        :param      line:  The entry line without line break
+        :type       line:  bytes
+
+        :returns:   Index entry
+        :rtype:     IndexEntry
+
+        :raises     ChangelogIndexError:  The entry line is invalid
+        """
+        try:
+            return IndexEntry(*json.loads(line))
+        except (ValueError, TypeError) as e:
+            raise ChangelogIndexError("Invalid entry in index file '{}': {}".
+                                      format(self.index_file, e))
+
+    @property
+    def tail_start(self) -> int:
+        """
+        Get byte offset of the first indexed version line
+
+        :returns:   Start of the indexed releases, size of the changelog if
+                    there are no releases
+        :rtype:     int
+        """
+        latest = self.latest
+        if latest is not None:
+            return latest.header_start
+        if self._fingerprint is not None:
+            return self._fingerprint.size
+        return 0
+
+    @property
+    def tail_sha1(self) -> str:
+        """
+        Get SHA1 hex digest of the changelog from the first version line on
+
+        :returns:   SHA1 hex digest of the indexed releases
+        :rtype:     str
+        """
+        return self._tail_sha1
+
+    def update(self,
+               changelog_file: Path,
+               fingerprint: FileFingerprint,
+               regex: Dict[str, str],
+               entries: List[IndexEntry],
+               tail_sha1: str) -> None:
+        """
+        Replace the indexed content
+
+        :param      changelog_file:  The path to the changelog file
+        :type       changelog_file:  Path
+        :param      fingerprint:     The fingerprint of the changelog file
+        :type       fingerprint:     FileFingerprint
+        :param      regex:           The regex patterns used to scan
+        :type       regex:           Dict[str, str]
+        :param      entries:         The index entries in changelog order
+        :type       entries:         List[IndexEntry]
+        :param      tail_sha1:       The SHA1 hex digest of the changelog
+                                     from the first version line on
+        :type       tail_sha1:       str
+        """
+        self._changelog = Path(changelog_file).name
+        self._fingerprint = fingerprint
+        self._regex = dict(regex)
+        self._entries = list(entries)
+        self._entry_lines = b""
+        self._header_line = b""
+        self._entry_lines_size = 0
+        self._tail_sha1 = tail_sha1
+        self._versions = None
+
+    def load(self, changelog_file: Path, regex: Dict[str, str]) -> bool:
+        """
+        Load the index file if it is up to date for the changelog file
+
+        Only the header line and the first entry line of the index file are
+        read, the header is checked before any entry is decoded. Further
+        entries are read and decoded on demand, see "entries", "iter_entries"
+        and "find".
+
+        An index with an outdated modification time but an unchanged content
+        of the changelog is refreshed and saved again. An index of the same
+        changelog with an outdated content keeps the previous state to be
+        updated incrementally.
+
+        :param      changelog_file:  The path to the changelog file
+        :type       changelog_file:  Path
+        :param      regex:           The regex patterns used to scan
+        :type       regex:           Dict[str, str]
+
+        :returns:   True if the index is up to date, False otherwise
+        :rtype:     bool
+        """
+        try:
+            with open(self.index_file, "rb") as f:
+                header_line = f.readline()
+                header = json.loads(header_line)
+                if header["format"] != INDEX_FORMAT_VERSION:
+                    self._logger.debug("Index file format {} is outdated".
+                                       format(header["format"]))
+                    return False
+                changelog = header["changelog"]
+                stored_regex = header["regex"]
+                fingerprint = FileFingerprint.from_dict(header["fingerprint"])
+                tail_sha1 = str(header["tail_sha1"])
+                entry_lines_size = int(header["size"])
+                truncated = (os.fstat(f.fileno()).st_size - f.tell() !=
+                             entry_lines_size)
+                first_line = f.readline(entry_lines_size)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            self._logger.debug("Index file '{}' not usable: {}".
+                               format(self.index_file, e))
+            return False
+
+        if changelog != Path(changelog_file).name:
+            self._logger.debug("Index file '{}' belongs to '{}'".
+                               format(self.index_file, changelog))
+            return False
+
+        if stored_regex != regex:
+            self._logger.debug("Index file '{}' created with other regex".
+                               format(self.index_file))
+            return False
+
+        if truncated or entry_lines_size and not first_line.endswith(b"\n"):
+            self._logger.debug("Index file '{}' is truncated".
+                               format(self.index_file))
+            return False
+
+        current_fingerprint = fingerprint.refresh(changelog_file)
+        self.update(changelog_file=changelog_file,
+                    fingerprint=current_fingerprint or fingerprint,
+                    regex=regex,
+                    entries=[],
+                    tail_sha1=tail_sha1)
+        self._entries = None
+        self._entry_lines = first_line
+        if len(first_line) < entry_lines_size:
+            self._header_line = header_line
+            self._entry_lines_size = entry_lines_size
+
+        if current_fingerprint is None:
+            self._logger.debug("Index file '{}' is outdated".
+                               format(self.index_file))
+            return False
+
+        if current_fingerprint != fingerprint:
+            # content is unchanged, keep the index valid for the new mtime
+            self.save()
+
+        return True
+
+    def save(self) -> None:
+        """
+        Save the index atomically to the index file
+
+        The index file consists of a JSON header line followed by one JSON
+        line per entry in changelog order. The header contains the size of
+        the entry lines to detect truncated index files.
+        """
+        if self._fingerprint is None:
+            raise ChangelogIndexError("Nothing indexed yet")
+
+        if self._entries is None:
+            # entries of a loaded index are saved again without decoding
+            entry_lines = self._read_entry_lines()
+            release_count = entry_lines.count(b"\n")
+        else:
+            entry_lines = "".join(json.dumps(entry.to_tuple()) + "\n"
+                                  for entry in self._entries).encode()
+            release_count = len(self._entries)
+
+        header = {
+            "format": INDEX_FORMAT_VERSION,
+            "changelog": self._changelog,
+            "fingerprint": self._fingerprint.to_dict(),
+            "regex": self._regex,
+            "releases": release_count,
+            "size": len(entry_lines),
+            "tail_sha1": self._tail_sha1,
+        }
+
+        # never expose a partial index to other processes reading it
+        write_file_if_changed(
+            file_path=self.index_file,
+            data=json.dumps(header).encode() + b"\n" + entry_lines)
+
+        self._logger.debug("Saved index file '{}' with {} releases".
+                           format(self.index_file, release_count))
+
+    def find(self, version: str) -> Optional[IndexEntry]:
+        """
+        Find the index entry of a version
+
+        :param      version:  The semantic version string, e.g. "0.2.0"
+        :type       version:  str
+
+        :returns:   Index entry of the version, None if not indexed
+        :rtype:     Optional[IndexEntry]
+        """
+        if self._entries is None:
+            # search the undecoded entry lines for the first, latest entry
+            # starting with the version instead of decoding all entries
+            needle = "[{},".format(json.dumps(version)).encode()
+            lines = b"\n" + self._read_entry_lines()
+            pos = lines.find(b"\n" + needle)
+            if pos < 0:
+                return None
+            return self._decode_entry(
+                lines[pos + 1:lines.index(b"\n", pos + 1)])
+
+        if self._versions is None:
+            self._versions = {}
+            for entry in self._entries:
+                # the first, latest occurrence of a version wins
+                self._versions.setdefault(entry.version, entry)
+        return self._versions.get(version)
+
+    @staticmethod
+    def read_section(changelog_file: Path, entry: IndexEntry) -> bytes:
+        """
+        Read the undecoded section of an index entry from the changelog
+
+        :param      changelog_file:  The path to the changelog file
+        :type       changelog_file:  Path
+        :param      entry:           The index entry
+        :type       entry:           IndexEntry
+
+        :returns:   Section content
+        :rtype:     bytes
+        """
+        with open(changelog_file, "rb") as f:
+            f.seek(entry.section_start)
+            return f.read(entry.section_length)
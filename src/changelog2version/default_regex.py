@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""Default regex patterns of the changelog parser, importable without it"""
+
+# semantic version part of a version line
+SEMVER_LINE_REGEX = (
+    r"^(?P<major>0|[1-9]\d*)\."     # major version part
+    r"(?P<minor>0|[1-9]\d*)\."      # minor version part
+    r"(?P<patch>0|[1-9]\d*)"        # bugfix/patch version part
+    # optional prerelease version part, starting with a "-"
+    r"(?:-(?P<prerelease>(?:0|[1-9]\d*|\d*[a-zA-Z-][0-9a-zA-Z-]*)(?:\.(?:0|[1-9]\d*|\d*[a-zA-Z-][0-9a-zA-Z-]*))*))?"    # noqa
+    # optional build metadata version part, starting with a "+"
+    r"(?:\+(?P<buildmetadata>[0-9a-zA-Z-]+(?:\.[0-9a-zA-Z-]+)*))?$"
+)
+
+# complete version line like "## [0.2.0] - 2022-05-19"
+VERSION_LINE_REGEX = (
+    # begin of line with two "#" followed by a single space
+    r"(?P<title_begin>\#\#)[ ]{1}"
+    # anything after a "["
+    r"\[(?P<potential_semver>("
+    # three numbers with one or more digits, seperated by dot
+    r"(\d{1,}\.\d{1,}\.\d{1,})"
+    r"([-+]?)"  # zero or one of either a "-" or "+" character
+    # r"(.*)"  # any character zero or more times
+    r"([a-zA-Z.+-d]*)"  # any character (a-Z), dot, "-", "+" or number
+                        # for zero or more times
+    r")(?=\]))\]"    # positive lookahead for the "]" and the "]"
+    r"[ ]{1}\-[ ]{1}"     # exactly one space, "-", exactly one space
+    r"(?P<datetime>\d{4}\-\d{2}-\d{2})"     # datetime as YYYY-MM-DD
+    r"(([T ]{1})"   # seperation between date and time by "T" or space
+    r"(?P<timestamp>\d{2,}:\d{2,}:\d{2,}?))?"   # time as HH:MM:SS
+)
+
+# date part of a version line
+DATE_LINE_REGEX = (
+    r".*"    # anything
+    r"(?P<datetime>\d{4}\-\d{2}-\d{2})"     # datetime as YYYY-MM-DD
+    r"(([T ]{1})"   # seperation between date and time by "T" or space
+    r"(?P<timestamp>\d{2,}:\d{2,}:\d{2,}?))?"   # time as HH:MM:SS
+)
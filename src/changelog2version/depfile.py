@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""Write Makefile syntax dependency files like 'gcc -MD' for build tools"""
+
+from pathlib import Path
+from typing import Iterable, List, Tuple, Union
+
+from .file_utils import write_file_if_changed
+
+# target with its dependencies
+DependencyRule = Tuple[Union[Path, str], List[Union[Path, str]]]
+
+
+def escape_make_path(path: Union[Path, str]) -> str:
+    """
+    Escape a path for the use in a Makefile rule
+
+    Spaces and hashes are escaped by a backslash, dollar signs by another
+    dollar sign, like GCC and Clang do.
+
+    :param      path:  The path
+    :type       path:  Union[Path, str]
+
+    :returns:   Escaped path
+    :rtype:     str
+    """
+    return str(path).replace("$", "$$").replace("#", "\\#").replace(" ", "\\ ")
+
+
+def format_depfile(rules: Iterable[DependencyRule]) -> str:
+    """
+    Format rules of targets with their dependencies in Makefile syntax
+
+    :param      rules:  The targets with their dependencies
+    :type       rules:  Iterable[DependencyRule]
+
+    :returns:   Content of the depfile, one rule per target
+    :rtype:     str
+    """
+    lines = []
+
+    for target, dependencies in rules:
+        lines.append("{}:{}".format(
+            escape_make_path(target),
+            "".join(" \\\n  {}".format(escape_make_path(dependency))
+                    for dependency in dependencies)))
+
+    return "".join(line + "\n" for line in lines)
+
+
+def write_depfile(depfile: Union[Path, str],
+                  rules: Iterable[DependencyRule]) -> bool:
+    """
+    Write rules of targets with their dependencies to a depfile
+
+    :param      depfile:  The path to the depfile
+    :type       depfile:  Union[Path, str]
+    :param      rules:    The targets with their dependencies
+    :type       rules:    Iterable[DependencyRule]
+
+    :returns:   True if the depfile has been written, False if it is unchanged
+    :rtype:     bool
+    """
+    return write_file_if_changed(file_path=Path(depfile),
+                                 data=format_depfile(rules).encode())
@@ -6,21 +6,100 @@ Extract a single version line from a changelog and extract the semver content
 from this line
 """
 
-import json
 import logging
+import mmap
+import os
 import re
+from contextlib import closing, contextmanager
+from functools import lru_cache
+from itertools import chain, islice
 from pathlib import Path
-from sys import stdout
-from typing import Dict, List, Optional
+from typing import (TYPE_CHECKING, Callable, Dict, Iterator, List, Optional,
+                    Pattern, Tuple, Union)
 
 from semver import VersionInfo
 
+from .changelog_data import (ENCODING, NEWLINE_BYTES_PATTERN,
+                             ParsedChangelog, Release, SectionMetaScanner,
+                             decode_description_lines, find_meta_comment,
+                             is_valid_semver, parse_meta_data)
+from .default_regex import (DATE_LINE_REGEX, SEMVER_LINE_REGEX,
+                            VERSION_LINE_REGEX)
+
+if TYPE_CHECKING:
+    from .changelog_index import ChangelogIndex, IndexEntry
+    from .release_query import ReleaseQuery
+
+# available changelog scanning engines
+ENGINES = ("line", "mmap")
+# content between square brackets of a version line
+BRACKET_CONTENT_PATTERN = re.compile(r"\[(.*?)\]")
+
+# version line, undecoded section, byte offsets of the section if known and
+# payload of the meta comment of the section
+SectionSpan = Tuple[str, Union[str, bytes], Optional[int], Optional[int],
+                    Optional[str]]
+
 
 class ExtractVersionError(Exception):
     """Base class for exceptions in this module."""
     pass
 
 
+@lru_cache(maxsize=64)
+def compile_pattern(pattern: str) -> Pattern[str]:
+    """
+    Compile a regex pattern, identical patterns share the compiled object
+
+    :param      pattern:  The regex pattern
+    :type       pattern:  str
+
+    :returns:   Compiled regex pattern
+    :rtype:     Pattern[str]
+    """
+    return re.compile(pattern)
+
+
+@lru_cache(maxsize=64)
+def compile_bytes_pattern(pattern: str) -> Pattern[bytes]:
+    """
+    Compile a regex pattern as multiline bytes pattern
+
+    :param      pattern:  The regex pattern
+    :type       pattern:  str
+
+    :returns:   Compiled multiline regex pattern for bytes
+    :rtype:     Pattern[bytes]
+    """
+    return re.compile(pattern.encode(ENCODING), re.MULTILINE)
+
+
+@contextmanager
+def map_file(file_path: Path) -> Iterator[Union[bytes, mmap.mmap]]:
+    """
+    Map a file read only into memory
+
+    :param      file_path:  The path to the file
+    :type       file_path:  Path
+
+    :returns:   Memory mapped file content, empty bytes for an empty file
+    :rtype:     Iterator[Union[bytes, mmap.mmap]]
+    """
+    with open(file_path, "rb") as f:
+        try:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # empty files can not be mapped
+            buffer = None
+
+    if buffer is None:
+        yield b""
+        return
+
+    with buffer:
+        yield buffer
+
+
 class ExtractVersion(object):
     """Extract the version line and SemVer part from a changelog file"""
     def __init__(self, logger: Optional[logging.Logger] = None):
@@ -33,44 +112,22 @@ class ExtractVersion(object):
         if logger is None:
             logger = self._create_logger()
         self._logger = logger
-        self._semver_data = VersionInfo(*(0, 0, 0))
+        # the VersionInfo object is created on access of "semver_data"
+        self._semver_string = "0.0.0"
+        self._semver_data = None
         self._latest_description_lines = []
         self._meta_data = {}
 
-        self._semver_line_regex = (
-            r"^(?P<major>0|[1-9]\d*)\."     # major version part
-            r"(?P<minor>0|[1-9]\d*)\."      # minor version part
-            r"(?P<patch>0|[1-9]\d*)"        # bugfix/patch version part
-            # optional prerelease version part, starting with a "-"
-            r"(?:-(?P<prerelease>(?:0|[1-9]\d*|\d*[a-zA-Z-][0-9a-zA-Z-]*)(?:\.(?:0|[1-9]\d*|\d*[a-zA-Z-][0-9a-zA-Z-]*))*))?"    # noqa
-            # optional build metadata version part, starting with a "+"
-            r"(?:\+(?P<buildmetadata>[0-9a-zA-Z-]+(?:\.[0-9a-zA-Z-]+)*))?$"
-        )
+        self._semver_line_regex = SEMVER_LINE_REGEX
+        self._version_line_regex = VERSION_LINE_REGEX
+        self._date_line_regex = DATE_LINE_REGEX
 
-        self._version_line_regex = (
-            # begin of line with two "#" followed by a single space
-            r"(?P<title_begin>\#\#)[ ]{1}"
-            # anything after a "["
-            r"\[(?P<potential_semver>("
-            # three numbers with one or more digits, seperated by dot
-            r"(\d{1,}\.\d{1,}\.\d{1,})"
-            r"([-+]?)"  # zero or one of either a "-" or "+" character
-            # r"(.*)"  # any character zero or more times
-            r"([a-zA-Z.+-d]*)"  # any character (a-Z), dot, "-", "+" or number
-                                # for zero or more times
-            r")(?=\]))\]"    # positive lookahead for the "]" and the "]"
-            r"[ ]{1}\-[ ]{1}"     # exactly one space, "-", exactly one space
-            r"(?P<datetime>\d{4}\-\d{2}-\d{2})"     # datetime as YYYY-MM-DD
-            r"(([T ]{1})"   # seperation between date and time by "T" or space
-            r"(?P<timestamp>\d{2,}:\d{2,}:\d{2,}?))?"   # time as HH:MM:SS
-        )
+        self._engine = "line"
+        self._index_file = None
 
-        self._date_line_regex = (
-            r".*"    # anything
-            r"(?P<datetime>\d{4}\-\d{2}-\d{2})"     # datetime as YYYY-MM-DD
-            r"(([T ]{1})"   # seperation between date and time by "T" or space
-            r"(?P<timestamp>\d{2,}:\d{2,}:\d{2,}?))?"   # time as HH:MM:SS
-        )
+        self._semver_line_pattern = compile_pattern(self._semver_line_regex)
+        self._version_line_pattern = compile_pattern(self._version_line_regex)
+        self._date_line_pattern = compile_pattern(self._date_line_regex)
 
     @property
     def version_line_regex(self) -> str:
@@ -91,7 +148,7 @@ class ExtractVersion(object):
         :type       value:  str
         """
         try:
-            re.compile(value)
+            self._version_line_pattern = compile_pattern(value)
             self._version_line_regex = value
         except re.error:
             raise ExtractVersionError("Invalid regex pattern")
@@ -115,7 +172,7 @@ class ExtractVersion(object):
         :type       value:  str
         """
         try:
-            re.compile(value)
+            self._semver_line_pattern = compile_pattern(value)
             self._semver_line_regex = value
         except re.error:
             raise ExtractVersionError("Invalid regex pattern")
@@ -139,11 +196,91 @@ class ExtractVersion(object):
         :type       value:  str
         """
         try:
-            re.compile(value)
+            self._date_line_pattern = compile_pattern(value)
             self._date_line_regex = value
         except re.error:
             raise ExtractVersionError("Invalid regex pattern")
 
+    @property
+    def version_line_pattern(self) -> Pattern[str]:
+        """
+        Get compiled regex to extract complete version line from changelog
+
+        :returns:   Compiled regex of the complete version line
+        :rtype:     Pattern[str]
+        """
+        return self._version_line_pattern
+
+    @property
+    def semver_line_pattern(self) -> Pattern[str]:
+        """
+        Get compiled regex to extract the semver part from the version line
+
+        :returns:   Compiled regex of the semver part
+        :rtype:     Pattern[str]
+        """
+        return self._semver_line_pattern
+
+    @property
+    def date_line_pattern(self) -> Pattern[str]:
+        """
+        Get compiled regex to extract the date part from the version line
+
+        :returns:   Compiled regex of the date part
+        :rtype:     Pattern[str]
+        """
+        return self._date_line_pattern
+
+    @property
+    def engine(self) -> str:
+        """
+        Get engine used to scan the changelog file
+
+        :returns:   Name of the engine, either "line" or "mmap"
+        :rtype:     str
+        """
+        return self._engine
+
+    @engine.setter
+    def engine(self, value: str) -> None:
+        """
+        Set engine used to scan the changelog file
+
+        The "line" engine reads the changelog line by line, the "mmap" engine
+        applies the version line regex to the memory mapped file at once, see
+        `_scan_mmap`.
+
+        :param      value:  The engine name
+        :type       value:  str
+        """
+        if value not in ENGINES:
+            raise ExtractVersionError("Engine has to be one of {}".format(
+                ENGINES))
+        self._engine = value
+
+    @property
+    def index_file(self) -> Optional[Path]:
+        """
+        Get path to the index file of the changelog sections
+
+        :returns:   Path to the index file, None if no index is used
+        :rtype:     Optional[Path]
+        """
+        return self._index_file
+
+    @index_file.setter
+    def index_file(self, value: Optional[Union[Path, str]]) -> None:
+        """
+        Set path to the index file of the changelog sections
+
+        The index file stores the byte offsets of all releases of the
+        changelog and is rebuilt automatically if the changelog changed.
+
+        :param      value:  The path to the index file, None to use no index
+        :type       value:  Optional[Union[Path, str]]
+        """
+        self._index_file = None if value is None else Path(value)
+
     @property
     def semver_data(self) -> VersionInfo:
         """
@@ -152,6 +289,8 @@ class ExtractVersion(object):
         :returns:   The version information
         :rtype:     VersionInfo
         """
+        if self._semver_data is None:
+            self._semver_data = VersionInfo.parse(self._semver_string)
         return self._semver_data
 
     @semver_data.setter
@@ -163,6 +302,7 @@ class ExtractVersion(object):
         :type       value:  VersionInfo
         """
         if isinstance(value, VersionInfo):
+            self._semver_string = str(value)
             self._semver_data = value
         else:
             raise ExtractVersionError("Value is not of type VersionInfo")
@@ -202,28 +342,20 @@ class ExtractVersion(object):
         """
         Create a logger
 
+        The logging configuration of the application is not modified, it
+        decides which messages are shown.
+
         :param      logger_name:  The logger name
         :type       logger_name:  str, optional
 
-        :returns:   Configured logger
+        :returns:   Logger
         :rtype:     logging.Logger
         """
-        custom_format = '[%(asctime)s] [%(levelname)-8s] [%(filename)-15s @'\
-                        ' %(funcName)-15s:%(lineno)4s] %(message)s'
-
-        # configure logging
-        logging.basicConfig(level=logging.INFO,
-                            format=custom_format,
-                            stream=stdout)
-
         if logger_name and (isinstance(logger_name, str)):
             logger = logging.getLogger(logger_name)
         else:
             logger = logging.getLogger(__name__)
 
-        # set the logger level to DEBUG if specified differently
-        logger.setLevel(logging.DEBUG)
-
         return logger
 
     def parse_changelog(self, changelog_file: Path) -> str:
@@ -247,6 +379,224 @@ class ExtractVersion(object):
 
         return release_version_line
 
+    def parse(self,
+              changelog_file: Path,
+              query: Optional['ReleaseQuery'] = None,
+              descriptions: bool = False) -> ParsedChangelog:
+        """
+        Parse the changelog in a single pass
+
+        The changelog file is read only once, each version line is parsed only
+        once. The result contains the latest version, its description and meta
+        data as well as all releases with their dates. Only the section of the
+        latest release is kept, with an index file it is the only section read
+        from the changelog.
+
+        With a release query only the selected releases are kept. With a
+        limit the changelog is read only up to the last selected release, see
+        "ReleaseQuery.filter".
+
+        With descriptions the sections of all releases are kept. The changelog
+        is read into a single buffer shared by the releases, each release
+        keeps only the offsets of its section, see "Release.buffer".
+
+        :param      changelog_file:  The path to the changelog file
+        :type       changelog_file:  Path
+        :param      query:           The release query, all releases if None
+        :type       query:           Optional[ReleaseQuery]
+        :param      descriptions:    Flag to keep the sections of all
+                                     releases
+        :type       descriptions:    bool
+
+        :returns:   Parsed changelog
+        :rtype:     ParsedChangelog
+        """
+        latest_release = None
+
+        if self.index_file is not None and not descriptions:
+            index = self.load_index(changelog_file=changelog_file)
+            latest_release = self._get_indexed_release(
+                changelog_file=changelog_file,
+                index=index)
+            releases = (Release(version=entry.version,
+                                date=entry.date,
+                                section=b"",
+                                section_start=entry.section_start,
+                                section_end=entry.section_end,
+                                buffer=None,
+                                meta_comment=entry.meta_comment)
+                        for entry in islice(index.iter_entries(), 1, None))
+            if latest_release is not None:
+                releases = chain((latest_release, ), releases)
+            if query is not None:
+                releases = query.filter(releases)
+            releases = tuple(releases)
+        else:
+            if descriptions:
+                iterator = self._iter_shared_releases(
+                    changelog_file=changelog_file)
+            else:
+                iterator = self.iter_releases(changelog_file=changelog_file,
+                                              section_count=1)
+            with closing(iterator):
+                latest_release = next(iterator, None)
+                if latest_release is None:
+                    releases = ()
+                else:
+                    releases = chain((latest_release, ), iterator)
+                    if query is not None:
+                        releases = query.filter(releases)
+                    releases = tuple(releases)
+
+        if latest_release is None:
+            self._set_semver_string(semver_string="0.0.0")
+            self._latest_description_lines = []
+            self._meta_data = {}
+            return ParsedChangelog(
+                version="0.0.0",
+                description="",
+                meta={},
+                releases=releases,
+            )
+
+        self._set_semver_string(semver_string=latest_release.version)
+
+        self._latest_description_lines = latest_release.description_lines
+        self._meta_data = latest_release.meta
+
+        return ParsedChangelog(
+            version=latest_release.version,
+            description=latest_release.description,
+            meta=self.meta_data,
+            releases=releases,
+        )
+
+    def iter_releases(self,
+                      changelog_file: Path,
+                      section_count: Optional[int] = None
+                      ) -> Iterator[Release]:
+        """
+        Iterate over the releases of the changelog while reading it
+
+        Each release is yielded as soon as its section has been read, the
+        changelog is read only as far as the releases are consumed. The
+        description and meta data of a release are decoded on access. With an
+        index file the sections are read without scanning the changelog.
+
+        :param      changelog_file:  The path to the changelog file
+        :type       changelog_file:  Path
+        :param      section_count:   Number of sections to read, the section
+                                     of further releases is empty
+        :type       section_count:   Optional[int]
+
+        :returns:   Generator of releases in changelog order
+        :rtype:     Iterator[Release]
+        """
+        if self.index_file is not None:
+            index = self.load_index(changelog_file=changelog_file)
+            with open(changelog_file, "rb") as f:
+                for number, entry in enumerate(index.iter_entries()):
+                    section = b""
+                    if section_count is None or number < section_count:
+                        f.seek(entry.section_start)
+                        section = f.read(entry.section_length)
+                    yield Release(
+                        version=entry.version,
+                        date=entry.date,
+                        section=section,
+                        section_start=entry.section_start,
+                        section_end=entry.section_end,
+                        buffer=None,
+                        meta_comment=entry.meta_comment,
+                    )
+            return
+
+        for line, section, section_start, section_end, meta_comment in \
+                self._iter_sections(changelog_file=changelog_file,
+                                    section_count=section_count):
+            yield Release(
+                version=self.find_release_version(release_version_line=line),
+                date=self.parse_semver_line_date(release_version_line=line),
+                section=section,
+                section_start=section_start,
+                section_end=section_end,
+                buffer=None,
+                meta_comment=meta_comment,
+            )
+
+    def _iter_shared_releases(self, changelog_file: Path) -> Iterator[Release]:
+        """
+        Iterate over the releases with their sections in a shared buffer
+
+        The changelog file is read once into a single buffer, each release
+        keeps only the byte offsets of its section. The description is
+        decoded on access. The line engine does not know the byte offsets,
+        each release keeps its section by itself.
+
+        :param      changelog_file:  The path to the changelog file
+        :type       changelog_file:  Path
+
+        :returns:   Generator of releases in changelog order
+        :rtype:     Iterator[Release]
+        """
+        if self.index_file is None and self.engine != "mmap":
+            yield from self.iter_releases(changelog_file=changelog_file)
+            return
+
+        if self.index_file is not None:
+            index = self.load_index(changelog_file=changelog_file)
+            with open(changelog_file, "rb") as f:
+                buffer = f.read()
+            for entry in index.iter_entries():
+                yield Release(
+                    version=entry.version,
+                    date=entry.date,
+                    section=b"",
+                    section_start=entry.section_start,
+                    section_end=entry.section_end,
+                    buffer=buffer,
+                    meta_comment=entry.meta_comment,
+                )
+            return
+
+        # a copy of the file instead of the memory map, the releases may be
+        # kept after the changelog file has been modified
+        with open(changelog_file, "rb") as f:
+            buffer = f.read()
+        for line, _, section_start, section_end, meta_comment in \
+                self._iter_buffer_sections(buffer=buffer, section_count=0):
+            yield Release(
+                version=self.find_release_version(release_version_line=line),
+                date=self.parse_semver_line_date(release_version_line=line),
+                section=b"",
+                section_start=section_start,
+                section_end=section_end,
+                buffer=buffer,
+                meta_comment=meta_comment,
+            )
+
+    def query_releases(self,
+                       changelog_file: Path,
+                       query: 'ReleaseQuery') -> List[Release]:
+        """
+        Get the releases of the changelog selected by a query
+
+        With a limit the changelog is read only up to the last selected
+        release, see "ReleaseQuery.filter". The sections of the read releases
+        are kept.
+
+        :param      changelog_file:  The path to the changelog file
+        :type       changelog_file:  Path
+        :param      query:           The release query
+        :type       query:           ReleaseQuery
+
+        :returns:   Selected releases in changelog order
+        :rtype:     List[Release]
+        """
+        with closing(self.iter_releases(changelog_file=changelog_file)) as \
+                releases:
+            return list(query.filter(releases))
+
     def parse_changelog_completely(self,
                                    changelog_file: Path,
                                    first_line_only: bool = False) -> List[str]:
@@ -262,34 +612,612 @@ class ExtractVersion(object):
         :rtype:     List[str]
         """
         release_version_lines = []
+        latest_section = ""
+
+        for line, section, _, _, _ in self._iter_sections(
+                changelog_file=changelog_file,
+                first_line_only=first_line_only,
+                section_count=1):
+            if not release_version_lines:
+                latest_section = section
+            release_version_lines.append(line)
+
+        latest_description_lines = decode_description_lines(latest_section)
+
+        self._logger.debug("Matching release version lines: '{}'".
+                           format(release_version_lines))
+        self._logger.debug("Latest description lines: '{}'".
+                           format(latest_description_lines))
+
+        self._latest_description_lines = latest_description_lines
+
+        self.parse_meta_comment()
+
+        return release_version_lines
+
+    def _iter_sections(self,
+                       changelog_file: Path,
+                       first_line_only: bool = False,
+                       section_count: Optional[int] = None,
+                       section_filter: Optional[Callable[[str], bool]] = None
+                       ) -> Iterator[SectionSpan]:
+        """
+        Iterate over the version lines and sections of the changelog
+
+        :param      changelog_file:  The path to the changelog file
+        :type       changelog_file:  Path
+        :param      first_line_only: Flag to stop after the first version line
+                                     without reading its section
+        :type       first_line_only: bool
+        :param      section_count:   Number of sections to read, the content
+                                     of further sections is empty
+        :type       section_count:   Optional[int]
+        :param      section_filter:  Function of a version line to decide
+                                     whether its section is read, all
+                                     sections are read if None
+        :type       section_filter:  Optional[Callable[[str], bool]]
+
+        :returns:   Generator of version line, undecoded section content,
+                    byte offsets of the section, None if unknown, and meta
+                    comment of the section
+        :rtype:     Iterator[SectionSpan]
+        """
+        if self.engine == "mmap":
+            return self._iter_mmap_sections(changelog_file=changelog_file,
+                                            first_line_only=first_line_only,
+                                            section_count=section_count,
+                                            section_filter=section_filter)
+        return self._iter_line_sections(changelog_file=changelog_file,
+                                        first_line_only=first_line_only,
+                                        section_count=section_count,
+                                        section_filter=section_filter)
+
+    def _iter_line_sections(self,
+                            changelog_file: Path,
+                            first_line_only: bool = False,
+                            section_count: Optional[int] = None,
+                            section_filter: Optional[Callable[[str],
+                                                              bool]] = None
+                            ) -> Iterator[SectionSpan]:
+        """
+        Iterate line by line over the version lines and sections
+
+        The file is read in text mode, the byte offsets of the sections are
+        unknown.
+
+        :param      changelog_file:  The path to the changelog file
+        :type       changelog_file:  Path
+        :param      first_line_only: Flag to stop after the first version line
+                                     without reading its section
+        :type       first_line_only: bool
+        :param      section_count:   Number of sections to read, the content
+                                     of further sections is empty
+        :type       section_count:   Optional[int]
+        :param      section_filter:  Function of a version line to decide
+                                     whether its section is read, all
+                                     sections are read if None
+        :type       section_filter:  Optional[Callable[[str], bool]]
+
+        The meta comment of every section is searched, also of the sections
+        not read.
+
+        :returns:   Generator of version line, section content, None offsets
+                    and meta comment
+        :rtype:     Iterator[SectionSpan]
+        """
+        version_line_pattern = self.version_line_pattern
+        version_line = None
+        section_lines = []
         matches_found = 0
-        latest_description_lines = []
+        collect_lines = False
+        meta_comment = ""
 
         with open(changelog_file, "r") as f:
             for line in f:
-                match = re.search(self.version_line_regex, line)
+                match = version_line_pattern.search(line)
                 if match:
-                    release_version_lines.append(match.group())
+                    if first_line_only:
+                        yield match.group(), "", None, None, None
+                        return
+
+                    if version_line is not None:
+                        yield (version_line, "".join(section_lines), None,
+                               None, meta_comment)
+
+                    version_line = match.group()
+                    section_lines = []
                     matches_found += 1
+                    collect_lines = (
+                        (section_count is None or
+                         matches_found <= section_count) and
+                        (section_filter is None or
+                         section_filter(version_line)))
+                    meta_comment = ""
+                    continue
+
+                if collect_lines:
+                    # collect the lines until the next match is found
+                    section_lines.append(line)
+                if "<!--" in line and not meta_comment and \
+                        version_line is not None:
+                    meta_comment = find_meta_comment(line)
+
+        if version_line is not None:
+            yield (version_line, "".join(section_lines), None, None,
+                   meta_comment)
+
+    def _iter_mmap_sections(self,
+                            changelog_file: Path,
+                            first_line_only: bool = False,
+                            section_count: Optional[int] = None,
+                            section_filter: Optional[Callable[[str],
+                                                              bool]] = None
+                            ) -> Iterator[SectionSpan]:
+        """
+        Iterate over the version lines and sections of the mapped changelog
 
-                    if first_line_only:
-                        break
+        The version line regex is applied to the memory mapped file as
+        multiline bytes regex. Only the found version lines are decoded, the
+        sections are returned as bytes.
 
-                # collect the lines until the next (second) match is found
-                if matches_found == 1:
-                    latest_description_lines.append(line.strip())
+        :param      changelog_file:  The path to the changelog file
+        :type       changelog_file:  Path
+        :param      first_line_only: Flag to stop after the first version line
+                                     without reading its section
+        :type       first_line_only: bool
+        :param      section_count:   Number of sections to read, the content
+                                     of further sections is empty
+        :type       section_count:   Optional[int]
+        :param      section_filter:  Function of a version line to decide
+                                     whether its section is read, all
+                                     sections are read if None
+        :type       section_filter:  Optional[Callable[[str], bool]]
+
+        :returns:   Generator of version line, undecoded section content,
+                    byte offsets of the section and meta comment
+        :rtype:     Iterator[SectionSpan]
+        """
+        with map_file(changelog_file) as buffer:
+            yield from self._iter_buffer_sections(
+                buffer=buffer,
+                first_line_only=first_line_only,
+                section_count=section_count,
+                section_filter=section_filter)
+
+    def _iter_buffer_sections(self,
+                              buffer: Union[bytes, mmap.mmap],
+                              first_line_only: bool = False,
+                              section_count: Optional[int] = None,
+                              section_filter: Optional[Callable[[str],
+                                                                bool]] = None
+                              ) -> Iterator[SectionSpan]:
+        """
+        Iterate over the version lines and sections of a changelog buffer
 
-        self._logger.debug("Matching release version lines: '{}'".
-                           format(release_version_lines))
-        self._logger.debug("Latest description lines: '{}'".
-                           format(latest_description_lines[1:]))
+        :param      buffer:          The changelog file content
+        :type       buffer:          Union[bytes, mmap.mmap]
+        :param      first_line_only: Flag to stop after the first version line
+                                     without reading its section
+        :type       first_line_only: bool
+        :param      section_count:   Number of sections to read, the content
+                                     of further sections is empty
+        :type       section_count:   Optional[int]
+        :param      section_filter:  Function of a version line to decide
+                                     whether its section is read, all
+                                     sections are read if None
+        :type       section_filter:  Optional[Callable[[str], bool]]
+
+        The meta comment of every section is searched in the buffer, also of
+        the sections not read.
+
+        :returns:   Generator of version line, undecoded section content,
+                    byte offsets of the section and meta comment
+        :rtype:     Iterator[SectionSpan]
+        """
+        version_line = None
+        section_start = 0
+        matches_found = 0
+        read_section = False
+        meta_scanner = SectionMetaScanner(buffer=buffer)
+
+        for this_version_line, line_start, line_end in \
+                self._iter_version_line_spans(buffer=buffer):
+            if first_line_only:
+                yield this_version_line, b"", None, None, None
+                return
+
+            if version_line is not None:
+                section = b""
+                if read_section:
+                    section = buffer[section_start:line_start]
+                yield (version_line, section, section_start, line_start,
+                       meta_scanner.find(start=section_start,
+                                         end=line_start))
+
+            version_line = this_version_line
+            section_start = line_end
+            matches_found += 1
+            read_section = (
+                (section_count is None or
+                 matches_found <= section_count) and
+                (section_filter is None or section_filter(version_line)))
+
+        if version_line is not None:
+            section = b""
+            if read_section:
+                section = buffer[section_start:len(buffer)]
+            yield (version_line, section, section_start, len(buffer),
+                   meta_scanner.find(start=section_start, end=len(buffer)))
+
+    def _iter_version_line_spans(self,
+                                 buffer: Union[bytes, mmap.mmap],
+                                 endpos: Optional[int] = None
+                                 ) -> Iterator[Tuple[str, int, int]]:
+        """
+        Iterate over the version lines of a changelog buffer
+
+        The version line regex is applied to the buffer as multiline bytes
+        regex, only the found version lines are decoded. A multiline bytes
+        regex does not know other line endings than "\n", a buffer with "\r"
+        line endings is scanned line by line instead, see
+        "_iter_decoded_version_line_spans".
+
+        :param      buffer:  The changelog file content
+        :type       buffer:  Union[bytes, mmap.mmap]
+        :param      endpos:  The offset to stop scanning at, the start of a
+                             line or the end of the buffer if None
+        :type       endpos:  Optional[int]
+
+        :returns:   Generator of version line, byte offset of its line start
+                    and byte offset of its line end
+        :rtype:     Iterator[Tuple[str, int, int]]
+        """
+        version_line_pattern = self.version_line_pattern
+        size = len(buffer) if endpos is None else endpos
+        if buffer.find(b"\r", 0, size) != -1:
+            yield from self._iter_decoded_version_line_spans(buffer=buffer,
+                                                             endpos=size)
+            return
+
+        search = compile_bytes_pattern(self.version_line_regex).search
+        position = 0
+
+        while position < size:
+            match = search(buffer, position, size)
+            if not match:
+                break
 
-        # the version line itself is also included, ignore it
-        self._latest_description_lines = latest_description_lines[1:]
+            line_start = buffer.rfind(b"\n", 0, match.start()) + 1
+            version_line = match.group()
+
+            if b"\n" in version_line or b"\r" in version_line:
+                # a bytes match might cross a line ending, apply the regex on
+                # the decoded line to get the same result as the line based
+                # scanning
+                line_end = buffer.find(b"\n", match.start(), size)
+                line_end = size if line_end == -1 else line_end + 1
+                position = line_end
+
+                line = buffer[line_start:line_end].decode(ENCODING)
+                match = version_line_pattern.search(
+                    line.rstrip("\r\n") + "\n")
+                if not match:
+                    continue
+                version_line = match.group()
+            else:
+                line_end = buffer.find(b"\n", match.end(), size)
+                line_end = size if line_end == -1 else line_end + 1
+                position = line_end
+                version_line = version_line.decode(ENCODING)
 
-        self.parse_meta_comment()
+            yield version_line, line_start, line_end
 
-        return release_version_lines
+    def _iter_decoded_version_line_spans(self,
+                                         buffer: Union[bytes, mmap.mmap],
+                                         endpos: int
+                                         ) -> Iterator[Tuple[str, int, int]]:
+        """
+        Iterate line by line over the version lines of a changelog buffer
+
+        Each line is decoded and searched like a line read in universal
+        newlines mode by the line engine, "\r\n" and "\r" line endings are
+        read as "\n".
+
+        :param      buffer:  The changelog file content
+        :type       buffer:  Union[bytes, mmap.mmap]
+        :param      endpos:  The offset to stop scanning at, the start of a
+                             line or the end of the buffer
+        :type       endpos:  int
+
+        :returns:   Generator of version line, byte offset of its line start
+                    and byte offset of its line end
+        :rtype:     Iterator[Tuple[str, int, int]]
+        """
+        search = self.version_line_pattern.search
+        line_start = 0
+
+        for newline in NEWLINE_BYTES_PATTERN.finditer(buffer, 0, endpos):
+            match = search(
+                buffer[line_start:newline.start()].decode(ENCODING) + "\n")
+            if match:
+                yield match.group(), line_start, newline.end()
+            line_start = newline.end()
+
+        if line_start < endpos:
+            match = search(buffer[line_start:endpos].decode(ENCODING))
+            if match:
+                yield match.group(), line_start, endpos
+
+    def load_index(self, changelog_file: Path) -> 'ChangelogIndex':
+        """
+        Load the index of the changelog, update it if it is outdated
+
+        The index file is updated if the changelog content or the regex
+        patterns changed since its creation. If only new releases have been
+        prepended to the changelog, only the new head of the changelog is
+        scanned and the offsets of the already indexed releases are shifted.
+
+        :param      changelog_file:  The path to the changelog file
+        :type       changelog_file:  Path
+
+        :returns:   Up to date index of the changelog
+        :rtype:     ChangelogIndex
+        """
+        if self.index_file is None:
+            raise ExtractVersionError("No index file specified")
+
+        # the index is imported only if used, to start fast without it
+        from .changelog_index import ChangelogIndex
+        from .fingerprint import FileFingerprint, buffer_sha1
+
+        index = ChangelogIndex(index_file=self.index_file,
+                               logger=self._logger)
+        regex = {
+            "version_line": self.version_line_regex,
+            "semver_line": self.semver_line_regex,
+            "date_line": self.date_line_regex,
+        }
+
+        if index.load(changelog_file=changelog_file, regex=regex):
+            self._logger.debug("Using index file '{}'".format(
+                self.index_file))
+            return index
+
+        # take the modification time before reading, a change while reading
+        # outdates the index on its next usage
+        stat = os.stat(changelog_file)
+
+        with map_file(changelog_file) as buffer:
+            sha1 = buffer_sha1(buffer=buffer)
+            result = None
+            if index.fingerprint is not None:
+                result = self._update_index_entries(buffer=buffer,
+                                                    index=index)
+
+            if result is None:
+                self._logger.debug("Creating index file '{}' of '{}'".format(
+                    self.index_file, changelog_file))
+                entries = self._scan_index_entries(buffer=buffer,
+                                                   endpos=len(buffer))
+                tail_start = (entries[0].header_start if entries
+                              else len(buffer))
+                if tail_start == 0:
+                    tail_sha1 = sha1
+                else:
+                    tail_sha1 = buffer_sha1(buffer=buffer, start=tail_start)
+            else:
+                entries, tail_sha1 = result
+
+            fingerprint = FileFingerprint(size=len(buffer),
+                                          mtime_ns=stat.st_mtime_ns,
+                                          sha1=sha1)
+
+        index.update(changelog_file=changelog_file,
+                     fingerprint=fingerprint,
+                     regex=regex,
+                     entries=entries,
+                     tail_sha1=tail_sha1)
+        index.save()
+
+        return index
+
+    def _scan_index_entries(self,
+                            buffer: Union[bytes, mmap.mmap],
+                            endpos: int) -> List['IndexEntry']:
+        """
+        Scan the version lines of a buffer into index entries
+
+        :param      buffer:  The changelog file content
+        :type       buffer:  Union[bytes, mmap.mmap]
+        :param      endpos:  The offset to stop scanning at, end of the last
+                             section
+        :type       endpos:  int
+
+        :returns:   Index entries in changelog order
+        :rtype:     List[IndexEntry]
+        """
+        from .changelog_index import IndexEntry
+
+        entries = []
+        meta_scanner = SectionMetaScanner(buffer=buffer, endpos=endpos)
+        previous = None
+
+        for line, line_start, line_end in self._iter_version_line_spans(
+                buffer=buffer, endpos=endpos):
+            if previous is not None:
+                entries.append(IndexEntry(
+                    *previous,
+                    section_end=line_start,
+                    meta_comment=meta_scanner.find(start=previous[-1],
+                                                   end=line_start)))
+            previous = (
+                self.find_release_version(release_version_line=line),
+                self.parse_semver_line_date(release_version_line=line),
+                line_start,
+                line_end,
+            )
+
+        if previous is not None:
+            entries.append(IndexEntry(
+                *previous,
+                section_end=endpos,
+                meta_comment=meta_scanner.find(start=previous[-1],
+                                               end=endpos)))
+
+        return entries
+
+    def _update_index_entries(self,
+                              buffer: Union[bytes, mmap.mmap],
+                              index: 'ChangelogIndex'
+                              ) -> Optional[Tuple[List['IndexEntry'], str]]:
+        """
+        Update outdated index entries with the new head of the changelog
+
+        The indexed releases are reused if they are still the unchanged end
+        of the changelog, which is the case if new releases have only been
+        prepended. Just the content in front of them is scanned.
+
+        :param      buffer:  The changelog file content
+        :type       buffer:  Union[bytes, mmap.mmap]
+        :param      index:   The outdated index of the changelog
+        :type       index:   ChangelogIndex
+
+        :returns:   Index entries and SHA1 hex digest of the changelog from
+                    the first version line on, None if the indexed releases
+                    are no longer the end of the changelog
+        :rtype:     Optional[Tuple[List[IndexEntry], str]]
+        """
+        from .fingerprint import buffer_sha1
+
+        if not index.entries:
+            return None
+
+        tail_size = index.fingerprint.size - index.tail_start
+        tail_start = len(buffer) - tail_size
+        if tail_start < 0:
+            return None
+
+        # the first indexed version line has to stay at the start of a line
+        if tail_start > 0 and buffer[tail_start - 1:tail_start] != b"\n":
+            return None
+
+        if buffer_sha1(buffer=buffer, start=tail_start) != index.tail_sha1:
+            return None
+
+        head_entries = self._scan_index_entries(buffer=buffer,
+                                                endpos=tail_start)
+        self._logger.debug("Found {} new releases in front of {} indexed "
+                           "releases".format(len(head_entries),
+                                             len(index.entries)))
+
+        shift = tail_start - index.tail_start
+        entries = head_entries + [entry.shifted(shift)
+                                  for entry in index.entries]
+
+        tail_sha1 = index.tail_sha1
+        if head_entries:
+            tail_sha1 = buffer_sha1(buffer=buffer,
+                                    start=head_entries[0].header_start)
+
+        return entries, tail_sha1
+
+    def get_release(self,
+                    changelog_file: Path,
+                    version: Optional[str] = None) -> Optional[Release]:
+        """
+        Get a single release of the changelog
+
+        With an index file only the section of the release is read from the
+        changelog, otherwise the changelog is scanned up to the release
+        without reading the sections of the previous releases.
+
+        :param      changelog_file:  The path to the changelog file
+        :type       changelog_file:  Path
+        :param      version:         The semantic version string, e.g.
+                                     "0.2.0", the latest release if None
+        :type       version:         Optional[str]
+
+        :returns:   Release, None if the version is not found
+        :rtype:     Optional[Release]
+        """
+        if self.index_file is not None:
+            return self._get_indexed_release(
+                changelog_file=changelog_file,
+                index=self.load_index(changelog_file=changelog_file),
+                version=version)
+
+        if version is None:
+            with closing(self.iter_releases(changelog_file=changelog_file,
+                                            section_count=1)) as releases:
+                return next(releases, None)
+
+        found_lines = []
+
+        def is_release(line: str) -> bool:
+            if self.find_release_version(release_version_line=line) == \
+                    version:
+                found_lines.append(line)
+                return True
+            return False
+
+        with closing(self._iter_sections(changelog_file=changelog_file,
+                                         section_filter=is_release)) as \
+                sections:
+            for line, section, section_start, section_end, meta_comment in \
+                    sections:
+                if found_lines and line == found_lines[0]:
+                    return Release(
+                        version=version,
+                        date=self.parse_semver_line_date(
+                            release_version_line=line),
+                        section=section,
+                        section_start=section_start,
+                        section_end=section_end,
+                        buffer=None,
+                        meta_comment=meta_comment,
+                    )
+
+        return None
+
+    def _get_indexed_release(self,
+                             changelog_file: Path,
+                             index: 'ChangelogIndex',
+                             version: Optional[str] = None
+                             ) -> Optional[Release]:
+        """
+        Get a single release of the changelog from its loaded index
+
+        Only the section of the release is read from the changelog.
+
+        :param      changelog_file:  The path to the changelog file
+        :type       changelog_file:  Path
+        :param      index:           The up to date index of the changelog
+        :type       index:           ChangelogIndex
+        :param      version:         The semantic version string, e.g.
+                                     "0.2.0", the latest release if None
+        :type       version:         Optional[str]
+
+        :returns:   Release, None if the version is not found
+        :rtype:     Optional[Release]
+        """
+        if version is None:
+            entry = index.latest
+        else:
+            entry = index.find(version)
+
+        if entry is None:
+            return None
+
+        return Release(
+            version=entry.version,
+            date=entry.date,
+            section=index.read_section(changelog_file=changelog_file,
+                                       entry=entry),
+            section_start=entry.section_start,
+            section_end=entry.section_end,
+            buffer=None,
+            meta_comment=entry.meta_comment,
+        )
 
     def parse_semver_line_date(self, release_version_line: str) -> str:
         """
@@ -308,7 +1236,7 @@ class ExtractVersion(object):
         """
         date_string = "1970-01-01"
 
-        match = re.search(self.date_line_regex, release_version_line)
+        match = self.date_line_pattern.search(release_version_line)
         if match:
             if len(match.groups()) >= 4 and match.group(2):
                 date_string = match.group(1) + match.group(2)
@@ -317,9 +1245,37 @@ class ExtractVersion(object):
 
         return date_string
 
+    def find_release_version(self, release_version_line: str) -> str:
+        """
+        Get the semantic version of a release version line
+
+        Like "parse_semver_line" without changing the SemVer data, to list
+        releases without creating a VersionInfo object per release.
+
+        :param      release_version_line:  The release version line
+        :type       release_version_line:  str
+
+        :returns:   Semantic version string, "0.0.0" if not found
+        :rtype:     str
+        """
+        return self._find_semver_string(
+            release_version_line=release_version_line) or "0.0.0"
+
+    def _set_semver_string(self, semver_string: str) -> None:
+        """
+        Set the SemVer data to a valid semantic version string
+
+        The VersionInfo object is only created on access of "semver_data".
+
+        :param      semver_string:  The semantic version string
+        :type       semver_string:  str
+        """
+        self._semver_string = semver_string
+        self._semver_data = None
+
     def parse_semver_line(self, release_version_line: str) -> str:
         """
-        Parse a version line for a semantic version
+        Parse a version line for a semantic version and set the SemVer data
 
         Examples of a valid SemVer line:
         - "## [0.2.0] - 2022-05-19"
@@ -332,42 +1288,64 @@ class ExtractVersion(object):
         :returns:   Semantic version string, e.g. "0.2.0"
         :rtype:     str
         """
-        semver_string = "0.0.0"
+        semver_string = self._find_semver_string(
+            release_version_line=release_version_line)
+        if semver_string is None:
+            return "0.0.0"
+
+        self._set_semver_string(semver_string=semver_string)
+        return semver_string
+
+    def _find_semver_string(self,
+                            release_version_line: str) -> Optional[str]:
+        """
+        Find the semantic version of a version line
+
+        The version string is validated once, no VersionInfo object is
+        created and the SemVer data is not changed.
 
+        Examples of a valid SemVer line:
+        - "## [0.2.0] - 2022-05-19"
+        - "## [107.3.18] - 1900-01-01 12:34:56"
+        - "## [1.0.0-alpha-a.b-c-somethinglong+build.1-aef.1-its-okay] - 2012-01-02"    # noqa
+
+        :param      release_version_line:  The release version line
+        :type       release_version_line:  str
+
+        :returns:   Semantic version string, e.g. "0.2.0", None if not found
+        :rtype:     Optional[str]
+        """
         # try to extract any content between square brackets
-        match = re.search(r"\[(.*?)\]", release_version_line)
+        match = BRACKET_CONTENT_PATTERN.search(release_version_line)
         if not match:
-            return semver_string
+            return None
 
         # the potential semver content is the first group of the complete line
         potential_semver = match.group(1)
 
         # try to extract semver from release version line
-        match = re.search(self.semver_line_regex, potential_semver)
+        match = self.semver_line_pattern.search(potential_semver)
 
-        if match:
-            semver_string = match.group()
-            if not VersionInfo.isvalid(semver_string):
-                self._logger.error("Parsed SemVer string is invalid, check "
-                                   "the changelog format")
-                raise ValueError("Invalid SemVer string")
-            self._logger.debug("Extracted SemVer string: '{}'".
-                               format(semver_string))
-            self.semver_data = VersionInfo.parse(semver_string)
-        else:
+        if not match:
             self._logger.warning("No SemVer string found in given release "
                                  "version line: '{}'".
                                  format(release_version_line))
+            return None
+
+        semver_string = match.group()
+        if not is_valid_semver(semver_string):
+            self._logger.error("Parsed SemVer string is invalid, check "
+                               "the changelog format")
+            raise ValueError("Invalid SemVer string")
+        self._logger.debug("Extracted SemVer string: '{}'".
+                           format(semver_string))
 
         return semver_string
 
     def parse_meta_comment(self) -> None:
         """Find and parse meta comment line of all parsed description lines"""
-        for line in self.latest_description_lines:
-            # try to extract any comment with "meta ="
-            match = re.search(r"(<!--\smeta\s=\s)(.*?)(\s-->)", line)
+        meta_data = parse_meta_data(self.latest_description_lines)
 
-            if match and len(match.groups()) == 3:
-                self._meta_data = json.loads(match.groups()[1].replace("'", "\""))  # noqa: E501
-                self._logger.debug("Meta Data: '{}'".format(self._meta_data))
-                break
+        if meta_data:
+            self._meta_data = meta_data
+            self._logger.debug("Meta Data: '{}'".format(self._meta_data))
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""Write files atomically without unnecessary modifications"""
+
+import os
+from pathlib import Path
+from stat import S_IMODE
+from uuid import uuid4
+
+
+def file_content_equals(file_path: Path, data: bytes) -> bool:
+    """
+    Check a file contains exactly the data
+
+    The sizes are compared first, the file is only read if they are equal.
+
+    :param      file_path:  The path to the file
+    :type       file_path:  Path
+    :param      data:       The data
+    :type       data:       bytes
+
+    :returns:   True if the file content equals the data, False if it differs
+                or the file does not exist
+    :rtype:     bool
+    """
+    try:
+        if os.stat(file_path).st_size != len(data):
+            return False
+        with open(file_path, "rb") as file:
+            return file.read() == data
+    except FileNotFoundError:
+        return False
+
+
+def write_file_if_changed(file_path: Path, data: bytes) -> bool:
+    """
+    Write data atomically to a file if the file content differs
+
+    An unchanged file keeps its modification time. A changed file is
+    replaced by a completely written temporary file, readers never see a
+    partially written file. The permissions of an existing file are kept.
+
+    :param      file_path:  The path to the file
+    :type       file_path:  Path
+    :param      data:       The data
+    :type       data:       bytes
+
+    :returns:   True if the file has been written, False if it is unchanged
+    :rtype:     bool
+    """
+    file_path = Path(file_path)
+    if file_content_equals(file_path=file_path, data=data):
+        return False
+
+    try:
+        stat = file_path.stat()
+    except FileNotFoundError:
+        stat = None
+
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = file_path.with_name(".{}.{}.tmp".format(file_path.name,
+                                                       uuid4().hex))
+
+    # create the temporary file like a new file, with permissions based on
+    # the umask
+    fd = os.open(tmp_path,
+                 os.O_WRONLY | os.O_CREAT | os.O_EXCL |
+                 getattr(os, "O_BINARY", 0),
+                 0o666)
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(data)
+        if stat is not None:
+            os.chmod(tmp_path, S_IMODE(stat.st_mode))
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        tmp_path.unlink()
+        raise
+
+    return True
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""Fingerprint files to detect changes without parsing them again"""
+
+import hashlib
+import mmap
+import os
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+# size of the chunks to hash a file
+CHUNK_SIZE = 1024 * 1024
+
+
+def file_sha1(file_path: Union[Path, str]) -> str:
+    """
+    Get the SHA1 hex digest of a file content
+
+    :param      file_path:  The path to the file
+    :type       file_path:  Union[Path, str]
+
+    :returns:   SHA1 hex digest
+    :rtype:     str
+    """
+    sha1 = hashlib.sha1()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            sha1.update(chunk)
+    return sha1.hexdigest()
+
+
+def buffer_sha1(buffer: Union[bytes, mmap.mmap], start: int = 0) -> str:
+    """
+    Get the SHA1 hex digest of a buffer content without copying it
+
+    :param      buffer:  The buffer, e.g. a memory mapped file
+    :type       buffer:  Union[bytes, mmap.mmap]
+    :param      start:   The offset to start hashing at
+    :type       start:   int
+
+    :returns:   SHA1 hex digest
+    :rtype:     str
+    """
+    with memoryview(buffer) as view, view[start:] as tail:
+        return hashlib.sha1(tail).hexdigest()
+
+
+@dataclass(frozen=True)
+class FileFingerprint(object):
+    """Size, modification time and content hash of a file"""
+    size: int
+    mtime_ns: int
+    sha1: str
+
+    @classmethod
+    def from_file(cls,
+                  file_path: Union[Path, str],
+                  sha1: Optional[str] = None) -> 'FileFingerprint':
+        """
+        Create the fingerprint of a file
+
+        :param      file_path:  The path to the file
+        :type       file_path:  Union[Path, str]
+        :param      sha1:       Already known SHA1 hex digest of the content
+        :type       sha1:       Optional[str]
+
+        :returns:   Fingerprint of the file
+        :rtype:     FileFingerprint
+        """
+        stat = os.stat(file_path)
+        if sha1 is None:
+            sha1 = file_sha1(file_path)
+        return cls(size=stat.st_size, mtime_ns=stat.st_mtime_ns, sha1=sha1)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Union[int, str]]) -> 'FileFingerprint':
+        """
+        Create a fingerprint from its dictionary representation
+
+        :param      data:  The fingerprint data
+        :type       data:  Dict[str, Union[int, str]]
+
+        :returns:   Fingerprint
+        :rtype:     FileFingerprint
+        """
+        return cls(size=int(data["size"]),
+                   mtime_ns=int(data["mtime_ns"]),
+                   sha1=str(data["sha1"]))
+
+    def to_dict(self) -> Dict[str, Union[int, str]]:
+        """
+        Get the dictionary representation of the fingerprint
+
+        :returns:   Fingerprint data
+        :rtype:     Dict[str, Union[int, str]]
+        """
+        return asdict(self)
+
+    def refresh(self,
+                file_path: Union[Path, str]) -> Optional['FileFingerprint']:
+        """
+        Get the current fingerprint of a file if its content is unchanged
+
+        A different size means a changed content. The same size and
+        modification time means an unchanged content. Otherwise the content
+        hash decides, e.g. after a fresh checkout of the file.
+
+        :param      file_path:  The path to the file
+        :type       file_path:  Union[Path, str]
+
+        :returns:   Current fingerprint, None if the content changed
+        :rtype:     Optional[FileFingerprint]
+        """
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+
+        if stat.st_size != self.size:
+            return None
+        if stat.st_mtime_ns == self.mtime_ns:
+            return self
+        if file_sha1(file_path) != self.sha1:
+            return None
+
+        return FileFingerprint(size=stat.st_size,
+                               mtime_ns=stat.st_mtime_ns,
+                               sha1=self.sha1)
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""Select the releases of a changelog by version and date ranges"""
+
+import re
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from typing import (TYPE_CHECKING, Any, Dict, Iterable, Iterator, Optional,
+                    Sequence, Set, Tuple)
+
+from .semver_batch import VersionArray, precedence_key
+
+if TYPE_CHECKING:
+    from .changelog_data import Release
+
+# ISO8601 date at the start of a date string, e.g. "2022-05-19"
+DATE_PATTERN = re.compile(r"\d{4}-\d{2}-\d{2}")
+# options of a release query
+QUERY_OPTIONS = ("since_version", "until_version", "since_date", "limit")
+
+
+@dataclass(frozen=True)
+class ReleaseQuery(object):
+    """Version and date range of the releases to select"""
+    #: Lowest semantic version to select, e.g. "0.2.0"
+    since_version: Optional[str] = None
+    #: Highest semantic version to select, e.g. "1.0.0"
+    until_version: Optional[str] = None
+    #: Earliest ISO8601 date to select, e.g. "2022-05-19"
+    since_date: Optional[str] = None
+    #: Maximum number of releases to select, the latest ones
+    limit: Optional[int] = None
+
+    def __post_init__(self) -> None:
+        """
+        Validate the query
+
+        :raises     ValueError:  A version, the date or the limit is invalid
+        """
+        for version in (self.since_version, self.until_version):
+            if version is not None:
+                precedence_key(version)
+
+        if self.since_date is not None and \
+                not DATE_PATTERN.match(self.since_date):
+            raise ValueError("Invalid ISO8601 date: '{}'".format(
+                self.since_date))
+
+        if self.limit is not None and self.limit < 1:
+            raise ValueError("Limit has to be at least 1")
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> Optional['ReleaseQuery']:
+        """
+        Create a query of the query options of a dictionary
+
+        :param      data:  The data with optional query options
+        :type       data:  Dict[str, Any]
+
+        :returns:   Release query, None if no query option is given
+        :rtype:     Optional[ReleaseQuery]
+        """
+        options = {key: data[key] for key in QUERY_OPTIONS
+                   if data.get(key) is not None}
+        if not options:
+            return None
+        return cls(**options)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Get the given query options
+
+        :returns:   Query options, without the ones not given
+        :rtype:     Dict[str, Any]
+        """
+        return {key: getattr(self, key) for key in QUERY_OPTIONS
+                if getattr(self, key) is not None}
+
+    def filter(self, releases: Iterable['Release']) -> Iterator['Release']:
+        """
+        Select the releases of a changelog while reading it
+
+        The releases are selected in changelog order, a release out of the
+        ranges is skipped. Backported releases may be listed between newer
+        ones, neither the versions nor the dates of a changelog are sorted,
+        only the limit stops consuming the releases.
+
+        :param      releases:  The releases in changelog order
+        :type       releases:  Iterable[Release]
+
+        :returns:   Generator of the selected releases in changelog order
+        :rtype:     Iterator[Release]
+        """
+        since_key = None
+        until_key = None
+        if self.since_version is not None:
+            since_key = precedence_key(self.since_version)
+        if self.until_version is not None:
+            until_key = precedence_key(self.until_version)
+        selected = 0
+
+        for release in releases:
+            if self.since_date is not None and \
+                    release.date < self.since_date:
+                continue
+
+            if since_key is not None or until_key is not None:
+                key = precedence_key(release.version)
+                if since_key is not None and key < since_key:
+                    continue
+                if until_key is not None and key > until_key:
+                    continue
+
+            yield release
+
+            selected += 1
+            if self.limit is not None and selected >= self.limit:
+                return
+
+
+class ReleaseIndex(object):
+    """Releases sorted by version and date to select ranges by bisection"""
+    def __init__(self, releases: Sequence['Release']):
+        """
+        Init ReleaseIndex class
+
+        :param      releases:  The releases in changelog order
+        :type       releases:  Sequence[Release]
+        """
+        self._releases = releases
+
+        versions = VersionArray(release.version for release in releases)
+        self._version_order = versions.argsort()
+        keys = versions.precedence_keys()
+        self._version_keys = [keys[index] for index in self._version_order]
+
+        dates = [release.date for release in releases]
+        self._date_order = sorted(range(len(dates)), key=dates.__getitem__)
+        self._dates = [dates[index] for index in self._date_order]
+
+    def select(self, query: ReleaseQuery) -> Tuple['Release', ...]:
+        """
+        Select the releases of a query
+
+        Selects the same releases as "ReleaseQuery.filter" by bisection of
+        the releases sorted once by version and date.
+
+        :param      query:  The query
+        :type       query:  ReleaseQuery
+
+        :returns:   Selected releases in changelog order
+        :rtype:     Tuple[Release, ...]
+        """
+        selected = None     # type: Optional[Set[int]]
+
+        if query.since_version is not None or \
+                query.until_version is not None:
+            start = 0
+            end = len(self._version_keys)
+            if query.since_version is not None:
+                start = bisect_left(self._version_keys,
+                                    precedence_key(query.since_version))
+            if query.until_version is not None:
+                end = bisect_right(self._version_keys,
+                                   precedence_key(query.until_version))
+            selected = set(self._version_order[start:end])
+
+        if query.since_date is not None:
+            start = bisect_left(self._dates, query.since_date)
+            date_selected = set(self._date_order[start:])
+            if selected is None:
+                selected = date_selected
+            else:
+                selected &= date_selected
+
+        if selected is None:
+            indices = list(range(len(self._releases)))
+        else:
+            indices = sorted(selected)
+        if query.limit is not None:
+            indices = indices[:query.limit]
+
+        return tuple(self._releases[index] for index in indices)
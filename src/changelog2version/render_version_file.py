@@ -4,12 +4,74 @@
 """Render version file based on template"""
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Union
+from typing import Callable, Iterable, List, Optional, TypeVar, Union
 
-from jinja2 import Environment, FileSystemLoader
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+from semver import VersionInfo
 
-from .extract_version import ExtractVersion
+from .changelog_data import ENCODING
+from .file_utils import file_content_equals, write_file_if_changed
+
+# package template files of the supported version file types
+DEFAULT_TEMPLATE_FILES = {
+    "py": "version.py.template",
+    "c": "version.h.template",
+}
+
+T = TypeVar("T")
+
+
+def get_environment(template_path: Union[Path, str],
+                    bytecode_cache_dir: Optional[Union[Path, str]] = None
+                    ) -> Environment:
+    """
+    Get the shared jinja2 environment of a template search path
+
+    The environments are cached to keep the compiled templates of the jinja2
+    environment across renderings, the least recently used ones are dropped.
+    Changed template files are compiled again by the environment.
+
+    :param      template_path:       The template search path
+    :type       template_path:       Union[Path, str]
+    :param      bytecode_cache_dir:  The directory to cache the compiled
+                                     templates across processes
+    :type       bytecode_cache_dir:  Optional[Union[Path, str]]
+
+    :returns:   Environment of the template search path
+    :rtype:     Environment
+    """
+    if bytecode_cache_dir is not None:
+        bytecode_cache_dir = Path(bytecode_cache_dir)
+    return _create_environment(Path(template_path), bytecode_cache_dir)
+
+
+@lru_cache(maxsize=32)
+def _create_environment(template_path: Path,
+                        bytecode_cache_dir: Optional[Path]) -> Environment:
+    """
+    Create a jinja2 environment of a template search path
+
+    :param      template_path:       The template search path
+    :type       template_path:       Path
+    :param      bytecode_cache_dir:  The directory to cache the compiled
+                                     templates across processes
+    :type       bytecode_cache_dir:  Optional[Path]
+
+    :returns:   Environment of the template search path
+    :rtype:     Environment
+    """
+    bytecode_cache = None
+    if bytecode_cache_dir is not None:
+        bytecode_cache_dir.mkdir(parents=True, exist_ok=True)
+        bytecode_cache = FileSystemBytecodeCache(str(bytecode_cache_dir))
+
+    return Environment(loader=FileSystemLoader(str(template_path)),
+                       keep_trailing_newline=True,
+                       bytecode_cache=bytecode_cache)
 
 
 class RenderVersionFileError(Exception):
@@ -17,24 +79,210 @@ class RenderVersionFileError(Exception):
     pass
 
 
+def select_template_file(template_file: Optional[Union[Path, str]],
+                         version_file_type: str) -> Union[Path, str]:
+    """
+    Select the template file, a package template if none is specified
+
+    :param      template_file:      The path to a custom template file
+    :type       template_file:      Optional[Union[Path, str]]
+    :param      version_file_type:  The version file type, e.g. "py" or "c"
+    :type       version_file_type:  str
+
+    :returns:   Template file or name of the package template file
+    :rtype:     Union[Path, str]
+    """
+    if template_file:
+        return template_file
+
+    if version_file_type in DEFAULT_TEMPLATE_FILES:
+        return DEFAULT_TEMPLATE_FILES[version_file_type]
+
+    raise KeyError("Either specify a custom template file or choose"
+                   "a template from this list: {}".
+                   format(DEFAULT_TEMPLATE_FILES.keys()))
+
+
+def create_version_file_content(semver_data: VersionInfo,
+                                additional_version_info: Optional[str] = None,
+                                additional_template_data: Optional[dict] = None
+                                ) -> dict:
+    """
+    Create the content to render a version file template
+
+    :param      semver_data:               The version to render
+    :type       semver_data:               VersionInfo
+    :param      additional_version_info:   Additional version info, e.g.
+                                           "-rc1234"
+    :type       additional_version_info:   Optional[str]
+    :param      additional_template_data:  Additional data to render
+    :type       additional_template_data:  Optional[dict]
+
+    :returns:   Template content
+    :rtype:     dict
+    """
+    additional_data = ""
+    if additional_version_info:
+        additional_data = " + '{}'".format(additional_version_info)
+    version_file_content = {
+        "major_version": semver_data.major,
+        "minor_version": semver_data.minor,
+        "patch_version": semver_data.patch,
+        "prerelease_data": semver_data.prerelease,
+        "build_data": semver_data.build,
+        "additional_data": additional_data,
+    }
+    if additional_template_data:
+        version_file_content.update(additional_template_data)
+
+    return version_file_content
+
+
+@dataclass(frozen=True)
+class RenderTarget(object):
+    """File to render with a template"""
+    #: Path to the rendered file
+    file_path: Path
+    #: Path to the template file or name of a package template file
+    template: Union[Path, str]
+
+
+def _map_targets(function: Callable[[RenderTarget], T],
+                 targets: Iterable[RenderTarget],
+                 workers: int) -> List[T]:
+    """
+    Apply a function to all targets, on a thread pool for several workers
+
+    :param      function:  The function to apply
+    :type       function:  Callable[[RenderTarget], T]
+    :param      targets:   The targets
+    :type       targets:   Iterable[RenderTarget]
+    :param      workers:   The maximum number of threads
+    :type       workers:   int
+
+    :returns:   Function results in the order of the targets
+    :rtype:     List[T]
+    """
+    targets = list(targets)
+    workers = min(workers, len(targets))
+
+    if workers <= 1:
+        return [function(target) for target in targets]
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(function, targets))
+
+
+def render_files(targets: Iterable[RenderTarget],
+                 content: dict,
+                 save_file: bool = True,
+                 workers: int = 1,
+                 logger: Optional[logging.Logger] = None,
+                 bytecode_cache_dir: Optional[Path] = None) -> List[str]:
+    """
+    Render several files with the same content
+
+    :param      targets:    The files to render with their templates
+    :type       targets:    Iterable[RenderTarget]
+    :param      content:    The content
+    :type       content:    dict
+    :param      save_file:  Save rendered content to the files
+    :type       save_file:  bool
+    :param      workers:    The maximum number of threads to render
+    :type       workers:    int
+    :param      logger:     Logger object
+    :type       logger:     Optional[logging.Logger]
+    :param      bytecode_cache_dir:  Directory to cache compiled templates
+    :type       bytecode_cache_dir:  Optional[Path]
+
+    :returns:   Rendered content of each target
+    :rtype:     List[str]
+    """
+    def render(target: RenderTarget) -> str:
+        file_renderer = RenderVersionFile(
+            logger=logger,
+            bytecode_cache_dir=bytecode_cache_dir)
+        file_renderer.render_file(file_path=target.file_path,
+                                  content=dict(content),
+                                  template=target.template,
+                                  save_file=save_file)
+        return file_renderer.content
+
+    return _map_targets(function=render, targets=targets, workers=workers)
+
+
+def validate_files(targets: Iterable[RenderTarget],
+                   content: dict,
+                   workers: int = 1,
+                   logger: Optional[logging.Logger] = None,
+                   bytecode_cache_dir: Optional[Path] = None) -> List[bool]:
+    """
+    Validate several existing files match their rendered templates
+
+    Each template is rendered only once per file name, the only file
+    specific content. The files are compared by size first and only read if
+    the sizes are equal.
+
+    :param      targets:  The files to validate with their templates
+    :type       targets:  Iterable[RenderTarget]
+    :param      content:  The content
+    :type       content:  dict
+    :param      workers:  The maximum number of threads to validate
+    :type       workers:  int
+    :param      logger:   Logger object
+    :type       logger:   Optional[logging.Logger]
+    :param      bytecode_cache_dir:  Directory to cache compiled templates
+    :type       bytecode_cache_dir:  Optional[Path]
+
+    :returns:   Validation result of each target
+    :rtype:     List[bool]
+    """
+    targets = list(targets)
+
+    unique_targets = {}
+    for target in targets:
+        unique_targets.setdefault((target.template, target.file_path.name),
+                                  target)
+
+    rendered = render_files(targets=unique_targets.values(),
+                            content=content,
+                            save_file=False,
+                            workers=workers,
+                            logger=logger,
+                            bytecode_cache_dir=bytecode_cache_dir)
+    expected_data = {key: data.encode(ENCODING)
+                     for key, data in zip(unique_targets.keys(), rendered)}
+
+    def validate(target: RenderTarget) -> bool:
+        return file_content_equals(
+            file_path=target.file_path,
+            data=expected_data[(target.template, target.file_path.name)])
+
+    return _map_targets(function=validate, targets=targets, workers=workers)
+
+
 class RenderVersionFile(object):
     """docstring for RenderVersionFile"""
     def __init__(self,
                  template_path: Optional[Path] = None,
-                 logger: Optional[logging.Logger] = None):
+                 logger: Optional[logging.Logger] = None,
+                 bytecode_cache_dir: Optional[Union[Path, str]] = None):
         """
         Init RenderVersionFile class
 
-        :param      template_path: Path to templates
-        :type       template_path: Path
-        :param      logger:        Logger object
-        :type       logger:        Optional[logging.Logger]
+        :param      template_path:       Path to templates
+        :type       template_path:       Path
+        :param      logger:              Logger object
+        :type       logger:              Optional[logging.Logger]
+        :param      bytecode_cache_dir:  Directory to cache compiled templates
+        :type       bytecode_cache_dir:  Optional[Union[Path, str]]
         """
         if logger is None:
-            logger = ExtractVersion._create_logger()
+            logger = logging.getLogger(__name__)
         self._logger = logger
 
         self._env = None
+        self.bytecode_cache_dir = bytecode_cache_dir
         self._default_template_path = Path(__file__).parent / "templates"
         self._content = ""
 
@@ -67,6 +315,27 @@ class RenderVersionFile(object):
             raise RenderVersionFileError(
                 "Specified directory '{}' doesn't exist".format(template_path))
 
+    @property
+    def bytecode_cache_dir(self) -> Optional[Path]:
+        """
+        Get directory to cache compiled templates across processes
+
+        :returns:   Path to the bytecode cache, None if not used
+        :rtype:     Optional[Path]
+        """
+        return self._bytecode_cache_dir
+
+    @bytecode_cache_dir.setter
+    def bytecode_cache_dir(self, value: Optional[Union[Path, str]]) -> None:
+        """
+        Set directory to cache compiled templates across processes
+
+        :param      value:  The path to the bytecode cache, None to not use it
+        :type       value:  Optional[Union[Path, str]]
+        """
+        self._bytecode_cache_dir = None if value is None else \
+            Path(value).resolve()
+
     @property
     def content(self) -> str:
         """
@@ -77,7 +346,7 @@ class RenderVersionFile(object):
         """
         return self._content
 
-    def _find_file(self, template: Union[Path, str]) -> Path:
+    def find_template(self, template: Union[Path, str]) -> Path:
         """
         Find template file on disk or in package templates directory
 
@@ -88,28 +357,14 @@ class RenderVersionFile(object):
         :rtype:     Path
         """
         template = Path(template)
-        template_path = ""
 
         if template.exists():
             self._logger.debug("Template '{}' found".format(template))
-            # check if file exists as the user specified it
-            if template.is_file():
-                template_path = template.parent
-            elif template.is_dir():
-                raise RenderVersionFileError(
-                    "Can not render a directory, please specify a single "
-                    "template file")
         elif (self.default_template_path / template).exists():
             # check if file might exist in the package templates directory
             self._logger.debug("Template '{}' found in package templates '{}'".
                                format(template, self.default_template_path))
             template = self.default_template_path / template
-            if template.is_file():
-                template_path = template.parent
-            elif template.is_dir():
-                raise RenderVersionFileError(
-                    "Can not render a directory, please specify a single "
-                    "template file")
         else:
             self._logger.error(
                 "Template '{}' neither found in package templates directory "
@@ -118,12 +373,33 @@ class RenderVersionFile(object):
             raise RenderVersionFileError(
                 "Template path/file '{}' does not exist".format(template))
 
+        if template.is_dir():
+            raise RenderVersionFileError(
+                "Can not render a directory, please specify a single "
+                "template file")
+
+        return template.resolve()
+
+    def _find_file(self, template: Union[Path, str]) -> Path:
+        """
+        Find template file and use the environment of its directory
+
+        :param      template:  The path to the template file
+        :type       template:  Union[Path, str]
+
+        :returns:   Resolved file location
+        :rtype:     Path
+        """
+        template_file = self.find_template(template=template)
+        template_path = template_file.parent
+
         self._logger.debug("Using template path: {}".format(template_path))
 
-        self._env = Environment(loader=FileSystemLoader(template_path),
-                                keep_trailing_newline=True)
+        self._env = get_environment(
+            template_path=template_path,
+            bytecode_cache_dir=self.bytecode_cache_dir)
 
-        return template.resolve()
+        return template_file
 
     def render_file(self,
                     file_path: Path,
@@ -156,10 +432,40 @@ class RenderVersionFile(object):
         if not save_file:
             return
 
-        Path(file_path.parent).mkdir(parents=True, exist_ok=True)
+        file_exists = file_path.exists()
+
+        if write_file_if_changed(file_path=file_path,
+                                 data=rendered_content.encode(ENCODING)):
+            if file_exists:
+                self._logger.info("Overwriting file '{}'".format(file_path))
+        else:
+            self._logger.debug("Content of file '{}' is unchanged".format(
+                file_path))
+
+    def validate_file(self,
+                      file_path: Path,
+                      content: dict,
+                      template: Union[Path, str]) -> bool:
+        """
+        Validate an existing file matches the rendered template
+
+        :param      file_path:  The path to the file
+        :type       file_path:  Path
+        :param      content:    The content
+        :type       content:    dict
+        :param      template:   The path to the template file
+        :type       template:   Union[Path, str]
 
-        if file_path.exists():
-            self._logger.info("Overwriting file '{}'".format(file_path))
+        :returns:   True if the file content equals the rendered content,
+                    False if it differs or the file does not exist
+        :rtype:     bool
+        """
+        self.render_file(
+            template=template,
+            file_path=file_path,
+            content=content,
+            save_file=False
+        )
 
-        with open(file_path, "w") as file:
-            file.write(rendered_content)
+        return file_content_equals(file_path=file_path,
+                                   data=self.content.encode(ENCODING))
@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""Tokenize, sort and compare many semantic versions at once"""
+
+import re
+import sys
+from array import array
+from typing import (Dict, Iterable, Iterator, List, MutableSequence, Tuple,
+                    Union)
+
+# largest value of an unsigned 64 bit array item
+ARRAY_MAX = 2 ** 64 - 1
+# semantic version of the SemVer 2.0.0 specification, one per line
+SEMVER_LINE_PATTERN = re.compile(
+    r"^(?P<major>0|[1-9]\d*)\.(?P<minor>0|[1-9]\d*)\.(?P<patch>0|[1-9]\d*)"
+    r"(?:-(?P<prerelease>(?:0|[1-9]\d*|\d*[a-zA-Z-][0-9a-zA-Z-]*)"
+    r"(?:\.(?:0|[1-9]\d*|\d*[a-zA-Z-][0-9a-zA-Z-]*))*))?"
+    r"(?:\+(?P<build>[0-9a-zA-Z-]+(?:\.[0-9a-zA-Z-]+)*))?$",
+    re.MULTILINE)
+
+# precedence of a prerelease identifier, (0, number) for numeric and
+# (1, string) for alphanumeric identifiers
+IdentifierKey = Tuple[int, Union[int, str]]
+# precedence of the prerelease part, (0, identifier keys) for a prerelease
+PrereleaseKey = Union[Tuple[int], Tuple[int, Tuple[IdentifierKey, ...]]]
+# precedence of a version, build meta data is ignored
+PrecedenceKey = Tuple[int, int, int, PrereleaseKey]
+
+# prerelease key of a release, higher than the key of any prerelease
+RELEASE_KEY = (1, )
+
+
+def create_identifier_key(identifier: str) -> IdentifierKey:
+    """
+    Create the precedence key of a single prerelease identifier
+
+    :param      identifier:  The prerelease identifier, e.g. "rc"
+    :type       identifier:  str
+
+    :returns:   (0, number) for numeric, (1, string) for alphanumeric
+    :rtype:     IdentifierKey
+    """
+    if identifier.isdigit():
+        return 0, int(identifier)
+    return 1, sys.intern(identifier)
+
+
+def create_prerelease_key(prerelease: str) -> PrereleaseKey:
+    """
+    Create the precedence key of a prerelease part
+
+    :param      prerelease:  The prerelease part, e.g. "rc.1"
+    :type       prerelease:  str
+
+    :returns:   (0, identifier keys) of the prerelease
+    :rtype:     PrereleaseKey
+    """
+    return 0, tuple(create_identifier_key(identifier)
+                    for identifier in prerelease.split("."))
+
+
+def precedence_key(version: str) -> PrecedenceKey:
+    """
+    Get the precedence key of a single semantic version
+
+    :param      version:  The semantic version string, e.g. "0.2.0"
+    :type       version:  str
+
+    :returns:   Key comparing like the version by SemVer 2.0.0 precedence
+    :rtype:     PrecedenceKey
+
+    :raises     ValueError:  The version is no valid semantic version
+    """
+    match = SEMVER_LINE_PATTERN.fullmatch(version)
+    if match is None:
+        raise ValueError("Invalid SemVer string: '{}'".format(version))
+
+    prerelease = match.group("prerelease")
+    return (int(match.group("major")),
+            int(match.group("minor")),
+            int(match.group("patch")),
+            RELEASE_KEY if prerelease is None else create_prerelease_key(
+                prerelease))
+
+
+def create_number_column(numbers: List[int]) -> MutableSequence[int]:
+    """
+    Create a compact column of version numbers
+
+    :param      numbers:  The version numbers
+    :type       numbers:  List[int]
+
+    :returns:   Unsigned 64 bit array, the list itself if a number exceeds it
+    :rtype:     MutableSequence[int]
+    """
+    if numbers and max(numbers) > ARRAY_MAX:
+        return numbers
+    return array('Q', numbers)
+
+
+class VersionArray(object):
+    """Semantic versions tokenized into compact columns"""
+    def __init__(self, versions: Iterable[str]):
+        """
+        Init VersionArray class
+
+        All versions are tokenized by a single regex pass over the joined
+        versions. Equal prerelease parts share a single interned key.
+
+        :param      versions:  The semantic version strings, e.g. "0.2.0"
+        :type       versions:  Iterable[str]
+
+        :raises     ValueError:  A version is no valid semantic version
+        """
+        self._versions = list(versions)
+        text = "\n".join(self._versions)
+        if text.count("\n") != max(len(self._versions) - 1, 0):
+            # a line break would split a version into two lines
+            raise ValueError("Invalid SemVer string: '{}'".format(
+                next(version for version in self._versions
+                     if "\n" in version)))
+
+        major = []
+        minor = []
+        patch = []
+        prerelease_keys = []
+        interned_keys = {}      # type: Dict[str, PrereleaseKey]
+
+        if self._versions:
+            line_start = 0
+            for match in SEMVER_LINE_PATTERN.finditer(text):
+                if match.start() != line_start:
+                    # a line without a match has been skipped
+                    break
+                line_start = match.end() + 1
+
+                major.append(int(match.group("major")))
+                minor.append(int(match.group("minor")))
+                patch.append(int(match.group("patch")))
+
+                prerelease = match.group("prerelease")
+                if prerelease is None:
+                    prerelease_keys.append(RELEASE_KEY)
+                    continue
+
+                key = interned_keys.get(prerelease)
+                if key is None:
+                    key = create_prerelease_key(prerelease)
+                    interned_keys[prerelease] = key
+                prerelease_keys.append(key)
+
+            if len(major) != len(self._versions):
+                raise ValueError("Invalid SemVer string: '{}'".format(
+                    self._versions[len(major)]))
+
+        self._major = create_number_column(major)
+        self._minor = create_number_column(minor)
+        self._patch = create_number_column(patch)
+        self._prerelease_keys = prerelease_keys
+
+    @property
+    def versions(self) -> List[str]:
+        """
+        Get the tokenized version strings
+
+        :returns:   Version strings in the given order
+        :rtype:     List[str]
+        """
+        return list(self._versions)
+
+    @property
+    def major(self) -> MutableSequence[int]:
+        """
+        Get the major versions
+
+        :returns:   Unsigned 64 bit array, a list if a version exceeds it
+        :rtype:     MutableSequence[int]
+        """
+        return self._major
+
+    @property
+    def minor(self) -> MutableSequence[int]:
+        """
+        Get the minor versions
+
+        :returns:   Unsigned 64 bit array, a list if a version exceeds it
+        :rtype:     MutableSequence[int]
+        """
+        return self._minor
+
+    @property
+    def patch(self) -> MutableSequence[int]:
+        """
+        Get the patch versions
+
+        :returns:   Unsigned 64 bit array, a list if a version exceeds it
+        :rtype:     MutableSequence[int]
+        """
+        return self._patch
+
+    def __len__(self) -> int:
+        """
+        Get the number of versions
+
+        :returns:   Number of versions
+        :rtype:     int
+        """
+        return len(self._versions)
+
+    def __getitem__(self, index: int) -> str:
+        """
+        Get a version string
+
+        :param      index:  The index of the version
+        :type       index:  int
+
+        :returns:   Version string
+        :rtype:     str
+        """
+        return self._versions[index]
+
+    def __iter__(self) -> Iterator[str]:
+        """
+        Iterate over the version strings
+
+        :returns:   Iterator of the version strings
+        :rtype:     Iterator[str]
+        """
+        return iter(self._versions)
+
+    def precedence_keys(self) -> List[PrecedenceKey]:
+        """
+        Get the precedence keys of all versions
+
+        Keys compare like the versions by SemVer 2.0.0 precedence, the build
+        meta data is ignored.
+
+        :returns:   Precedence keys in the given order
+        :rtype:     List[PrecedenceKey]
+        """
+        return list(zip(self._major,
+                        self._minor,
+                        self._patch,
+                        self._prerelease_keys))
+
+    def argsort(self, reverse: bool = False) -> List[int]:
+        """
+        Get the indices of the versions sorted by precedence
+
+        Versions of equal precedence keep their order.
+
+        :param      reverse:  Flag to sort the highest precedence first
+        :type       reverse:  bool
+
+        :returns:   Indices of the versions
+        :rtype:     List[int]
+        """
+        keys = self.precedence_keys()
+        return sorted(range(len(keys)), key=keys.__getitem__, reverse=reverse)
+
+    def sorted(self, reverse: bool = False) -> List[str]:
+        """
+        Get the versions sorted by precedence
+
+        :param      reverse:  Flag to sort the highest precedence first
+        :type       reverse:  bool
+
+        :returns:   Sorted version strings
+        :rtype:     List[str]
+        """
+        return [self._versions[index] for index in self.argsort(reverse)]
+
+    def compare(self, other: Union['VersionArray', str]) -> List[int]:
+        """
+        Compare the versions by precedence to another version or versions
+
+        :param      other:  A single version compared to all versions, or
+                            versions compared item by item
+        :type       other:  Union[VersionArray, str]
+
+        :returns:   -1, 0 or 1 per version, like "VersionInfo.compare"
+        :rtype:     List[int]
+
+        :raises     ValueError:  The number of versions is different
+        """
+        keys = self.precedence_keys()
+
+        if isinstance(other, str):
+            other_key = precedence_key(other)
+            return [(key > other_key) - (key < other_key) for key in keys]
+
+        if len(other) != len(keys):
+            raise ValueError("Can not compare {} to {} versions".format(
+                len(keys), len(other)))
+
+        return [(key > other_key) - (key < other_key)
+                for key, other_key in zip(keys, other.precedence_keys())]
+
+
+def sort_versions(versions: Iterable[str], reverse: bool = False) -> List[str]:
+    """
+    Sort semantic versions by SemVer 2.0.0 precedence
+
+    :param      versions:  The semantic version strings
+    :type       versions:  Iterable[str]
+    :param      reverse:   Flag to sort the highest precedence first
+    :type       reverse:   bool
+
+    :returns:   Sorted version strings
+    :rtype:     List[str]
+    """
+    return VersionArray(versions).sorted(reverse=reverse)
+
+
+def compare_versions(left: str, right: str) -> int:
+    """
+    Compare two semantic versions by SemVer 2.0.0 precedence
+
+    :param      left:   The left version
+    :type       left:   str
+    :param      right:  The right version
+    :type       right:  str
+
+    :returns:   -1 if left is lower, 0 if equal, 1 if left is higher
+    :rtype:     int
+    """
+    left_key = precedence_key(left)
+    right_key = precedence_key(right)
+    return (left_key > right_key) - (left_key < right_key)
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""Serve parse, render and validate requests on a Unix domain socket"""
+
+import json
+import logging
+import os
+import socket
+import socketserver
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Optional, Union
+
+if TYPE_CHECKING:
+    from .changelog_data import ParsedChangelog
+
+# request options with paths, they have to be absolute
+PATH_OPTIONS = ("changelog_file", "index_file")
+# size of the chunks to receive a response
+RECEIVE_SIZE = 64 * 1024
+
+
+class ServerError(Exception):
+    """Base class for exceptions in this module."""
+    pass
+
+
+def send_request(socket_file: Union[Path, str],
+                 request: Dict[str, Any],
+                 timeout: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Send a request to a server and wait for its response
+
+    The client only needs the standard library, neither the changelog parser
+    nor the template renderer are imported.
+
+    :param      socket_file:  The path to the Unix domain socket of the server
+    :type       socket_file:  Union[Path, str]
+    :param      request:      The JSON serializable request with a "command"
+    :type       request:      Dict[str, Any]
+    :param      timeout:      The seconds to wait for the server, endless if
+                              None
+    :type       timeout:      Optional[float]
+
+    :returns:   Response of the server
+    :rtype:     Dict[str, Any]
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(timeout)
+        client.connect(str(socket_file))
+        client.sendall(json.dumps(request).encode() + b"\n")
+        client.shutdown(socket.SHUT_WR)
+        data = b"".join(iter(lambda: client.recv(RECEIVE_SIZE), b""))
+
+    try:
+        response = json.loads(data)
+    except ValueError as e:
+        raise ServerError("Invalid response of server: {}".format(e))
+
+    if not response.get("ok"):
+        raise ServerError(response.get("error"))
+
+    return response
+
+
+class ChangelogRequestHandler(socketserver.StreamRequestHandler):
+    """Handle a single JSON request per connection"""
+    def handle(self) -> None:
+        """Read the request line and write the response line"""
+        line = self.rfile.readline()
+        if not line:
+            # connection closed without request, e.g. to check the server
+            return
+
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ServerError("Request has to be a JSON object")
+            response = self.server.process(request)
+        except Exception as e:
+            self.server.logger.debug("Request failed: {}".format(e))
+            response = {"ok": False,
+                        "error": "{}: {}".format(type(e).__name__, e)}
+
+        self.wfile.write(json.dumps(response).encode() + b"\n")
+
+
+class ChangelogServer(socketserver.ThreadingUnixStreamServer):
+    """Server keeping parsed changelogs and compiled templates in memory"""
+    daemon_threads = True
+
+    def __init__(self,
+                 socket_file: Union[Path, str],
+                 logger: Optional[logging.Logger] = None,
+                 bytecode_cache_dir: Optional[Union[Path, str]] = None):
+        """
+        Init ChangelogServer class
+
+        A left over socket file of a stopped server is replaced.
+
+        :param      socket_file:         The path to the Unix domain socket
+        :type       socket_file:         Union[Path, str]
+        :param      logger:              Logger object
+        :type       logger:              Optional[logging.Logger]
+        :param      bytecode_cache_dir:  Directory to cache compiled templates
+        :type       bytecode_cache_dir:  Optional[Union[Path, str]]
+        """
+        if logger is None:
+            logger = logging.getLogger(__name__)
+        self.logger = logger
+
+        self._socket_file = Path(socket_file)
+        self._bytecode_cache_dir = bytecode_cache_dir
+        # the client only needs the standard library
+        from .api import ChangelogCache
+
+        self._changelog_cache = ChangelogCache()
+
+        self._remove_stale_socket_file()
+        super().__init__(str(self._socket_file), ChangelogRequestHandler)
+
+    @property
+    def socket_file(self) -> Path:
+        """
+        Get path to the Unix domain socket
+
+        :returns:   Path to the socket file
+        :rtype:     Path
+        """
+        return self._socket_file
+
+    def _remove_stale_socket_file(self) -> None:
+        """Remove the socket file if no server is listening on it"""
+        if not self.socket_file.is_socket():
+            return
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            try:
+                client.connect(str(self.socket_file))
+            except (ConnectionRefusedError, FileNotFoundError):
+                self.logger.debug("Removing stale socket file '{}'".format(
+                    self.socket_file))
+                self.socket_file.unlink()
+            else:
+                raise ServerError("A server is already listening on '{}'".
+                                  format(self.socket_file))
+
+    def server_bind(self) -> None:
+        """Bind the socket, accessible only by the user of the server"""
+        # clients let the server write files with the rights of its user
+        previous_umask = os.umask(0o177)
+        try:
+            super().server_bind()
+        finally:
+            os.umask(previous_umask)
+
+    def server_close(self) -> None:
+        """Close the socket and remove the socket file"""
+        super().server_close()
+        try:
+            self.socket_file.unlink()
+        except FileNotFoundError:
+            pass
+
+    def parse(self, request: Dict[str, Any]) -> 'ParsedChangelog':
+        """
+        Get the parsed changelog of a request
+
+        A parsed changelog is kept until its fingerprint changes, the least
+        recently used changelogs are dropped. Only the releases selected by
+        the optional "since_version", "until_version", "since_date" and
+        "limit" are returned. With "descriptions" the descriptions of all
+        releases are kept.
+
+        :param      request:  The request with at least "changelog_file"
+        :type       request:  Dict[str, Any]
+
+        :returns:   Parsed changelog
+        :rtype:     ParsedChangelog
+        """
+        from .release_query import ReleaseQuery
+
+        return self._changelog_cache.parse(
+            changelog_file=request["changelog_file"],
+            version_line_regex=request.get("version_line_regex"),
+            semver_line_regex=request.get("semver_line_regex"),
+            engine=request.get("engine") or "line",
+            index_file=request.get("index_file"),
+            logger=self.logger,
+            query=ReleaseQuery.from_dict(request),
+            descriptions=bool(request.get("descriptions")))
+
+    def process(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Process a request
+
+        Commands are "ping", "shutdown", "parse" of a changelog, "render" and
+        "validate" of the version files in "targets", each with
+        "version_file" and optional "template_file" and "version_file_type".
+        With a "release" version the "changelog" of the response is the data
+        of this release instead of the changelog.
+
+        :param      request:  The request
+        :type       request:  Dict[str, Any]
+
+        :returns:   Response with "ok" and the parsed "changelog", the
+                    validation "results" of the targets for "validate"
+        :rtype:     Dict[str, Any]
+        """
+        command = request.get("command")
+
+        if command == "ping":
+            return {"ok": True}
+
+        if command == "shutdown":
+            # shutdown waits for the serving loop, which waits for this
+            # request
+            threading.Thread(target=self.shutdown).start()
+            return {"ok": True}
+
+        if command not in ("parse", "render", "validate"):
+            raise ServerError("Unknown command: {}".format(command))
+
+        if not request.get("changelog_file"):
+            raise ServerError("Request without 'changelog_file'")
+
+        targets = request.get("targets") or []
+        paths = [request.get(option) for option in PATH_OPTIONS]
+        for target in targets:
+            paths.extend((target.get("version_file"),
+                          target.get("template_file")))
+        for path in paths:
+            if path is not None and not Path(path).is_absolute():
+                raise ServerError("Paths have to be absolute: {}".format(
+                    path))
+
+        parsed_changelog = self.parse(request)
+        response = {
+            "ok": True,
+            "changelog": parsed_changelog.to_dict(
+                descriptions=bool(request.get("descriptions"))),
+        }
+
+        if request.get("release"):
+            from .api import get_release
+
+            release = get_release(
+                changelog_file=request["changelog_file"],
+                version=request["release"],
+                version_line_regex=request.get("version_line_regex"),
+                semver_line_regex=request.get("semver_line_regex"),
+                engine=request.get("engine") or "line",
+                index_file=request.get("index_file"),
+                logger=self.logger)
+            if release is None:
+                raise ServerError("Release {} not found".format(
+                    request["release"]))
+            response["changelog"] = release.to_dict()
+
+        if command != "parse" and targets:
+            from .api import VersionFile, render_version_files
+
+            version_files = [
+                VersionFile(file_path=Path(target["version_file"]),
+                            template_file=target.get("template_file"),
+                            version_file_type=target.get("version_file_type",
+                                                         "py"))
+                for target in targets
+            ]
+            results = render_version_files(
+                changelog=parsed_changelog,
+                version_files=version_files,
+                additional_version_info=request.get(
+                    "additional_version_info"),
+                additional_template_data=request.get(
+                    "additional_template_data"),
+                validate=command == "validate",
+                bytecode_cache_dir=self._bytecode_cache_dir,
+                logger=self.logger)
+
+            if command == "validate":
+                response["results"] = [result.valid for result in results]
+
+        return response
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""setuptools keyword to take the package version from the changelog"""
+
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from .api import (ChangelogCache, VersionFile, parse_changelog,
+                  render_version_files)
+from .changelog_data import ParsedChangelog
+
+# options of the "changelog2version" keyword of the setup call
+KEYWORD_OPTIONS = ("changelog_file", "version_file", "version_file_type",
+                   "template_file", "additional_version_info",
+                   "additional_template_data", "version_line_regex",
+                   "semver_line_regex", "engine", "index_file")
+# options with paths relative to the directory of the setup script
+PATH_OPTIONS = ("changelog_file", "version_file", "template_file",
+                "index_file")
+
+# parsed changelogs of all setup calls of this process, e.g. of the
+# metadata and wheel hooks of a PEP 517 build
+changelog_cache = ChangelogCache()
+
+
+def get_package_version(changelog: ParsedChangelog,
+                        additional_version_info: Optional[str] = None) -> str:
+    """
+    Get the package version of the latest changelog version
+
+    :param      changelog:                The parsed changelog
+    :type       changelog:                ParsedChangelog
+    :param      additional_version_info:  Additional version info like "rc1"
+    :type       additional_version_info:  Optional[str]
+
+    :returns:   Version like the "__version__" of the Python version file
+    :rtype:     str
+    """
+    semver_data = changelog.semver_data
+    return "{}.{}.{}{}".format(semver_data.major,
+                               semver_data.minor,
+                               semver_data.patch,
+                               additional_version_info or "")
+
+
+def update_package_version(options: Dict[str, Any],
+                           root: Optional[Path] = None,
+                           use_cache: bool = True) -> str:
+    """
+    Get the package version of a changelog and render its version file
+
+    :param      options:    The keyword options, at least "changelog_file"
+    :type       options:    Dict[str, Any]
+    :param      root:       The directory relative paths are based on
+    :type       root:       Optional[Path]
+    :param      use_cache:  Use the parsed changelogs of previous calls
+    :type       use_cache:  bool
+
+    :returns:   Package version
+    :rtype:     str
+    """
+    options = dict(options)
+    for key in PATH_OPTIONS:
+        if options.get(key) is not None:
+            path = Path(options[key])
+            if root is not None and not path.is_absolute():
+                path = root / path
+            options[key] = path
+
+    parse = changelog_cache.parse if use_cache else parse_changelog
+    changelog = parse(changelog_file=options["changelog_file"],
+                      version_line_regex=options.get("version_line_regex"),
+                      semver_line_regex=options.get("semver_line_regex"),
+                      engine=options.get("engine", "line"),
+                      index_file=options.get("index_file"))
+
+    if options.get("version_file") is not None:
+        version_file = VersionFile(
+            file_path=options["version_file"],
+            template_file=options.get("template_file"),
+            version_file_type=options.get("version_file_type", "py"))
+        render_version_files(
+            changelog=changelog,
+            version_files=[version_file],
+            additional_version_info=options.get("additional_version_info"),
+            additional_template_data=options.get("additional_template_data"))
+
+    return get_package_version(
+        changelog=changelog,
+        additional_version_info=options.get("additional_version_info"))
+
+
+def changelog2version_keyword(dist: Any, attr: str, value: Any) -> None:
+    """
+    Set the package version of the "changelog2version" setup keyword
+
+    Registered as "distutils.setup_keywords" entry point, setuptools calls it
+    for setup calls with the keyword. The version file is rendered in the
+    same pass, no separate process is needed before the build.
+
+    :param      dist:   The setuptools distribution
+    :type       dist:   setuptools.dist.Distribution
+    :param      attr:   The keyword name
+    :type       attr:   str
+    :param      value:  The keyword options, at least "changelog_file"
+    :type       value:  Any
+    """
+    from setuptools.errors import SetupError
+
+    if not isinstance(value, dict) or "changelog_file" not in value:
+        raise SetupError("{!r} must be a dict with 'changelog_file'".
+                         format(attr))
+
+    unknown_options = set(value.keys()) - set(KEYWORD_OPTIONS)
+    if unknown_options:
+        raise SetupError("Unknown {!r} options: {}".format(
+            attr, ", ".join(sorted(unknown_options))))
+
+    root = Path(getattr(dist, "src_root", None) or os.curdir)
+    try:
+        version = update_package_version(options=value, root=root)
+    except Exception as e:
+        raise SetupError("{!r} failed: {}".format(attr, e))
+
+    dist.metadata.version = version
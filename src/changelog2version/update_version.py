@@ -20,20 +20,29 @@ The semantic version tag inside the square brackets supports the full scope.
 """
 
 import argparse
-import fileinput
 import json
 import logging
 import re
-from hashlib import sha1
 from pathlib import Path
-from sys import stdout
+from sys import stderr, stdout
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, TypeVar
 
-import semver
-
-from .extract_version import ExtractVersion
-from .render_version_file import RenderVersionFile
+from .default_regex import (DATE_LINE_REGEX, SEMVER_LINE_REGEX,
+                            VERSION_LINE_REGEX)
 from .version import __version__
 
+if TYPE_CHECKING:
+    from .api import VersionFile
+    from .batch import BatchResult
+    from .extract_version import ExtractVersion
+    from .release_query import ReleaseQuery
+    from .render_version_file import RenderTarget
+
+# the renderer with jinja2 and the batch mode with multiprocessing are
+# imported only if required, to start fast for printing or dumping a changelog
+
+T = TypeVar("T")
+
 
 def parser_valid_file(parser: argparse.ArgumentParser, arg: str) -> Path:
     """
@@ -98,28 +107,71 @@ def parse_arguments() -> argparse.Namespace:
     # specific arguments
     parser.add_argument('--changelog_file',
                         dest='changelog_file',
-                        required=True,
+                        required=False,
                         type=lambda x: parser_valid_file(parser, x),
-                        help='Path to changelog file')
+                        help='Path to changelog file, required if no batch '
+                             'of changelogs is processed')
+
+    parser.add_argument('--batch',
+                        dest='batch_file',
+                        required=False,
+                        type=lambda x: parser_valid_file(parser, x),
+                        help='Path to JSON file with a list of jobs like '
+                             '{"changelog_file": "a/changelog.md", '
+                             '"version_file": "a/version.py"} to process '
+                             'instead of a single changelog')
+
+    parser.add_argument('--batch_glob',
+                        dest='batch_glob',
+                        required=False,
+                        help='Glob pattern of changelog files to process '
+                             'instead of a single changelog, version and '
+                             'index files are relative to each changelog')
+
+    parser.add_argument('--workers',
+                        dest='workers',
+                        required=False,
+                        type=int,
+                        help='Number of worker processes of a batch, number '
+                             'of CPUs by default')
 
     parser.add_argument('--version_file',
                         dest='version_file',
                         required=False,
-                        help='Path to rendered file')
+                        action='append',
+                        help='Path to rendered file, can be specified '
+                             'multiple times to render several files')
 
     parser.add_argument('--version_file_type',
                         dest='version_file_type',
                         required=False,
                         choices=['py', 'c'],
-                        default='py',
+                        action='append',
                         type=lambda x: x.lower(),
-                        help='Type of version file to generate')
+                        help='Type of version file to generate, once for all '
+                             'or once per version file, default "py"')
 
     parser.add_argument('--template_file',
                         dest='template_file',
                         required=False,
+                        action='append',
                         type=lambda x: parser_valid_file(parser, x),
-                        help='Path to template version file')
+                        help='Path to template version file, once for all or '
+                             'once per version file')
+
+    parser.add_argument('--render_workers',
+                        dest='render_workers',
+                        required=False,
+                        type=int,
+                        default=1,
+                        help='Number of threads to render several version '
+                             'files')
+
+    parser.add_argument('--bytecode_cache_dir',
+                        dest='bytecode_cache_dir',
+                        required=False,
+                        help='Directory to cache compiled templates across '
+                             'calls')
 
     parser.add_argument('--additional_template_data',
                         dest='additional_template_data',
@@ -147,6 +199,34 @@ def parse_arguments() -> argparse.Namespace:
                         help='Regex to extract semver part of from a version '
                              'line')
 
+    parser.add_argument('--engine',
+                        dest='engine',
+                        required=False,
+                        choices=['line', 'mmap'],
+                        default='line',
+                        help='Engine to scan the changelog, "mmap" scans '
+                             'large changelogs at once as memory mapped file')
+
+    parser.add_argument('--index_file',
+                        dest='index_file',
+                        required=False,
+                        help='Path to index file of the changelog releases, '
+                             'created or updated if the changelog changed')
+
+    parser.add_argument('--depfile',
+                        dest='depfile',
+                        required=False,
+                        help='Path to Makefile syntax dependency file like '
+                             '"gcc -MD" of the rendered files for Make, '
+                             'Ninja or CMake')
+
+    parser.add_argument('--stamp_file',
+                        dest='stamp_file',
+                        required=False,
+                        help='Path to stamp file of the inputs and outputs, '
+                             'the call is skipped if nothing changed since '
+                             'the last call. Not used with --print')
+
     parser.add_argument('--output',
                         dest='dump_to_file',
                         required=False,
@@ -169,11 +249,598 @@ def parse_arguments() -> argparse.Namespace:
                         action='store_true',
                         help='Print JSON data at stdout in readable format')
 
+    parser.add_argument('--descriptions',
+                        dest='descriptions',
+                        required=False,
+                        action='store_true',
+                        help='Output the description of every release in '
+                             'the releases of the JSON data')
+
+    parser.add_argument('--since_version', '--since-version',
+                        dest='since_version',
+                        required=False,
+                        help='Output only releases since this version')
+
+    parser.add_argument('--until_version', '--until-version',
+                        dest='until_version',
+                        required=False,
+                        help='Output only releases until this version')
+
+    parser.add_argument('--since_date', '--since-date',
+                        dest='since_date',
+                        required=False,
+                        help='Output only releases since this ISO8601 date, '
+                             'e.g. "2022-05-19"')
+
+    parser.add_argument('--release',
+                        dest='release',
+                        required=False,
+                        help='Output the version, description and date of '
+                             'this release instead of the whole changelog, '
+                             'version files are still rendered with the '
+                             'latest release')
+
+    parser.add_argument('--limit',
+                        dest='limit',
+                        required=False,
+                        type=int,
+                        help='Output only this number of the latest '
+                             'selected releases')
+
+    parser.add_argument('--serve',
+                        dest='serve_socket',
+                        required=False,
+                        help='Serve parse, render and validate requests on '
+                             'this Unix domain socket until interrupted')
+
+    parser.add_argument('--connect',
+                        dest='connect_socket',
+                        required=False,
+                        help='Send the request to the server on this Unix '
+                             'domain socket instead of processing it')
+
+    parser.add_argument('--watch',
+                        dest='watch',
+                        required=False,
+                        action='store_true',
+                        help='Keep running and update the version files on '
+                             'changes of the changelog or template files')
+
+    parser.add_argument('--watch_interval',
+                        dest='watch_interval',
+                        required=False,
+                        type=float,
+                        default=0.5,
+                        help='Seconds between two checks of the watched '
+                             'files')
+
     parsed_args = parser.parse_args()
 
+    if parsed_args.serve_socket or parsed_args.connect_socket:
+        # imported only if used, to start fast without it
+        import socket
+
+        if not hasattr(socket, "AF_UNIX"):
+            parser.error("Unix domain sockets are not supported on this "
+                         "platform")
+
+    if parsed_args.serve_socket:
+        return parsed_args
+
+    if not (parsed_args.changelog_file or parsed_args.batch_file or
+            parsed_args.batch_glob):
+        parser.error("Either --changelog_file, --batch or --batch_glob is "
+                     "required")
+
+    if parsed_args.workers is not None and parsed_args.workers < 1:
+        parser.error("Number of workers has to be at least 1")
+
+    if parsed_args.render_workers < 1:
+        parser.error("Number of render workers has to be at least 1")
+
+    version_file_count = len(parsed_args.version_file or [])
+    for option, values in (
+            ('--template_file', parsed_args.template_file),
+            ('--version_file_type', parsed_args.version_file_type)):
+        if values and len(values) not in (1, max(version_file_count, 1)):
+            parser.error("Specify {} once for all or once per version file".
+                         format(option))
+
+    if (parsed_args.batch_file or parsed_args.batch_glob) and \
+            version_file_count > 1:
+        parser.error("Only one version file per changelog is supported in "
+                     "batch mode")
+
+    if (parsed_args.batch_file or parsed_args.batch_glob) and \
+            (parsed_args.stamp_file or parsed_args.depfile):
+        parser.error("A stamp file or depfile is not supported in batch "
+                     "mode")
+
+    if parsed_args.watch and (
+            parsed_args.batch_file or parsed_args.batch_glob or
+            parsed_args.do_validate or parsed_args.print_result or
+            parsed_args.stamp_file or parsed_args.depfile):
+        parser.error("--watch is not supported with batch mode, --validate, "
+                     "--print, --stamp_file or --depfile")
+
+    if parsed_args.connect_socket and (
+            parsed_args.batch_file or parsed_args.batch_glob or
+            parsed_args.watch or parsed_args.stamp_file or
+            parsed_args.depfile):
+        parser.error("--connect is not supported with batch mode, --watch, "
+                     "--stamp_file or --depfile")
+
+    if parsed_args.watch_interval <= 0:
+        parser.error("Watch interval has to be greater than 0")
+
+    try:
+        release_query = create_release_query(args=parsed_args)
+    except ValueError as e:
+        parser.error(str(e))
+
+    if release_query is not None and \
+            (parsed_args.batch_file or parsed_args.batch_glob):
+        parser.error("--since_version, --until_version, --since_date and "
+                     "--limit are not supported in batch mode")
+
+    if parsed_args.descriptions and \
+            (parsed_args.batch_file or parsed_args.batch_glob):
+        parser.error("--descriptions is not supported in batch mode")
+
+    if parsed_args.release is not None:
+        from .semver_batch import precedence_key
+
+        try:
+            precedence_key(parsed_args.release)
+        except ValueError as e:
+            parser.error(str(e))
+
+        if release_query is not None or parsed_args.watch or \
+                parsed_args.batch_file or parsed_args.batch_glob:
+            parser.error("--release is not supported with batch mode, "
+                         "--watch, --since_version, --until_version, "
+                         "--since_date or --limit")
+
     return parsed_args
 
 
+def get_option(values: Optional[List[T]],
+               index: int,
+               default: Optional[T] = None) -> Optional[T]:
+    """
+    Get the value of an option specified once for all or once per file
+
+    :param      values:   The values of the option
+    :type       values:   Optional[List[T]]
+    :param      index:    The index of the file
+    :type       index:    int
+    :param      default:  The default value if the option is not specified
+    :type       default:  Optional[T]
+
+    :returns:   Value of the option for the file
+    :rtype:     Optional[T]
+    """
+    if not values:
+        return default
+    if len(values) == 1:
+        return values[0]
+    return values[index]
+
+
+def create_release_query(args: argparse.Namespace) -> Optional['ReleaseQuery']:
+    """
+    Create the query of the releases to output
+
+    :param      args:  The parsed CLI arguments
+    :type       args:  argparse.Namespace
+
+    :returns:   Release query, None if all releases are output
+    :rtype:     Optional[ReleaseQuery]
+
+    :raises     ValueError:  A version, the date or the limit is invalid
+    """
+    if all(getattr(args, key, None) is None
+           for key in ("since_version", "until_version", "since_date",
+                       "limit")):
+        return None
+
+    # the query support is imported only if used, to start fast without it
+    from .release_query import ReleaseQuery
+
+    return ReleaseQuery.from_dict(vars(args))
+
+
+def create_version_files(args: argparse.Namespace,
+                         logger: logging.Logger) -> List['VersionFile']:
+    """
+    Create the version files of the CLI arguments
+
+    :param      args:    The parsed CLI arguments
+    :type       args:    argparse.Namespace
+    :param      logger:  Logger object
+    :type       logger:  logging.Logger
+
+    :returns:   Version files with their templates
+    :rtype:     List[VersionFile]
+    """
+    if not args.version_file:
+        return []
+
+    from .api import VersionFile
+
+    version_files = []
+
+    for index, version_file in enumerate(args.version_file):
+        template_file = get_option(args.template_file, index)
+        version_file_type = get_option(args.version_file_type, index, "py")
+
+        if not template_file:
+            logger.debug("Select package template based on "
+                         "version_file_type: '{}'".format(version_file_type))
+
+        version_files.append(VersionFile(file_path=Path(version_file),
+                                         template_file=template_file,
+                                         version_file_type=version_file_type))
+
+    return version_files
+
+
+def create_stamp_options(args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    Create the options of a call affecting its outputs
+
+    Only the CLI arguments are used, neither the changelog parser nor the
+    renderer are imported to check a stamp.
+
+    :param      args:  The parsed CLI arguments
+    :type       args:  argparse.Namespace
+
+    :returns:   Options to compare with the stamp of the last call
+    :rtype:     Dict[str, Any]
+    """
+    dump_to_file = None
+    if args.dump_to_file:
+        dump_to_file = str(Path(args.dump_to_file).resolve())
+
+    return {
+        # package templates and rendering change with the package version
+        "package_version": __version__,
+        "changelog_file": str(args.changelog_file),
+        "version_files": [str(Path(version_file).resolve())
+                          for version_file in args.version_file or []],
+        "version_file_types": args.version_file_type,
+        "template_files": [str(template_file)
+                           for template_file in args.template_file or []],
+        "additional_template_data": args.additional_template_data,
+        "additional_version_info": args.additional_version_info,
+        "version_line_regex": args.version_line_regex or VERSION_LINE_REGEX,
+        "semver_line_regex": args.semver_line_regex or SEMVER_LINE_REGEX,
+        "date_line_regex": DATE_LINE_REGEX,
+        "output": dump_to_file,
+        "pretty": args.pretty_output,
+        "depfile": None if args.depfile is None else str(
+            Path(args.depfile).resolve()),
+        "since_version": args.since_version,
+        "until_version": args.until_version,
+        "since_date": args.since_date,
+        "limit": args.limit,
+        "release": args.release,
+        "descriptions": args.descriptions,
+    }
+
+
+def create_dependency_rules(
+        args: argparse.Namespace,
+        render_targets: List['RenderTarget'],
+        logger: logging.Logger) -> List[Tuple[str, List[Path]]]:
+    """
+    Create the dependencies of the rendered files of the CLI arguments
+
+    Each version file depends on the changelog and its resolved template,
+    a custom template also on its directory, which is the search path of
+    included templates.
+
+    :param      args:            The parsed CLI arguments
+    :type       args:            argparse.Namespace
+    :param      render_targets:  The version files with their templates
+    :type       render_targets:  List[RenderTarget]
+    :param      logger:          Logger object
+    :type       logger:          logging.Logger
+
+    :returns:   Rendered files with their dependencies
+    :rtype:     List[Tuple[str, List[Path]]]
+    """
+    rules = []
+
+    if render_targets:
+        from .render_version_file import RenderVersionFile
+
+        file_renderer = RenderVersionFile(logger=logger)
+        default_template_path = file_renderer.default_template_path.resolve()
+
+        for version_file, target in zip(args.version_file, render_targets):
+            template_file = file_renderer.find_template(target.template)
+            dependencies = [args.changelog_file, template_file]
+            if template_file.parent != default_template_path:
+                dependencies.append(template_file.parent)
+            rules.append((version_file, dependencies))
+
+    if args.dump_to_file:
+        rules.append((args.dump_to_file, [args.changelog_file]))
+
+    return rules
+
+
+def report_validation(version_files: List[Path],
+                      results: List[bool]) -> None:
+    """
+    Report the validation result of each version file and exit on mismatches
+
+    :param      version_files:  The validated version files
+    :type       version_files:  List[Path]
+    :param      results:        The validation result of each version file
+    :type       results:        List[bool]
+
+    :raises     SystemExit:     Any version file differs from the latest
+                                changelog version
+    """
+    for version_file, valid in zip(version_files, results):
+        if valid:
+            status = "ok"
+        elif version_file.exists():
+            status = "mismatch"
+        else:
+            status = "missing"
+        stderr.write("{}: {}\n".format(version_file, status))
+
+    stderr.write("{} of {} version files valid\n".format(
+        sum(results), len(results)))
+
+    mismatches = [str(version_file)
+                  for version_file, valid in zip(version_files, results)
+                  if not valid]
+    if mismatches:
+        raise SystemExit(
+            'Mismatch between version file and latest changelog '
+            'version: {}'.format(', '.join(mismatches))
+        )
+
+
+def output_changelog_data(args: argparse.Namespace,
+                          changelog_data: Dict[str, Any]) -> None:
+    """
+    Print the changelog data and dump it to a file as given by the arguments
+
+    :param      args:            The parsed CLI arguments
+    :type       args:            argparse.Namespace
+    :param      changelog_data:  The JSON serializable changelog data
+    :type       changelog_data:  Dict[str, Any]
+    """
+    indent = 4 if args.pretty_output else None
+
+    if args.print_result:
+        stdout.write(json.dumps(changelog_data, indent=indent))
+
+    if args.dump_to_file:
+        with open(args.dump_to_file, 'w') as file:
+            file.write(json.dumps(changelog_data, indent=indent))
+
+
+def run_client(args: argparse.Namespace, logger: logging.Logger) -> None:
+    """
+    Let the server process the request given by the CLI arguments
+
+    Only the standard library is imported, the server keeps the parsed
+    changelogs and compiled templates in memory.
+
+    :param      args:    The parsed CLI arguments
+    :type       args:    argparse.Namespace
+    :param      logger:  Logger object
+    :type       logger:  logging.Logger
+    """
+    from .server import ServerError, send_request
+
+    version_files = [Path(version_file).resolve()
+                     for version_file in args.version_file or []]
+    targets = []
+    for index, version_file in enumerate(version_files):
+        template_file = get_option(args.template_file, index)
+        targets.append({
+            "version_file": str(version_file),
+            "template_file": None if template_file is None else str(
+                template_file),
+            "version_file_type": get_option(args.version_file_type, index,
+                                            "py"),
+        })
+
+    if not targets:
+        command = "parse"
+    elif args.do_validate:
+        command = "validate"
+    else:
+        command = "render"
+
+    request = {
+        "command": command,
+        "changelog_file": str(Path(args.changelog_file).resolve()),
+        "targets": targets,
+        "additional_template_data": args.additional_template_data,
+        "additional_version_info": args.additional_version_info,
+        "version_line_regex": args.version_line_regex,
+        "semver_line_regex": args.semver_line_regex,
+        "engine": args.engine,
+        "index_file": None if args.index_file is None else str(
+            Path(args.index_file).resolve()),
+        "since_version": args.since_version,
+        "until_version": args.until_version,
+        "since_date": args.since_date,
+        "limit": args.limit,
+        "release": args.release,
+        "descriptions": args.descriptions,
+    }
+    logger.debug("Sending '{}' request to '{}'".format(
+        command, args.connect_socket))
+
+    try:
+        response = send_request(socket_file=args.connect_socket,
+                                request=request)
+    except (OSError, ServerError) as e:
+        raise SystemExit("Request to server '{}' failed: {}".format(
+            args.connect_socket, e))
+
+    if command == "validate":
+        report_validation(version_files=version_files,
+                          results=response["results"])
+
+    output_changelog_data(args=args, changelog_data=response["changelog"])
+
+
+def watch_changelog(args: argparse.Namespace,
+                    version_extractor: 'ExtractVersion',
+                    render_targets: List['RenderTarget'],
+                    logger: logging.Logger) -> None:
+    """
+    Update the version files on every change of the changelog or templates
+
+    The compiled regexes and templates are kept between the updates. A
+    changed template only renders its own version files again. Failed
+    updates are reported and watching continues until interrupted.
+
+    :param      args:               The parsed CLI arguments
+    :type       args:               argparse.Namespace
+    :param      version_extractor:  The configured changelog parser
+    :type       version_extractor:  ExtractVersion
+    :param      render_targets:     The version files with their templates
+    :type       render_targets:     List[RenderTarget]
+    :param      logger:             Logger object
+    :type       logger:             logging.Logger
+    """
+    from .render_version_file import (RenderVersionFile,
+                                      create_version_file_content,
+                                      render_files)
+    from .watch import FileWatcher
+
+    changelog_file = Path(args.changelog_file).resolve()
+    file_renderer = RenderVersionFile(logger=logger)
+    template_files = [file_renderer.find_template(target.template)
+                      for target in render_targets]
+    watcher = FileWatcher(files=[changelog_file] + template_files)
+    release_query = create_release_query(args=args)
+
+    def update(targets: List['RenderTarget'], changelog_changed: bool) -> None:
+        parsed_changelog = version_extractor.parse(
+            changelog_file=changelog_file,
+            query=release_query,
+            descriptions=args.descriptions)
+
+        version_file_content = create_version_file_content(
+            semver_data=parsed_changelog.semver_data,
+            additional_version_info=args.additional_version_info,
+            additional_template_data=args.additional_template_data)
+        render_files(targets=targets,
+                     content=version_file_content,
+                     workers=args.render_workers,
+                     logger=logger,
+                     bytecode_cache_dir=args.bytecode_cache_dir)
+
+        output_files = [str(target.file_path) for target in targets]
+        if args.dump_to_file and changelog_changed:
+            output_changelog_data(
+                args=args,
+                changelog_data=parsed_changelog.to_dict(
+                    descriptions=args.descriptions))
+            output_files.append(args.dump_to_file)
+
+        stderr.write("Updated to version {}: {}\n".format(
+            parsed_changelog.version, ', '.join(output_files)))
+
+    try:
+        update(targets=render_targets, changelog_changed=True)
+    except Exception as e:
+        stderr.write("Update failed: {}\n".format(e))
+
+    try:
+        for changed_files in watcher.watch(interval=args.watch_interval):
+            logger.debug("Changed files: {}".format(
+                ', '.join(str(file) for file in sorted(changed_files))))
+
+            changelog_changed = changelog_file in changed_files
+            targets = [target for target, template_file
+                       in zip(render_targets, template_files)
+                       if changelog_changed or template_file in changed_files]
+            try:
+                update(targets=targets, changelog_changed=changelog_changed)
+            except Exception as e:
+                stderr.write("Update failed: {}\n".format(e))
+    except KeyboardInterrupt:
+        pass
+
+
+def run_batch_jobs(args: argparse.Namespace,
+                   logger: logging.Logger) -> List['BatchResult']:
+    """
+    Process a batch of changelogs given by the CLI arguments
+
+    :param      args:    The parsed CLI arguments
+    :type       args:    argparse.Namespace
+    :param      logger:  Logger object
+    :type       logger:  logging.Logger
+
+    :returns:   Results of all jobs
+    :rtype:     List[BatchResult]
+
+    :raises     SystemExit:  The jobs file or the options of a job are
+                             invalid
+    """
+    from . import batch
+
+    defaults = {
+        "version_file": get_option(args.version_file, 0),
+        "template_file": get_option(args.template_file, 0),
+        "version_file_type": get_option(args.version_file_type, 0, "py"),
+        "additional_template_data": args.additional_template_data,
+        "additional_version_info": args.additional_version_info,
+        "version_line_regex": args.version_line_regex,
+        "semver_line_regex": args.semver_line_regex,
+        "engine": args.engine,
+        "index_file": args.index_file,
+        "validate": args.do_validate,
+        "bytecode_cache_dir": None if args.bytecode_cache_dir is None else
+        Path(args.bytecode_cache_dir).resolve(),
+    }
+
+    jobs = []
+    try:
+        if args.batch_file:
+            jobs.extend(batch.load_jobs(jobs_file=args.batch_file,
+                                        defaults=defaults))
+        if args.batch_glob:
+            jobs.extend(batch.find_jobs(pattern=args.batch_glob,
+                                        defaults=defaults))
+    except (batch.BatchError, OSError, ValueError, TypeError) as e:
+        raise SystemExit("Invalid batch jobs: {}".format(e))
+    logger.debug("Processing {} changelogs".format(len(jobs)))
+
+    # let the workers log like this logger
+    batch_logger = logging.getLogger(batch.__name__)
+    batch_logger.setLevel(logger.level)
+    batch_logger.disabled = logger.disabled
+
+    results = batch.run_batch(jobs=jobs, workers=args.workers)
+
+    batch_data = [result.to_dict() for result in results]
+    indent = 4 if args.pretty_output else None
+
+    if args.print_result:
+        stdout.write(json.dumps(batch_data, indent=indent))
+
+    if args.dump_to_file:
+        with open(args.dump_to_file, 'w') as file:
+            file.write(json.dumps(batch_data, indent=indent))
+
+    return results
+
+
 def main():
     # parse CLI arguments
     args = parse_arguments()
@@ -195,129 +862,162 @@ def main():
                                      max(log_levels.keys()))])
     logger.disabled = not args.debug
 
+    if args.batch_file or args.batch_glob:
+        results = run_batch_jobs(args=args, logger=logger)
+        if not all(result.ok for result in results):
+            raise SystemExit('\n'.join(
+                "Processing '{}' failed: {}".format(result.job.changelog_file,
+                                                    result.error)
+                for result in results if not result.ok
+            ))
+        return
+
+    if args.serve_socket:
+        from .server import ChangelogServer, ServerError
+
+        try:
+            server = ChangelogServer(
+                socket_file=args.serve_socket,
+                logger=logger,
+                bytecode_cache_dir=args.bytecode_cache_dir)
+        except (OSError, ServerError) as e:
+            raise SystemExit("Serving on '{}' failed: {}".format(
+                args.serve_socket, e))
+
+        with server:
+            logger.debug("Serving on '{}'".format(server.socket_file))
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                pass
+        return
+
+    if args.connect_socket:
+        run_client(args=args, logger=logger)
+        return
+
     # changelog_file = Path(args.changelog_file).resolve()
     changelog_file = args.changelog_file
-    version_file = None
-    template_file = args.template_file
-    version_file_type = args.version_file_type
     additional_template_data = args.additional_template_data
     additional_version_info = args.additional_version_info
     version_line_regex = args.version_line_regex
     semver_line_regex = args.semver_line_regex
+    index_file = args.index_file
     dump_to_file = args.dump_to_file
     do_validate = args.do_validate
     print_result = args.print_result
-    pretty_output = args.pretty_output
 
-    if args.version_file:
-        version_file = Path(args.version_file).resolve()
-        logger.debug("Using changelog file '{}' to update version file '{}'".
-                     format(changelog_file, version_file))
+    # the stamp is checked before the parser and renderer are imported
+    build_stamp = None
+    if args.stamp_file:
+        from .build_stamp import BuildStamp, fingerprint_files
+
+        build_stamp = BuildStamp(stamp_file=Path(args.stamp_file).resolve(),
+                                 logger=logger)
+        stamp_options = create_stamp_options(args=args)
+
+        if not print_result and build_stamp.is_up_to_date(stamp_options):
+            logger.debug("Nothing changed since stamp file '{}'".format(
+                build_stamp.stamp_file))
+            return
+
+        # take the fingerprints before reading the files, a change while
+        # reading outdates the stamp on its next usage
+        stamp_inputs = fingerprint_files(
+            [changelog_file] + (args.template_file or []))
 
-    version_extractor = ExtractVersion(logger=logger)
+    from .api import (create_render_targets, create_version_extractor,
+                      render_version_files)
+
+    version_files = create_version_files(args=args, logger=logger)
+    render_targets = create_render_targets(version_files=version_files)
+    for target in render_targets:
+        logger.debug("Using changelog file '{}' to update version file '{}'".
+                     format(changelog_file, target.file_path))
 
     if semver_line_regex:
         logger.debug("Use this regex to get the semver part from the "
                      "version line: {}".format(semver_line_regex))
-        version_extractor.semver_line_regex = semver_line_regex
 
     if version_line_regex:
         logger.debug("Use this regex to get the version line from the "
                      "changelog file: {}".format(version_line_regex))
-        version_extractor.version_line_regex = version_line_regex
 
-    version_line = version_extractor.parse_changelog(
-        changelog_file=changelog_file)
-    version_lines = version_extractor.parse_changelog_completely(
-        changelog_file=changelog_file)
+    if index_file:
+        logger.debug("Use index file '{}'".format(index_file))
+        index_file = Path(index_file).resolve()
 
-    release_infos = {}
-    for line in version_lines:
-        this_semver_string = version_extractor.parse_semver_line(
-            release_version_line=line)
-        this_date_string = version_extractor.parse_semver_line_date(
-            release_version_line=line)
-        release_infos[this_semver_string] = [{"upload_time": this_date_string}]
+    version_extractor = create_version_extractor(
+        version_line_regex=version_line_regex,
+        semver_line_regex=semver_line_regex,
+        engine=args.engine,
+        index_file=index_file,
+        logger=logger)
 
-    semver_string = version_extractor.parse_semver_line(
-        release_version_line=version_line)
+    if args.watch:
+        watch_changelog(args=args,
+                        version_extractor=version_extractor,
+                        render_targets=render_targets,
+                        logger=logger)
+        return
 
-    file_renderer = RenderVersionFile(logger=logger)
-    semver_data = version_extractor.semver_data
-    additional_data = ""
-    if additional_version_info:
-        additional_data = " + '{}'".format(additional_version_info)
-    version_file_content = {
-        "major_version": semver_data.major,
-        "minor_version": semver_data.minor,
-        "patch_version": semver_data.patch,
-        "prerelease_data": semver_data.prerelease,
-        "build_data": semver_data.build,
-        "additional_data": additional_data,
-    }
-    if additional_template_data:
-        version_file_content.update(additional_template_data)
-
-    if not template_file:
-        # no template file specified, use package template file
-        template_file_map = {
-            "py": "version.py.template",
-            "c": "version.h.template",
-        }
-
-        if version_file_type in template_file_map:
-            template_file = template_file_map[version_file_type]
-            logger.debug("Selected '{}' based on version_file_type: '{}'".
-                         format(template_file, version_file_type))
-        else:
-            raise KeyError("Either specify a custom template file or choose"
-                           "a template from this list: {}".
-                           format(template_file_map.keys()))
-
-    if do_validate:
-        file_renderer.render_file(
-            template=template_file,
-            file_path=version_file,
-            content=version_file_content,
-            save_file=False
-        )
+    if args.release is None or render_targets:
+        parsed_changelog = version_extractor.parse(
+            changelog_file=changelog_file,
+            query=create_release_query(args=args),
+            descriptions=args.descriptions)
 
-        file_sha1 = sha1(version_file.read_bytes()).hexdigest()
-        rendered_sha1 = sha1(file_renderer.content.encode()).hexdigest()
+        results = render_version_files(
+            changelog=parsed_changelog,
+            version_files=version_files,
+            additional_version_info=additional_version_info,
+            additional_template_data=additional_template_data,
+            validate=do_validate,
+            workers=args.render_workers,
+            bytecode_cache_dir=args.bytecode_cache_dir,
+            logger=logger)
 
-        if file_sha1 != rendered_sha1:
-            raise SystemExit(
-                'Mismatch between version file and latest changelog version'
-            )
+        if do_validate and results:
+            report_validation(
+                version_files=[result.file_path for result in results],
+                results=[result.valid for result in results])
 
-    if version_file and not do_validate:
-        file_renderer.render_file(
-            template=template_file,
-            file_path=version_file,
-            content=version_file_content
-        )
+        if args.print_result or args.dump_to_file:
+            changelog_data = parsed_changelog.to_dict(
+                descriptions=args.descriptions)
 
-    changelog_data = {
-        'info': {
-            'version': semver_string,
-            'description': version_extractor.latest_description,
-            'meta': version_extractor.meta_data,
-        },
-        'releases': release_infos
-    }
+    if args.release is not None:
+        # only the changelog up to the release is scanned if nothing is
+        # rendered, with an index file only the release section is read
+        release = version_extractor.get_release(
+            changelog_file=changelog_file,
+            version=args.release)
+        if release is None:
+            raise SystemExit("Release {} not found in changelog '{}'".format(
+                args.release, changelog_file))
+        changelog_data = release.to_dict()
 
-    if print_result:
-        if pretty_output:
-            stdout.write(json.dumps(changelog_data, indent=4))
-        else:
-            stdout.write(json.dumps(changelog_data))
-
-    if dump_to_file:
-        with open(dump_to_file, 'w') as file:
-            if pretty_output:
-                file.write(json.dumps(changelog_data, indent=4))
-            else:
-                file.write(json.dumps(changelog_data))
+    if args.print_result or args.dump_to_file:
+        output_changelog_data(args=args, changelog_data=changelog_data)
+
+    if args.depfile and not do_validate:
+        from .depfile import write_depfile
+
+        write_depfile(depfile=args.depfile,
+                      rules=create_dependency_rules(
+                          args=args,
+                          render_targets=render_targets,
+                          logger=logger))
+
+    if build_stamp is not None:
+        output_files = [target.file_path for target in render_targets]
+        if dump_to_file:
+            output_files.append(dump_to_file)
+        if args.depfile and not do_validate:
+            output_files.append(args.depfile)
+        build_stamp.save(options=stamp_options,
+                         inputs=stamp_inputs,
+                         output_files=output_files)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""Watch files for changes by polling their status"""
+
+import os
+import time
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Set, Tuple, Union
+
+# default seconds between two polls of the watched files
+DEFAULT_INTERVAL = 0.5
+
+# size, modification time and inode of a file, None if it does not exist
+FileState = Optional[Tuple[int, int, int]]
+
+
+def get_file_state(file_path: Path) -> FileState:
+    """
+    Get the state of a file to detect its changes
+
+    The inode detects files replaced by editors saving atomically within the
+    resolution of the modification time.
+
+    :param      file_path:  The path to the file
+    :type       file_path:  Path
+
+    :returns:   Size, modification time and inode, None if the file does not
+                exist
+    :rtype:     FileState
+    """
+    try:
+        stat = os.stat(file_path)
+    except FileNotFoundError:
+        return None
+    return stat.st_size, stat.st_mtime_ns, stat.st_ino
+
+
+class FileWatcher(object):
+    """Detect changes of files by polling their status"""
+    def __init__(self, files: Iterable[Union[Path, str]]):
+        """
+        Init FileWatcher class
+
+        :param      files:  The paths to the files to watch
+        :type       files:  Iterable[Union[Path, str]]
+        """
+        self._states = {}
+        for file_path in files:
+            file_path = Path(file_path)
+            self._states[file_path] = get_file_state(file_path)
+
+    @property
+    def files(self) -> Set[Path]:
+        """
+        Get paths of the watched files
+
+        :returns:   Paths to the watched files
+        :rtype:     Set[Path]
+        """
+        return set(self._states.keys())
+
+    def poll(self) -> Set[Path]:
+        """
+        Get the files changed since the previous poll
+
+        :returns:   Paths to the changed files
+        :rtype:     Set[Path]
+        """
+        changed_files = set()
+
+        for file_path, state in self._states.items():
+            current_state = get_file_state(file_path)
+            if current_state != state:
+                self._states[file_path] = current_state
+                changed_files.add(file_path)
+
+        return changed_files
+
+    def watch(self,
+              interval: float = DEFAULT_INTERVAL,
+              max_changes: Optional[int] = None) -> Iterator[Set[Path]]:
+        """
+        Wait for changes of the watched files
+
+        Changes are only reported once the files did not change for another
+        interval, a file being saved in several steps is reported once.
+
+        :param      interval:     The seconds between two polls
+        :type       interval:     float
+        :param      max_changes:  The number of changes to report, endless if
+                                  None
+        :type       max_changes:  Optional[int]
+
+        :returns:   Paths to the changed files of each change
+        :rtype:     Iterator[Set[Path]]
+        """
+        reported_changes = 0
+
+        while max_changes is None or reported_changes < max_changes:
+            time.sleep(interval)
+            changed_files = self.poll()
+            if not changed_files:
+                continue
+
+            while True:
+                time.sleep(interval)
+                still_changing = self.poll()
+                if not still_changing:
+                    break
+                changed_files |= still_changing
+
+            reported_changes += 1
+            yield changed_files
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""Unittest for testing the api file"""
+
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from changelog2version.api import (ChangelogCache, UpdateResult,
+                                   VersionFile, create_render_targets,
+                                   parse_changelog, update_version_files)
+from changelog2version.release_query import ReleaseQuery
+
+
+class TestApi(unittest.TestCase):
+
+    def setUp(self) -> None:
+        """Run before every test method"""
+        self._tmp_dir = TemporaryDirectory()
+        self._dir = Path(self._tmp_dir.name)
+
+        self.changelog = self._dir / 'changelog.md'
+        self.changelog.write_text("# Changelog\n"
+                                  "## [1.2.3] - 2022-07-31\n"
+                                  "### Fixed\n"
+                                  "- Bug\n"
+                                  "## [1.2.2] - 2022-07-30\n")
+
+    def tearDown(self) -> None:
+        """Run after every test method"""
+        self._tmp_dir.cleanup()
+
+    def test_parse_changelog(self) -> None:
+        """Test parsing without configuring logging"""
+        with patch('logging.basicConfig') as basic_config:
+            changelog = parse_changelog(changelog_file=str(self.changelog),
+                                        engine="mmap")
+        basic_config.assert_not_called()
+
+        self.assertEqual(changelog.version, "1.2.3")
+        self.assertEqual([r.version for r in changelog.releases],
+                         ["1.2.3", "1.2.2"])
+
+    def test_parse_backports_like_cache(self) -> None:
+        """Test queries select backports like the cached changelog"""
+        self.changelog.write_text("## [2.0.1] - 2023-03-01\n"
+                                  "## [1.5.3] - 2023-02-15\n"
+                                  "## [2.0.0] - 2023-01-01\n"
+                                  "## [1.5.2] - 2022-12-01\n")
+        query = ReleaseQuery(since_version="2.0.0")
+
+        changelog = parse_changelog(changelog_file=self.changelog,
+                                    query=query)
+        cached = ChangelogCache().parse(changelog_file=self.changelog,
+                                        query=query)
+
+        self.assertEqual([r.version for r in changelog.releases],
+                         ["2.0.1", "2.0.0"])
+        self.assertEqual(changelog.releases, cached.releases)
+
+    def test_cache_meta_copies(self) -> None:
+        """Test changed meta data of a cache hit does not change the cache"""
+        self.changelog.write_text("## [1.2.3] - 2022-07-31\n"
+                                  "<!-- meta = {'type': 'fix', "
+                                  "'scope': ['all']} -->\n"
+                                  "- Bug\n")
+        cache = ChangelogCache()
+
+        changelog = cache.parse(changelog_file=self.changelog)
+        changelog.meta['type'] = 'changed'
+        changelog.meta['scope'].append('other')
+
+        cached = cache.parse(changelog_file=self.changelog)
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cached.meta, {'type': 'fix', 'scope': ['all']})
+        self.assertEqual(cached.to_dict()['info']['meta'], cached.meta)
+        self.assertIsNot(cached.meta, changelog.meta)
+
+    def test_create_render_targets(self) -> None:
+        """Test templates are selected by the version file type"""
+        self.assertEqual(create_render_targets(version_files=[]), [])
+
+        targets = create_render_targets(version_files=[
+            VersionFile(file_path=self._dir / 'version.py'),
+            VersionFile(file_path=self._dir / 'version.h',
+                        version_file_type="c"),
+        ])
+        self.assertEqual([target.template for target in targets],
+                         ["version.py.template", "version.h.template"])
+
+    def test_update_version_files(self) -> None:
+        """Test rendering and validating version files"""
+        version_files = [
+            VersionFile(file_path=self._dir / 'version.py'),
+            VersionFile(file_path=self._dir / 'include' / 'version.h',
+                        version_file_type="c"),
+        ]
+
+        result = update_version_files(changelog_file=self.changelog,
+                                      version_files=version_files,
+                                      validate=True)
+        self.assertIsInstance(result, UpdateResult)
+        self.assertFalse(result.ok)
+        self.assertEqual(result.mismatches,
+                         [version_file.file_path
+                          for version_file in version_files])
+
+        result = update_version_files(changelog_file=self.changelog,
+                                      version_files=version_files,
+                                      additional_version_info="-rc1")
+        self.assertTrue(result.ok)
+        self.assertEqual([file.valid for file in result.version_files],
+                         [None, None])
+        self.assertEqual(result.changelog.to_dict()["info"]["version"],
+                         "1.2.3")
+        self.assertIn("-rc1", version_files[0].file_path.read_text())
+
+        result = update_version_files(changelog_file=self.changelog,
+                                      version_files=version_files,
+                                      additional_version_info="-rc1",
+                                      validate=True)
+        self.assertTrue(result.ok)
+        self.assertEqual([file.valid for file in result.version_files],
+                         [True, True])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""Unittest for testing the batch file"""
+
+import json
+import os
+import shutil
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from changelog2version.batch import (BatchError, BatchJob, BatchResult,
+                                     find_jobs, load_jobs, process_job,
+                                     run_batch, summary_exit_code)
+from nose2.tools import params
+
+
+class TestBatch(unittest.TestCase):
+
+    def setUp(self) -> None:
+        """Run before every test method"""
+        self._here = Path(__file__).parent
+        self._tmp_dir = TemporaryDirectory()
+        self._dir = Path(self._tmp_dir.name)
+
+        self.packages = {
+            "a": "changelog_with_date.md",
+            "b": "changelog_with_date_and_time.md",
+            "c": "changelog_with_meta.md",
+        }
+        for package, file_name in self.packages.items():
+            (self._dir / package).mkdir()
+            shutil.copy(self._here / 'data' / 'valid' / file_name,
+                        self._dir / package / 'changelog.md')
+
+    def tearDown(self) -> None:
+        """Run after every test method"""
+        self._tmp_dir.cleanup()
+
+    def test_process_job(self) -> None:
+        """Test processing a single job"""
+        job = BatchJob(changelog_file=self._dir / 'a' / 'changelog.md',
+                       version_file=self._dir / 'a' / 'version.py')
+
+        result = process_job(job)
+
+        self.assertTrue(result.ok)
+        self.assertEqual(result.version, "1.3.0")
+        self.assertIn('__version_info__ = ("1", "3", "0")',
+                      job.version_file.read_text())
+
+        result = process_job(BatchJob(changelog_file=job.changelog_file,
+                                      version_file=job.version_file,
+                                      validate=True))
+        self.assertTrue(result.ok)
+
+        job.version_file.write_text("")
+        result = process_job(BatchJob(changelog_file=job.changelog_file,
+                                      version_file=job.version_file,
+                                      validate=True))
+        self.assertFalse(result.ok)
+        self.assertEqual(result.version, "1.3.0")
+        self.assertIn("Mismatch", result.error)
+
+    def test_process_job_error(self) -> None:
+        """Test errors of a job are reported in its result"""
+        result = process_job(BatchJob(changelog_file=self._dir / 'missing'))
+
+        self.assertFalse(result.ok)
+        self.assertIsNone(result.version)
+        self.assertTrue(result.error.startswith("FileNotFoundError: "))
+        self.assertEqual(result.to_dict()["changelog_file"],
+                         str(self._dir / 'missing'))
+
+    @params(
+        (1, ),
+        (2, ),
+        (None, ),
+    )
+    def test_run_batch(self, workers: int) -> None:
+        """Test processing a batch of jobs"""
+        jobs = find_jobs(pattern=str(self._dir / '*' / 'changelog.md'),
+                         defaults={"version_file": "version.py"})
+        jobs.append(BatchJob(changelog_file=self._dir / 'missing'))
+
+        results = run_batch(jobs=jobs, workers=workers)
+
+        self.assertEqual([result.job for result in results], jobs)
+        self.assertEqual([result.version for result in results],
+                         ["1.3.0", "94.0.0", "1.3.0", None])
+        for package in self.packages.keys():
+            self.assertTrue((self._dir / package / 'version.py').is_file())
+        self.assertEqual(summary_exit_code(results), 1)
+        self.assertEqual(summary_exit_code(results[:3]), 0)
+
+    def test_run_batch_invalid_workers(self) -> None:
+        """Test number of workers of a batch"""
+        self.assertEqual(run_batch(jobs=[], workers=2), [])
+
+        with self.assertRaises(BatchError):
+            run_batch(jobs=[], workers=0)
+
+    def test_load_jobs(self) -> None:
+        """Test loading jobs of a JSON file"""
+        jobs_file = self._dir / 'jobs.json'
+        jobs_file.write_text(json.dumps([
+            {"changelog_file": "a/changelog.md"},
+            {"changelog_file": "b/changelog.md",
+             "version_file": "b/include/version.h",
+             "version_file_type": "c"},
+        ]))
+
+        jobs = load_jobs(jobs_file=jobs_file,
+                         defaults={"version_file": "version.py",
+                                   "index_file": ".changelog2version.idx"})
+
+        self.assertEqual(jobs[0].changelog_file,
+                         self._dir / 'a' / 'changelog.md')
+        self.assertEqual(jobs[0].version_file, self._dir / 'a' / 'version.py')
+        self.assertEqual(jobs[0].index_file,
+                         self._dir / 'a' / '.changelog2version.idx')
+        self.assertEqual(jobs[1].version_file,
+                         self._dir / 'b' / 'include' / 'version.h')
+        self.assertEqual(jobs[1].version_file_type, "c")
+
+        results = run_batch(jobs=jobs, workers=1)
+        self.assertEqual(summary_exit_code(results), 0)
+        self.assertIn("#define MAJOR_VERSION   94",
+                      jobs[1].version_file.read_text())
+
+    def test_load_jobs_relative_path(self) -> None:
+        """Test loading jobs of a JSON file given by a relative path"""
+        jobs_dir = self._dir / 'jobs'
+        (jobs_dir / 'a').mkdir(parents=True)
+        shutil.copy(self._dir / 'a' / 'changelog.md',
+                    jobs_dir / 'a' / 'changelog.md')
+        (jobs_dir / 'jobs.json').write_text(json.dumps([
+            {"changelog_file": "a/changelog.md",
+             "template_file": "template.py"},
+        ]))
+
+        cwd = os.getcwd()
+        os.chdir(self._dir)
+        try:
+            jobs = load_jobs(jobs_file=Path('jobs') / 'jobs.json',
+                             defaults={"version_file": "version.py"})
+        finally:
+            os.chdir(cwd)
+
+        self.assertEqual(jobs[0].changelog_file,
+                         jobs_dir / 'a' / 'changelog.md')
+        self.assertEqual(jobs[0].version_file, jobs_dir / 'a' / 'version.py')
+        self.assertEqual(jobs[0].template_file, jobs_dir / 'template.py')
+
+    @params(
+        ([{"version_file": "version.py"}], ),
+        ([{"changelog_file": "a/changelog.md", "unknown": 1}], ),
+        ({"changelog_file": "a/changelog.md"}, ),
+        (["a/changelog.md"], ),
+        ("[", ),
+    )
+    def test_load_jobs_invalid(self, data) -> None:
+        """Test loading invalid jobs of a JSON file"""
+        jobs_file = self._dir / 'jobs.json'
+        jobs_file.write_text(data if data == "[" else json.dumps(data))
+
+        with self.assertRaises(BatchError):
+            load_jobs(jobs_file=jobs_file)
+
+    def test_batch_result(self) -> None:
+        """Test result of a batch job"""
+        job = BatchJob(changelog_file=Path('changelog.md'))
+        result = BatchResult(job=job, version="1.2.3")
+
+        self.assertTrue(result.ok)
+        self.assertEqual(result.to_dict(), {"changelog_file": "changelog.md",
+                                            "version_file": None,
+                                            "version": "1.2.3",
+                                            "error": None})
+
+
+if __name__ == '__main__':
+    unittest.main()
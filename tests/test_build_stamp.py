@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""Unittest for testing the build_stamp file"""
+
+import os
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from changelog2version.build_stamp import (BuildStamp, fingerprint_files,
+                                           options_sha1)
+
+
+class TestBuildStamp(unittest.TestCase):
+
+    def setUp(self) -> None:
+        """Run before every test method"""
+        self._tmp_dir = TemporaryDirectory()
+        self._dir = Path(self._tmp_dir.name)
+
+        self.changelog = self._dir / 'changelog.md'
+        self.changelog.write_text("## [1.2.3] - 2022-07-31\n")
+        self.version_file = self._dir / 'version.py'
+        self.version_file.write_text("1.2.3\n")
+        self.options = {"version_files": [str(self.version_file)]}
+
+        self.stamp = BuildStamp(stamp_file=self._dir / 'stamp.json')
+        self.stamp.save(options=self.options,
+                        inputs=fingerprint_files([self.changelog]),
+                        output_files=[self.version_file])
+
+    def tearDown(self) -> None:
+        """Run after every test method"""
+        self._tmp_dir.cleanup()
+
+    def test_options_sha1(self) -> None:
+        """Test hash of options does not depend on their order"""
+        self.assertEqual(options_sha1({"a": 1, "b": [Path("x")]}),
+                         options_sha1({"b": ["x"], "a": 1}))
+        self.assertNotEqual(options_sha1({"a": 1}), options_sha1({"a": 2}))
+
+    def test_is_up_to_date(self) -> None:
+        """Test unchanged stamp"""
+        stamp = BuildStamp(stamp_file=self.stamp.stamp_file)
+
+        self.assertTrue(stamp.is_up_to_date(options=dict(self.options)))
+        self.assertFalse(stamp.is_up_to_date(options={}))
+
+    def test_is_up_to_date_missing(self) -> None:
+        """Test missing or invalid stamp file"""
+        stamp = BuildStamp(stamp_file=self._dir / 'missing.json')
+        self.assertFalse(stamp.is_up_to_date(options=self.options))
+
+        self.stamp.stamp_file.write_text("{}")
+        self.assertFalse(self.stamp.is_up_to_date(options=self.options))
+
+    def test_is_up_to_date_changed_files(self) -> None:
+        """Test changed input or output files outdate the stamp"""
+        for file in (self.changelog, self.version_file):
+            content = file.read_text()
+            file.write_text(content.replace("3", "4"))
+            self.assertFalse(self.stamp.is_up_to_date(options=self.options))
+
+            file.write_text(content)
+            self.assertTrue(self.stamp.is_up_to_date(options=self.options))
+
+        self.version_file.unlink()
+        self.assertFalse(self.stamp.is_up_to_date(options=self.options))
+
+    def test_is_up_to_date_touched_files(self) -> None:
+        """Test touched but unchanged files are refreshed in the stamp"""
+        stat = self.changelog.stat()
+        os.utime(self.changelog, ns=(stat.st_atime_ns,
+                                     stat.st_mtime_ns + 10**9))
+        content = self.stamp.stamp_file.read_text()
+
+        self.assertTrue(self.stamp.is_up_to_date(options=self.options))
+        self.assertNotEqual(self.stamp.stamp_file.read_text(), content)
+        self.assertIn(str(stat.st_mtime_ns + 10**9),
+                      self.stamp.stamp_file.read_text())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""Unittest for testing the changelog_index file"""
+
+import json
+import os
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from changelog2version.changelog_index import (INDEX_FORMAT_VERSION,
+                                               ChangelogIndex,
+                                               ChangelogIndexError,
+                                               IndexEntry)
+from changelog2version.fingerprint import FileFingerprint, file_sha1
+
+
+class TestChangelogIndex(unittest.TestCase):
+
+    def setUp(self) -> None:
+        """Run before every test method"""
+        self._tmp_dir = TemporaryDirectory()
+        self._dir = Path(self._tmp_dir.name)
+
+        self.changelog = self._dir / 'changelog.md'
+        self.changelog.write_bytes(b"## [1.3.0] - 2022-10-26\n- added\n"
+                                   b"## [1.2.3] - 2022-07-31\n- fixed\n")
+        self.regex = {"version_line": "^## .*$"}
+        self.entries = [
+            IndexEntry("1.3.0", "2022-10-26", 0, 24, 32),
+            IndexEntry("1.2.3", "2022-07-31", 32, 56, 64),
+        ]
+
+        self.index = ChangelogIndex(index_file=self._dir / 'changelog.idx')
+        self.index.update(
+            changelog_file=self.changelog,
+            fingerprint=FileFingerprint.from_file(self.changelog),
+            regex=self.regex,
+            entries=self.entries,
+            tail_sha1=file_sha1(self.changelog))
+        self.index.save()
+
+    def tearDown(self) -> None:
+        """Run after every test method"""
+        self._tmp_dir.cleanup()
+
+    def test_load(self) -> None:
+        """Test loading a saved index"""
+        index = ChangelogIndex(index_file=self.index.index_file)
+        self.assertIsNone(index.fingerprint)
+
+        self.assertTrue(index.load(self.changelog, self.regex))
+        self.assertEqual(index.entries, self.entries)
+        self.assertEqual(index.fingerprint, self.index.fingerprint)
+        self.assertEqual(index.tail_start, 0)
+        self.assertEqual(index.tail_sha1, file_sha1(self.changelog))
+        self.assertEqual(index.find("1.2.3"), self.entries[1])
+        self.assertIsNone(index.find("9.9.9"))
+        self.assertEqual(
+            ChangelogIndex.read_section(self.changelog, index.find("1.2.3")),
+            b"- fixed\n")
+
+        # no temporary files are left
+        self.assertEqual([p.name for p in self._dir.iterdir()
+                          if p.suffix == '.tmp'], [])
+
+    def test_load_outdated(self) -> None:
+        """Test an outdated index is not loaded"""
+        index = ChangelogIndex(index_file=self.index.index_file)
+
+        self.assertFalse(index.load(self.changelog, {"version_line": "##"}))
+        self.assertFalse(index.load(self._dir / 'other.md', self.regex))
+
+        # same size, other content
+        self.changelog.write_bytes(
+            self.changelog.read_bytes().replace(b"added", b"fixed"))
+        self.assertFalse(index.load(self.changelog, self.regex))
+
+        # the previous state is kept for an incremental update
+        self.assertEqual(index.entries, self.entries)
+        self.assertEqual(index.fingerprint, self.index.fingerprint)
+
+    def test_load_touched(self) -> None:
+        """Test index of a touched but unchanged changelog is refreshed"""
+        stat = self.changelog.stat()
+        os.utime(self.changelog, ns=(stat.st_atime_ns,
+                                     stat.st_mtime_ns + 10**9))
+
+        index = ChangelogIndex(index_file=self.index.index_file)
+        self.assertTrue(index.load(self.changelog, self.regex))
+        self.assertEqual(index.fingerprint.mtime_ns,
+                         stat.st_mtime_ns + 10**9)
+
+        data = json.loads(self.index.index_file.read_text().splitlines()[0])
+        self.assertEqual(data["format"], INDEX_FORMAT_VERSION)
+        self.assertEqual(data["fingerprint"]["mtime_ns"],
+                         stat.st_mtime_ns + 10**9)
+
+    def test_load_invalid(self) -> None:
+        """Test invalid index files are not loaded"""
+        index = ChangelogIndex(index_file=self._dir / 'missing.idx')
+        self.assertFalse(index.load(self.changelog, self.regex))
+
+        index = ChangelogIndex(index_file=self.index.index_file)
+        self.index.index_file.write_text("not json")
+        self.assertFalse(index.load(self.changelog, self.regex))
+
+        self.index.index_file.write_text(json.dumps({"format": 0}))
+        self.assertFalse(index.load(self.changelog, self.regex))
+
+    def test_load_truncated(self) -> None:
+        """Test truncated index files are not loaded"""
+        content = self.index.index_file.read_bytes()
+        index = ChangelogIndex(index_file=self.index.index_file)
+
+        for size in (len(content) - 1, content.rindex(b"\n", 0, -1) + 1):
+            self.index.index_file.write_bytes(content[:size])
+            self.assertFalse(index.load(self.changelog, self.regex))
+
+    def test_load_lazy(self) -> None:
+        """Test the header is checked before any entry is read"""
+        content = self.index.index_file.read_bytes()
+        header, first, second = content.splitlines(keepends=True)
+        index = ChangelogIndex(index_file=self.index.index_file)
+
+        # invalid entries of an index of other regex patterns are not decoded
+        self.index.index_file.write_bytes(
+            header.replace(b"^## .*$", b"^### .*$") + b"not json\n" * 2)
+        self.assertFalse(index.load(self.changelog, self.regex))
+
+        # only the required entries are read and decoded
+        self.index.index_file.write_bytes(content)
+        self.assertTrue(index.load(self.changelog, self.regex))
+        self.index.index_file.write_bytes(
+            header + first + b"x" * (len(second) - 1) + b"\n")
+        self.assertEqual(index.latest, self.entries[0])
+        self.assertEqual(index.tail_start, 0)
+        with self.assertRaises(ChangelogIndexError):
+            index.entries
+
+        # the index file is replaced by another one after loading
+        self.index.index_file.write_bytes(content)
+        self.assertTrue(index.load(self.changelog, self.regex))
+        self.index.index_file.write_bytes(
+            header.replace(b"\"releases\": 2", b"\"releases\": 3") +
+            first + second)
+        with self.assertRaises(ChangelogIndexError):
+            index.find("1.2.3")
+
+    def test_save_loaded(self) -> None:
+        """Test saving a loaded index keeps its entries"""
+        content = self.index.index_file.read_bytes()
+
+        index = ChangelogIndex(index_file=self.index.index_file)
+        self.assertTrue(index.load(self.changelog, self.regex))
+        index.save()
+
+        self.assertEqual(self.index.index_file.read_bytes(), content)
+        self.assertEqual(index.entries, self.entries)
+        self.assertEqual(index.find("1.2.3"), self.entries[1])
+        self.assertIsNone(index.find("1.2"))
+
+    def test_save_nothing_indexed(self) -> None:
+        """Test saving an empty index"""
+        index = ChangelogIndex(index_file=self._dir / 'empty.idx')
+
+        with self.assertRaises(ChangelogIndexError):
+            index.save()
+
+
+if __name__ == '__main__':
+    unittest.main()
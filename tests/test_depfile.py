@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""Unittest for testing the depfile file"""
+
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from nose2.tools import params
+
+from changelog2version.depfile import (escape_make_path, format_depfile,
+                                       write_depfile)
+
+
+class TestDepfile(unittest.TestCase):
+
+    def setUp(self) -> None:
+        """Run before every test method"""
+        self._tmp_dir = TemporaryDirectory()
+        self._dir = Path(self._tmp_dir.name)
+
+    def tearDown(self) -> None:
+        """Run after every test method"""
+        self._tmp_dir.cleanup()
+
+    @params(
+        ("src/version.py", "src/version.py"),
+        (Path("my dir/version.py"), "my\\ dir/version.py"),
+        ("$HOME/#1.h", "$$HOME/\\#1.h"),
+    )
+    def test_escape_make_path(self, path, expectation) -> None:
+        """Test escaping of spaces, hashes and dollar signs"""
+        self.assertEqual(escape_make_path(path), expectation)
+
+    def test_format_depfile(self) -> None:
+        """Test one rule per target with a dependency per line"""
+        rules = [
+            ("src/version.py", ["changelog.md", Path("my templates/a.tpl")]),
+            ("info.json", ["changelog.md"]),
+            ("empty.txt", []),
+        ]
+        expectation = ("src/version.py: \\\n"
+                       "  changelog.md \\\n"
+                       "  my\\ templates/a.tpl\n"
+                       "info.json: \\\n"
+                       "  changelog.md\n"
+                       "empty.txt:\n")
+
+        self.assertEqual(format_depfile(rules), expectation)
+        self.assertEqual(format_depfile([]), "")
+
+    def test_write_depfile(self) -> None:
+        """Test depfile is only written if its content changed"""
+        depfile = self._dir / 'version.d'
+        rules = [("src/version.py", ["changelog.md"])]
+
+        self.assertTrue(write_depfile(depfile=depfile, rules=rules))
+        self.assertEqual(depfile.read_text(), format_depfile(rules))
+        self.assertFalse(write_depfile(depfile=str(depfile), rules=rules))
+
+        rules = [("src/version.py", ["CHANGELOG.md"])]
+        self.assertTrue(write_depfile(depfile=depfile, rules=rules))
+        self.assertEqual(depfile.read_text(), format_depfile(rules))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,13 +4,21 @@
 
 import logging
 import unittest
+from ast import literal_eval
 from pathlib import Path
 from sys import stdout
-from typing import Dict, List
+from tempfile import TemporaryDirectory
+from typing import Dict, List, Optional
 from unittest.mock import mock_open, patch
 
-from changelog2version.extract_version import (ExtractVersion,
-                                               ExtractVersionError)
+from changelog2version.changelog_data import (ParsedChangelog, Release,
+                                              decode_meta_comment,
+                                              is_valid_semver,
+                                              parse_meta_data)
+from changelog2version.extract_version import (ENGINES, ExtractVersion,
+                                               ExtractVersionError,
+                                               compile_pattern)
+from changelog2version.release_query import ReleaseQuery
 from nose2.tools import params
 from semver import VersionInfo
 
@@ -71,6 +79,29 @@ class TestExtractVersion(unittest.TestCase):
 
         self.assertEqual("Invalid regex pattern", str(context.exception))
 
+    def test_compiled_patterns(self) -> None:
+        """Test compiled patterns are shared across instances"""
+        other_ev = ExtractVersion(logger=self.test_logger)
+
+        self.assertIs(self.ev.version_line_pattern,
+                      other_ev.version_line_pattern)
+        self.assertIs(self.ev.semver_line_pattern,
+                      other_ev.semver_line_pattern)
+        self.assertIs(self.ev.date_line_pattern, other_ev.date_line_pattern)
+
+        self.ev.version_line_regex = "gray|grey"
+        self.assertEqual(self.ev.version_line_pattern.pattern, "gray|grey")
+        self.assertIs(self.ev.version_line_pattern,
+                      compile_pattern("gray|grey"))
+        self.assertIsNot(self.ev.version_line_pattern,
+                         other_ev.version_line_pattern)
+
+        # invalid patterns keep the previous pattern
+        with self.assertRaises(ExtractVersionError):
+            self.ev.version_line_regex = "["
+        self.assertEqual(self.ev.version_line_regex, "gray|grey")
+        self.assertEqual(self.ev.version_line_pattern.pattern, "gray|grey")
+
     def test_semver_data(self) -> None:
         """Test property semver_data"""
         self.assertIsInstance(self.ev.semver_data, VersionInfo)
@@ -86,22 +117,103 @@ class TestExtractVersion(unittest.TestCase):
         self.assertEqual("Value is not of type VersionInfo",
                          str(context.exception))
 
+    @params(
+        ("0.0.0", ),
+        ("1.2.3-rc.1+build.5", ),
+        ("1.0.0-alpha-a.b-c-somethinglong+build.1-aef.1-its-okay", ),
+        ("99999999999999999999999.999999999999999999.99999999999999999", ),
+        ("01.1.1", ),
+        ("1.2", ),
+        ("1.0.0-alpha..1", ),
+        ("1.0.0-01", ),
+        ("9.8.7+meta+meta", ),
+    )
+    def test_is_valid_semver(self, version: str) -> None:
+        """Test SemVer validation without VersionInfo object"""
+        self.assertEqual(is_valid_semver(version),
+                         VersionInfo.isvalid(version))
+
+    @params(
+        ("{'type': 'feature', 'scope': ['all']}",
+         {'type': 'feature', 'scope': ['all']}),
+        ("{'title': \"Don't break on apostrophes\"}",
+         {'title': "Don't break on apostrophes"}),
+        ('{"stable": true, "issue": null}', {'stable': True, 'issue': None}),
+        ("{'stable': false}", {'stable': False}),
+        ("{'stable': True}", {'stable': True}),
+    )
+    def test_decode_meta_comment(self,
+                                 payload: str,
+                                 expectation: Dict[str, str]) -> None:
+        """Test meta comments are decoded as literal or JSON"""
+        self.assertEqual(decode_meta_comment(payload), expectation)
+        self.assertIsNot(decode_meta_comment(payload),
+                         decode_meta_comment(payload))
+        self.assertEqual(
+            parse_meta_data(["### Added", "<!-- meta = {} -->".format(
+                payload), "<!-- meta = {'other': 1} -->"]),
+            expectation)
+
+    def test_decode_meta_comment_copies(self) -> None:
+        """Test modified meta data does not change the decoded comment"""
+        payload = "{'scope': ['all'], 'nested': {'a': 1}}"
+
+        meta = decode_meta_comment(payload)
+        meta["scope"].append("other")
+        meta["nested"]["a"] = 2
+
+        self.assertEqual(decode_meta_comment(payload),
+                         {'scope': ['all'], 'nested': {'a': 1}})
+
+    def test_decode_meta_comment_invalid(self) -> None:
+        """Test invalid meta comments are not evaluated"""
+        for payload in ("__import__('os').getcwd()", "{'a': ",
+                        "{'a': {1, 2}}", "{'a': b'x'}", "{'a': (1, 2)}",
+                        "{1: 'a'}", "['a']", "1"):
+            with self.assertRaises(ValueError):
+                decode_meta_comment(payload)
+
+    def test_lazy_semver_data(self) -> None:
+        """Test VersionInfo objects are only created on access"""
+        changelog = self._here / 'data' / 'valid' / 'changelog_with_meta.md'
+        self.ev.semver_data = VersionInfo(*(4, 5, 6))
+
+        with patch('changelog2version.extract_version.VersionInfo') as \
+                mocked_ev, \
+                patch('changelog2version.changelog_data.VersionInfo') as \
+                mocked_data:
+            releases = [r.version for r in self.ev.iter_releases(changelog)]
+            self.assertEqual(
+                self.ev.find_release_version("## [1.2.3] - 2022-07-31"),
+                "1.2.3")
+            self.assertEqual(self.ev.semver_data, VersionInfo(*(4, 5, 6)))
+            result = self.ev.parse(changelog_file=changelog)
+
+        self.assertEqual(releases, ["1.3.0", "1.2.3"])
+        mocked_ev.parse.assert_not_called()
+        mocked_data.parse.assert_not_called()
+        self.assertEqual(self.ev.semver_data, VersionInfo(*(1, 3, 0)))
+        self.assertEqual(result.semver_data, VersionInfo(*(1, 3, 0)))
+        self.assertIs(result.semver_data, result.semver_data)
+
     def test__create_logger(self):
-        """Test logger creation"""
+        """Test logger creation does not configure logging"""
         logger_name = "Test Logger"
-        named_logger = ExtractVersion._create_logger(logger_name=logger_name)
+        with patch('logging.basicConfig') as basic_config:
+            named_logger = ExtractVersion._create_logger(
+                logger_name=logger_name)
+            logger_without_name = ExtractVersion._create_logger()
+        basic_config.assert_not_called()
 
         self.assertIsInstance(named_logger, logging.Logger)
         self.assertEqual(named_logger.name, logger_name)
-        self.assertEqual(named_logger.level, logging.DEBUG)
+        self.assertEqual(named_logger.level, logging.NOTSET)
         self.assertEqual(named_logger.disabled, False)
 
-        logger_without_name = ExtractVersion._create_logger()
-
         self.assertIsInstance(logger_without_name, logging.Logger)
         self.assertEqual(logger_without_name.name,
                          "changelog2version.extract_version")
-        self.assertEqual(logger_without_name.level, logging.DEBUG)
+        self.assertEqual(logger_without_name.level, logging.NOTSET)
 
     @params(
         ("changelog_with_date.md", "## [1.3.0] - 2022-10-26"),
@@ -171,6 +283,698 @@ class TestExtractVersion(unittest.TestCase):
                         for ele in self.ev.latest_description_lines))
         self.assertTrue(len(self.ev.latest_description_lines) in [3, 5])
 
+    @params(
+        (
+            "changelog_with_date.md",
+            "1.3.0",
+            {"1.3.0": "2022-10-26", "1.2.3": "2022-07-31"},
+            {}
+        ),
+        (
+            "changelog_with_date_and_time.md",
+            "94.0.0",
+            {
+                "94.0.0": "2022-10-26 23:59:01",
+                "93.10.1": "2022-07-31 12:34:56"
+            },
+            {}
+        ),
+        (
+            "changelog_with_meta.md",
+            "1.3.0",
+            {"1.3.0": "2022-10-26", "1.2.3": "2022-07-31"},
+            {'type': 'feature', 'scope': ['all'], 'affected': ['all']}
+        ),
+    )
+    def test_parse(self,
+                   file_name: str,
+                   expected_version: str,
+                   expected_releases: Dict[str, str],
+                   expected_meta: Dict[str, str]) -> None:
+        """Test single pass parse of a changelog"""
+        changelog = self._here / 'data' / 'valid' / file_name
+
+        result = self.ev.parse(changelog_file=changelog)
+
+        self.assertIsInstance(result, ParsedChangelog)
+        self.assertEqual(result.version, expected_version)
+        self.assertEqual(str(result.semver_data), expected_version)
+        self.assertEqual(self.ev.semver_data, result.semver_data)
+        self.assertEqual(result.meta, expected_meta)
+        self.assertEqual(result.description, self.ev.latest_description)
+        self.assertEqual([(r.version, r.date) for r in result.releases],
+                         list(expected_releases.items()))
+        for release in result.releases[1:]:
+            self.assertIsInstance(release, Release)
+            self.assertEqual(release.section, "")
+
+        with self.assertRaises(AttributeError):
+            result.version = "1.2.3"
+        with self.assertRaises(AttributeError):
+            result.releases[0].custom = "data"
+
+        changelog_data = result.to_dict()
+        self.assertEqual(changelog_data['info']['version'], expected_version)
+        self.assertEqual(list(changelog_data['releases'].keys()),
+                         list(expected_releases.keys()))
+        for version, date in expected_releases.items():
+            expectation = {"upload_time": date}
+            if version == expected_version and expected_meta:
+                expectation["meta"] = expected_meta
+            self.assertEqual(changelog_data['releases'][version],
+                             [expectation])
+
+    @params(
+        ("line", ),
+        ("mmap", ),
+    )
+    def test_iter_releases(self, engine: str) -> None:
+        """Test iterating over the releases of a changelog"""
+        changelog = self._here / 'data' / 'valid' / 'changelog_with_meta.md'
+        self.ev.engine = engine
+
+        releases = self.ev.iter_releases(changelog_file=changelog)
+
+        release = next(releases)
+        self.assertIsInstance(release, Release)
+        self.assertEqual(release.version, "1.3.0")
+        self.assertEqual(release.date, "2022-10-26")
+        self.assertTrue(repr(release).startswith(
+            "Release(version='1.3.0', date='2022-10-26', section_start="))
+        self.assertEqual(
+            release.description_lines,
+            [
+                "<!-- meta = {'type': 'feature', 'scope': ['all'], 'affected': ['all']} -->",  # noqa: E501
+                "",
+                "### Added",
+                "- Something fixed",
+                "",
+            ]
+        )
+        self.assertEqual(release.description,
+                         '\n'.join(release.description_lines))
+        self.assertEqual(release.meta, {'type': 'feature',
+                                        'scope': ['all'],
+                                        'affected': ['all']})
+        if engine == "mmap":
+            self.assertEqual(
+                changelog.read_bytes()[
+                    release.section_start:release.section_end],
+                release.section)
+        else:
+            self.assertIsNone(release.section_start)
+            self.assertIsNone(release.section_end)
+
+        release = next(releases)
+        self.assertEqual(release.version, "1.2.3")
+        self.assertEqual(release.date, "2022-07-31")
+        self.assertEqual(release.meta, {})
+        self.assertEqual(release.description_lines[:2],
+                         ["### Fixed", "- Something fixed"])
+
+        with self.assertRaises(StopIteration):
+            next(releases)
+
+    def test_iter_releases_stop_early(self) -> None:
+        """Test iterating stops reading the changelog on the first release"""
+        content = "## [1.3.0] - 2022-10-26\n- fixed\n## [1.2.3] - 2022-07-31\n"
+        with patch('builtins.open', mock_open(read_data=content)) as mocked:
+            releases = self.ev.iter_releases(changelog_file='/dev/null')
+            release = next(releases)
+            self.assertEqual(release.version, "1.3.0")
+            self.assertEqual(release.description_lines, ["- fixed"])
+
+            # file is closed as soon as the generator is closed
+            mocked.return_value.__exit__.assert_not_called()
+            releases.close()
+            mocked.return_value.__exit__.assert_called_once()
+
+    @params(
+        ("changelog_with_date.md", ),
+        ("changelog_with_date_and_time.md", ),
+        ("changelog_with_meta.md", ),
+    )
+    def test_parse_with_index(self, file_name: str) -> None:
+        """Test parse with an index file gives the same result"""
+        changelog = self._here / 'data' / 'valid' / file_name
+        expectation = self.ev.parse(changelog_file=changelog)
+
+        with TemporaryDirectory() as tmp_dir:
+            index_file = Path(tmp_dir) / 'changelog.idx'
+            ev = ExtractVersion()
+            ev.index_file = str(index_file)
+            self.assertEqual(ev.index_file, index_file)
+
+            # first parse creates the index, second one uses it
+            for _ in range(2):
+                with patch.object(ev, 'load_index',
+                                  wraps=ev.load_index) as load_index:
+                    result = ev.parse(changelog_file=changelog)
+                load_index.assert_called_once()
+                self.assertTrue(index_file.is_file())
+                # the index knows the byte offsets of all sections
+                self.assertEqual(result.to_dict(), expectation.to_dict())
+                self.assertEqual(result.semver_data, expectation.semver_data)
+                for release in result.releases:
+                    self.assertIsNotNone(release.section_start)
+                    self.assertIsNotNone(release.section_end)
+                self.assertEqual(ev.semver_data, expectation.semver_data)
+                self.assertEqual(
+                    [r.description for r in ev.iter_releases(changelog)],
+                    [r.description for r in self.ev.iter_releases(changelog)]
+                )
+
+    def test_index_outdated(self) -> None:
+        """Test index is rebuilt after the changelog changed"""
+        with TemporaryDirectory() as tmp_dir:
+            changelog = Path(tmp_dir) / 'changelog.md'
+            changelog.write_text("## [1.2.3] - 2022-07-31\n- fixed\n")
+            self.ev.index_file = Path(tmp_dir) / 'changelog.idx'
+
+            self.assertEqual(self.ev.parse(changelog).version, "1.2.3")
+
+            changelog.write_text("## [1.3.0] - 2022-10-26\n- added\n"
+                                 "## [1.2.3] - 2022-07-31\n- fixed\n")
+            result = self.ev.parse(changelog)
+            self.assertEqual(result.version, "1.3.0")
+            self.assertEqual(result.description, "- added")
+            self.assertEqual([r.version for r in result.releases],
+                             ["1.3.0", "1.2.3"])
+
+            # another regex outdates the index as well
+            self.ev.version_line_regex = r"^## \[1\.2\.3\].*$"
+            self.assertEqual(self.ev.parse(changelog).version, "1.2.3")
+
+    @params(
+        ("", ),
+        ("# Changelog\n\n## [Unreleased]\n", ),
+    )
+    def test_index_prepended_releases(self, preamble: str) -> None:
+        """Test only prepended releases are scanned to update the index"""
+        old = "## [1.2.3] - 2022-07-31\n- fixed\n## [1.2.2] - 2022-07-30\n"
+        new = "## [1.3.0] - 2022-10-26\n- added\n"
+
+        with TemporaryDirectory() as tmp_dir:
+            changelog = Path(tmp_dir) / 'changelog.md'
+            changelog.write_text(preamble + old)
+            self.ev.index_file = Path(tmp_dir) / 'changelog.idx'
+            self.ev.load_index(changelog)
+
+            changelog.write_text(preamble + new + old)
+            with patch.object(self.ev,
+                              '_scan_index_entries',
+                              wraps=self.ev._scan_index_entries) as scan:
+                index = self.ev.load_index(changelog)
+            scan.assert_called_once()
+            self.assertEqual(scan.call_args.kwargs['endpos'],
+                             len(preamble) + len(new))
+
+            expectation = ExtractVersion()
+            expectation.index_file = Path(tmp_dir) / 'other.idx'
+            self.assertEqual(index.entries,
+                             expectation.load_index(changelog).entries)
+            self.assertEqual(index.tail_sha1,
+                             expectation.load_index(changelog).tail_sha1)
+            self.assertEqual(
+                [(r.version, r.description)
+                 for r in self.ev.iter_releases(changelog)],
+                [("1.3.0", "- added"), ("1.2.3", "- fixed"), ("1.2.2", "")])
+
+            # changed old release is detected, the index is created again
+            changelog.write_text(preamble + new + old.replace("fixed", "Fix"))
+            with patch.object(self.ev,
+                              '_scan_index_entries',
+                              wraps=self.ev._scan_index_entries) as scan:
+                self.ev.load_index(changelog)
+            self.assertEqual(scan.call_args.kwargs['endpos'],
+                             changelog.stat().st_size)
+            release = self.ev.get_release(changelog, "1.2.3")
+            self.assertEqual(release.description, "- Fix")
+
+    @params(
+        (None, ),
+        ("changelog.idx", ),
+    )
+    def test_get_release(self, index_file_name: str) -> None:
+        """Test getting a single release of a changelog"""
+        changelog = self._here / 'data' / 'valid' / 'changelog_with_meta.md'
+
+        with TemporaryDirectory() as tmp_dir:
+            if index_file_name:
+                self.ev.index_file = Path(tmp_dir) / index_file_name
+
+            release = self.ev.get_release(changelog_file=changelog)
+            self.assertEqual(release.version, "1.3.0")
+            self.assertEqual(release.meta['type'], 'feature')
+
+            release = self.ev.get_release(changelog_file=changelog,
+                                          version="1.2.3")
+            self.assertEqual(release.version, "1.2.3")
+            self.assertEqual(release.date, "2022-07-31")
+            self.assertEqual(release.description_lines[:2],
+                             ["### Fixed", "- Something fixed"])
+
+            self.assertIsNone(self.ev.get_release(changelog_file=changelog,
+                                                  version="9.9.9"))
+
+    @params(
+        ("line", None),
+        ("mmap", None),
+        ("line", "changelog.idx"),
+    )
+    def test_get_release_skips_sections(self,
+                                        engine: str,
+                                        index_file_name: Optional[str]
+                                        ) -> None:
+        """Test getting a release does not read the previous sections"""
+        content = ("## [1.3.0] - 2022-10-26\n- added\n"
+                   "## [1.2.3] - 2022-07-31\n- fixed\n"
+                   "## [1.2.2] - 2022-07-30\n- fixed\n")
+
+        with TemporaryDirectory() as tmp_dir:
+            changelog = Path(tmp_dir) / 'changelog.md'
+            changelog.write_text(content)
+            self.ev.engine = engine
+            if index_file_name:
+                self.ev.index_file = Path(tmp_dir) / index_file_name
+                self.ev.load_index(changelog)
+
+            with patch.object(self.ev,
+                              '_iter_sections',
+                              wraps=self.ev._iter_sections) as iter_sections:
+                release = self.ev.get_release(changelog_file=changelog,
+                                              version="1.2.3")
+
+            self.assertEqual(release.version, "1.2.3")
+            self.assertEqual(release.date, "2022-07-31")
+            self.assertEqual(release.description, "- fixed")
+            self.assertEqual(release.to_dict(), {
+                'info': {
+                    'version': "1.2.3",
+                    'description': "- fixed",
+                    'meta': {},
+                },
+                'urls': [{'upload_time': "2022-07-31"}]
+            })
+
+            if index_file_name:
+                # the section is read at its offset, the changelog is not
+                # scanned again
+                iter_sections.assert_not_called()
+                self.assertEqual(
+                    content.encode()[release.section_start:
+                                     release.section_end],
+                    b"- fixed\n")
+            else:
+                section_filter = iter_sections.call_args.kwargs[
+                    'section_filter']
+                self.assertFalse(section_filter("## [1.3.0] - 2022-10-26"))
+                self.assertTrue(section_filter("## [1.2.3] - 2022-07-31"))
+
+    @params(
+        ("line", None),
+        ("mmap", None),
+        ("line", "changelog.idx"),
+    )
+    def test_parse_with_query(self,
+                              engine: str,
+                              index_file_name: Optional[str]) -> None:
+        """Test parse keeps only the queried releases and stops at limit"""
+        content = ("## [2.0.0] - 2023-03-01\n- major\n"
+                   "## [1.10.0] - 2023-01-01\n- minor\n"
+                   "## [1.2.0] - 2022-06-01\n- minor\n"
+                   "## [1.1.0] - 2022-03-01\n- minor\n"
+                   "## [1.0.0] - 2022-01-01\n- major\n")
+        query = ReleaseQuery(since_version="1.2.0",
+                             until_version="1.10.0",
+                             limit=2)
+
+        with TemporaryDirectory() as tmp_dir:
+            changelog = Path(tmp_dir) / 'changelog.md'
+            changelog.write_text(content)
+            self.ev.engine = engine
+            if index_file_name:
+                self.ev.index_file = Path(tmp_dir) / index_file_name
+
+            with patch.object(self.ev,
+                              'find_release_version',
+                              wraps=self.ev.find_release_version) as find:
+                result = self.ev.parse(changelog_file=changelog,
+                                       query=query)
+
+            self.assertEqual(result.version, "2.0.0")
+            self.assertEqual(result.description, "- major")
+            self.assertEqual([r.version for r in result.releases],
+                             ["1.10.0", "1.2.0"])
+            if index_file_name is None:
+                # the scan stops at the last release of the limit
+                self.assertEqual(find.call_count, 3)
+
+            releases = self.ev.query_releases(
+                changelog_file=changelog,
+                query=ReleaseQuery(since_date="2023-01-01"))
+            self.assertEqual([(r.version, r.description) for r in releases],
+                             [("2.0.0", "- major"), ("1.10.0", "- minor")])
+
+            full = self.ev.parse(changelog_file=changelog)
+            self.assertEqual(full.query_releases(query), result.releases)
+            self.assertEqual(full.query_releases(ReleaseQuery(limit=1)),
+                             full.releases[:1])
+
+    @params(
+        ("line", None),
+        ("mmap", None),
+        ("line", "changelog.idx"),
+    )
+    def test_parse_with_descriptions(self,
+                                     engine: str,
+                                     index_file_name: Optional[str]) -> None:
+        """Test descriptions of all releases are kept in a shared buffer"""
+        content = ("# Changelog\n"
+                   "## [1.3.0] - 2022-10-26\n  - added  \n\n"
+                   "## [1.2.3] - 2022-07-31\r\n- fixed\r\n"
+                   "## [1.2.2] - 2022-07-30\n- fixed \u00e4\n")
+
+        with TemporaryDirectory() as tmp_dir:
+            changelog = Path(tmp_dir) / 'changelog.md'
+            changelog.write_bytes(content.encode())
+            self.ev.engine = engine
+            if index_file_name:
+                self.ev.index_file = Path(tmp_dir) / index_file_name
+
+            result = self.ev.parse(changelog_file=changelog,
+                                   descriptions=True)
+
+            self.assertEqual(result.version, "1.3.0")
+            self.assertEqual(result.description, "- added\n")
+            self.assertEqual(
+                [(r.version, r.description) for r in result.releases],
+                [("1.3.0", "- added\n"), ("1.2.3", "- fixed"),
+                 ("1.2.2", "- fixed \u00e4")])
+            self.assertEqual(result.to_dict(descriptions=True)["releases"],
+                             {"1.3.0": [{"upload_time": "2022-10-26",
+                                         "description": "- added\n"}],
+                              "1.2.3": [{"upload_time": "2022-07-31",
+                                         "description": "- fixed"}],
+                              "1.2.2": [{"upload_time": "2022-07-30",
+                                         "description": "- fixed \u00e4"}]})
+
+            if engine == "mmap" or index_file_name:
+                buffers = {id(r.buffer) for r in result.releases}
+                self.assertEqual(len(buffers), 1)
+                self.assertEqual(result.releases[0].buffer,
+                                 content.encode())
+                self.assertEqual([r.section for r in result.releases],
+                                 [b"", b"", b""])
+                self.assertIsInstance(result.releases[1].section_content,
+                                      memoryview)
+
+            # sections of the previous releases are dropped without flag
+            result = self.ev.parse(changelog_file=changelog)
+            self.assertEqual([r.description for r in result.releases],
+                             ["- added\n", "", ""])
+            self.assertEqual(result.to_dict()["releases"]["1.2.3"],
+                             [{"upload_time": "2022-07-31"}])
+
+    @params(
+        ("line", None),
+        ("mmap", None),
+        ("line", "changelog.idx"),
+    )
+    def test_parse_meta_of_all_releases(self,
+                                        engine: str,
+                                        index_file_name: Optional[str]
+                                        ) -> None:
+        """Test meta comments of all releases are parsed while scanning"""
+        meta = "<!-- meta = {'type': 'fix', 'note': \"it's\"} -->"
+        content = ("<!-- meta = {'type': 'preamble'} -->\n"
+                   "## [1.3.0] - 2022-10-26\n"
+                   "<!-- meta = {'type': 'feature'} -->\n- added\n"
+                   "## [1.2.3] - 2022-07-31\n" + meta + "\n- fixed\n"
+                   "## [1.2.2] - 2022-07-30\n- fixed\n<!-- comment -->\n"
+                   "## [1.2.1] - 2022-07-29\n" + meta + "\n"
+                   "<!-- meta = {'type': 'second'} -->\n")
+
+        with TemporaryDirectory() as tmp_dir:
+            changelog = Path(tmp_dir) / 'changelog.md'
+            changelog.write_text(content)
+            self.ev.engine = engine
+            if index_file_name:
+                self.ev.index_file = Path(tmp_dir) / index_file_name
+
+            result = self.ev.parse(changelog_file=changelog)
+
+            self.assertEqual(result.meta, {'type': 'feature'})
+            self.assertEqual([r.section for r in result.releases[1:]],
+                             [type(r.section)() for r in result.releases[1:]])
+            self.assertEqual([r.meta for r in result.releases],
+                             [{'type': 'feature'},
+                              {'type': 'fix', 'note': "it's"},
+                              {},
+                              {'type': 'fix', 'note': "it's"}])
+            # identical meta comments are decoded only once, modifying the
+            # meta data of a release does not change any other release
+            with patch('changelog2version.changelog_data.ast.literal_eval',
+                       wraps=literal_eval) as evaluate:
+                meta = result.releases[1].meta
+                meta["type"] = "changed"
+                self.assertEqual(result.releases[3].meta,
+                                 {'type': 'fix', 'note': "it's"})
+                self.assertEqual(result.releases[1].meta,
+                                 {'type': 'fix', 'note': "it's"})
+            evaluate.assert_not_called()
+
+            releases = result.to_dict()["releases"]
+            self.assertEqual(releases["1.2.3"],
+                             [{"upload_time": "2022-07-31",
+                               "meta": {'type': 'fix', 'note': "it's"}}])
+            self.assertEqual(releases["1.2.2"],
+                             [{"upload_time": "2022-07-30"}])
+
+            release = self.ev.get_release(changelog_file=changelog,
+                                          version="1.2.1")
+            self.assertEqual(release.to_dict()["info"]["meta"],
+                             {'type': 'fix', 'note': "it's"})
+
+    @params(
+        ("<!-- meta =\n{'a': 1} -->\n", {}),
+        ("<!-- meta = {'a': 1}\n-->\n", {}),
+        ("<!--\nmeta = {'a': 1} -->\n", {}),
+        ("<!-- meta = {'a': 1}\r-->\r\n", {}),
+        ("<!-- Links -->\n<!-- meta = {'a': 1} -->\n", {'a': 1}),
+        ("<!--\tmeta = {'a': 1} -->\r\n", {'a': 1}),
+    )
+    def test_meta_comment_engine_parity(self,
+                                        comment: str,
+                                        expectation: Dict[str, int]) -> None:
+        """Test all engines find only meta comments on a single line"""
+        content = ("## [1.3.0] - 2022-10-26\n- added\n"
+                   "## [1.2.3] - 2022-07-31\n" + comment + "- fixed\n"
+                   "## [1.2.2] - 2022-07-30\n- fixed\n")
+
+        with TemporaryDirectory() as tmp_dir:
+            changelog = Path(tmp_dir) / 'changelog.md'
+            changelog.write_bytes(content.encode())
+
+            for engine, index_file in (("line", None),
+                                       ("mmap", None),
+                                       ("line", Path(tmp_dir) / 'c.idx')):
+                self.ev.engine = engine
+                self.ev.index_file = index_file
+
+                result = self.ev.parse(changelog_file=changelog)
+                self.assertEqual([r.meta for r in result.releases],
+                                 [{}, expectation, {}],
+                                 msg=engine)
+                release = self.ev.get_release(changelog_file=changelog,
+                                              version="1.2.3")
+                self.assertEqual(release.meta, expectation, msg=engine)
+
+    @params(
+        ("\r\n", None),
+        ("\r\n", r"^## \[.*\] - \d{4}-\d{2}-\d{2}$"),
+        ("\r", r"^## \[.*\] - \d{4}-\d{2}-\d{2}$"),
+        ("\n", r"^## \[.*\] - \d{4}-\d{2}-\d{2}$"),
+    )
+    def test_line_ending_engine_parity(self,
+                                       newline: str,
+                                       regex: Optional[str]) -> None:
+        """Test the engines agree on changelogs with any line endings"""
+        changelog = self._here / 'data' / 'valid' / 'changelog_with_meta.md'
+        content = changelog.read_text().replace("\n", newline)
+
+        with TemporaryDirectory() as tmp_dir:
+            changelog = Path(tmp_dir) / 'changelog.md'
+            changelog.write_bytes(content.encode())
+
+            results = {}
+            for engine in ENGINES:
+                ev = ExtractVersion()
+                ev.engine = engine
+                if regex is not None:
+                    ev.version_line_regex = regex
+
+                result = ev.parse(changelog_file=changelog, descriptions=True)
+                results[engine] = (
+                    result.version,
+                    result.description,
+                    result.meta,
+                    [(r.version, r.date, r.description, r.meta)
+                     for r in result.releases],
+                    ev.get_release(changelog_file=changelog,
+                                   version="1.2.3").description,
+                )
+
+        self.assertEqual(results["line"][0], "1.3.0")
+        self.assertGreater(len(results["line"][3]), 1)
+        self.assertEqual(results["mmap"], results["line"])
+
+    @params(
+        ("\r\n", None),
+        ("\r\n", r"^## \[.*\] - \d{4}-\d{2}-\d{2}$"),
+        ("\r", r"^## \[.*\] - \d{4}-\d{2}-\d{2}$"),
+    )
+    def test_line_ending_index_parity(self,
+                                      newline: str,
+                                      regex: Optional[str]) -> None:
+        """Test an index file does not change the result of any line ending"""
+        changelog = self._here / 'data' / 'valid' / 'changelog_with_meta.md'
+        content = changelog.read_text().replace("\n", newline)
+        head = "## [2.0.0] - 2023-01-01\n- changed\n".replace("\n", newline)
+
+        with TemporaryDirectory() as tmp_dir:
+            changelog = Path(tmp_dir) / 'changelog.md'
+
+            # the index is created and updated for prepended releases
+            for text in (content, head + content):
+                changelog.write_bytes(text.encode())
+
+                results = {}
+                for engine, index_file in (("line", None),
+                                           ("line", Path(tmp_dir) / 'l.idx'),
+                                           ("mmap", Path(tmp_dir) / 'm.idx')):
+                    ev = ExtractVersion()
+                    ev.engine = engine
+                    ev.index_file = index_file
+                    if regex is not None:
+                        ev.version_line_regex = regex
+
+                    result = ev.parse(changelog_file=changelog)
+                    results[engine, index_file] = (
+                        result.version,
+                        result.description,
+                        result.meta,
+                        [(r.version, r.date, r.meta)
+                         for r in result.releases],
+                        ev.get_release(changelog_file=changelog,
+                                       version="1.2.3").description,
+                    )
+
+                expectation = results.pop(("line", None))
+                self.assertGreater(len(expectation[3]), 1)
+                for key, result in results.items():
+                    self.assertEqual(result, expectation, msg=key)
+
+    def test_get_release_empty_file(self) -> None:
+        """Test getting a release of an empty changelog"""
+        with TemporaryDirectory() as tmp_dir:
+            changelog = Path(tmp_dir) / 'changelog.md'
+            changelog.write_text("")
+            self.ev.index_file = Path(tmp_dir) / 'changelog.idx'
+
+            self.assertIsNone(self.ev.get_release(changelog_file=changelog))
+            self.assertEqual(self.ev.parse(changelog).version, "0.0.0")
+
+    def test_engine(self) -> None:
+        """Test property engine"""
+        self.assertEqual(self.ev.engine, "line")
+
+        self.ev.engine = "mmap"
+        self.assertEqual(self.ev.engine, "mmap")
+
+        with self.assertRaises(ExtractVersionError):
+            self.ev.engine = "asdf"
+        self.assertEqual(self.ev.engine, "mmap")
+
+    @params(
+        ("changelog_with_date.md", ),
+        ("changelog_with_date_and_time.md", ),
+        ("changelog_with_meta.md", ),
+    )
+    def test_parse_changelog_completely_mmap(self, file_name: str) -> None:
+        """Test mmap engine returns the same result as the line engine"""
+        changelog = self._here / 'data' / 'valid' / file_name
+        mmap_ev = ExtractVersion(logger=self.test_logger)
+        mmap_ev.engine = "mmap"
+
+        for first_line_only in [False, True]:
+            expectation = self.ev.parse_changelog_completely(
+                changelog_file=changelog,
+                first_line_only=first_line_only)
+            result = mmap_ev.parse_changelog_completely(
+                changelog_file=changelog,
+                first_line_only=first_line_only)
+
+            self.assertEqual(result, expectation)
+            self.assertEqual(mmap_ev.latest_description_lines,
+                             self.ev.latest_description_lines)
+            self.assertEqual(mmap_ev.meta_data, self.ev.meta_data)
+
+    @params(
+        ("", [], []),
+        ("# Changelog\n", [], []),
+        (
+            "# Changelog\r\n## [1.2.3] - 2022-07-31\r\n- fixed  \r\n\r\n",
+            ["## [1.2.3] - 2022-07-31"],
+            ["- fixed", ""]
+        ),
+        (
+            "## [1.2.3] - 2022-07-31\n- fixed \u00e4\u00f6\u00fc\n"
+            "## [1.0.0] - 2022-07-30",
+            ["## [1.2.3] - 2022-07-31", "## [1.0.0] - 2022-07-30"],
+            ["- fixed \u00e4\u00f6\u00fc"]
+        ),
+    )
+    def test_parse_changelog_completely_mmap_content(
+            self,
+            content: str,
+            expectation: List[str],
+            expected_description_lines: List[str]) -> None:
+        """Test mmap engine with special file content"""
+        mmap_ev = ExtractVersion(logger=self.test_logger)
+        mmap_ev.engine = "mmap"
+
+        with TemporaryDirectory() as tmp_dir:
+            changelog = Path(tmp_dir) / "changelog.md"
+            changelog.write_bytes(content.encode())
+
+            result = mmap_ev.parse_changelog_completely(
+                changelog_file=changelog)
+            line_result = self.ev.parse_changelog_completely(
+                changelog_file=changelog)
+
+        self.assertEqual(result, expectation)
+        self.assertEqual(result, line_result)
+        self.assertEqual(mmap_ev.latest_description_lines,
+                         expected_description_lines)
+        self.assertEqual(mmap_ev.latest_description_lines,
+                         self.ev.latest_description_lines)
+
+    def test_parse_changelog_completely_mmap_multiline_regex(self) -> None:
+        """Test mmap engine falls back to line scanning for multiline match"""
+        content = "## [1.2.3]\n- fixed\n## [1.2.2] - fixed\n"
+        self.ev.version_line_regex = r"## \[\d\.\d\.\d\]\s+- fixed"
+        self.ev.engine = "mmap"
+
+        with TemporaryDirectory() as tmp_dir:
+            changelog = Path(tmp_dir) / "changelog.md"
+            changelog.write_text(content)
+
+            result = self.ev.parse_changelog_completely(
+                changelog_file=changelog)
+
+        self.assertEqual(result, ["## [1.2.2] - fixed"])
+
     @params(
         # valid semver release version lines
         ("## [1.2.3] - 2012-01-02", "## [1.2.3] - 2012-01-02"),
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""Unittest for testing the release_query file"""
+
+import random
+import unittest
+from typing import Iterator, List
+
+from nose2.tools import params
+
+from changelog2version.changelog_data import Release
+from changelog2version.release_query import ReleaseIndex, ReleaseQuery
+from changelog2version.semver_batch import precedence_key
+
+
+def create_releases(versions_and_dates: List[tuple]) -> List[Release]:
+    """
+    Create releases without sections
+
+    :param      versions_and_dates:  The versions with their dates
+    :type       versions_and_dates:  List[tuple]
+
+    :returns:   Releases in the given order
+    :rtype:     List[Release]
+    """
+    return [Release(version=version,
+                    date=date,
+                    section="",
+                    section_start=None,
+                    section_end=None,
+                    buffer=None,
+                    meta_comment=None)
+            for version, date in versions_and_dates]
+
+
+class TestReleaseQuery(unittest.TestCase):
+
+    def setUp(self) -> None:
+        """Run before every test method"""
+        random.seed(42)
+        # reverse chronological order like in a changelog
+        self._releases = create_releases([
+            ("2.0.0", "2023-03-01"),
+            ("2.0.0-rc.1", "2023-02-01T10:00:00"),
+            ("1.10.0", "2023-01-01"),
+            ("1.2.0", "2022-06-01"),
+            ("1.1.0", "2022-03-01"),
+            ("1.0.0", "2022-01-01"),
+        ])
+        self._consumed = []
+
+    def _iter_releases(self) -> Iterator[Release]:
+        """
+        Iterate over the releases and record the consumed ones
+
+        :returns:   Generator of the releases in changelog order
+        :rtype:     Iterator[Release]
+        """
+        for release in self._releases:
+            self._consumed.append(release.version)
+            yield release
+
+    @params(
+        ({}, ["2.0.0", "2.0.0-rc.1", "1.10.0", "1.2.0", "1.1.0", "1.0.0"], 6),
+        ({"since_version": "1.2.0"}, ["2.0.0", "2.0.0-rc.1", "1.10.0",
+                                      "1.2.0"], 6),
+        ({"until_version": "1.10.0"}, ["1.10.0", "1.2.0", "1.1.0",
+                                       "1.0.0"], 6),
+        ({"until_version": "2.0.0-rc.1",
+          "since_version": "1.10.0"}, ["2.0.0-rc.1", "1.10.0"], 6),
+        ({"since_date": "2023-01-01"}, ["2.0.0", "2.0.0-rc.1", "1.10.0"], 6),
+        ({"since_date": "2023-02-01"}, ["2.0.0", "2.0.0-rc.1"], 6),
+        ({"limit": 2}, ["2.0.0", "2.0.0-rc.1"], 2),
+        ({"until_version": "1.5.0", "limit": 1}, ["1.2.0"], 4),
+        ({"since_version": "3.0.0"}, [], 6),
+    )
+    def test_filter(self,
+                    options: dict,
+                    expectation: List[str],
+                    consumed: int) -> None:
+        """Test selecting releases stops only at the limit"""
+        query = ReleaseQuery(**options)
+
+        result = [r.version for r in query.filter(self._iter_releases())]
+
+        self.assertEqual(result, expectation)
+        self.assertEqual(len(self._consumed), consumed)
+
+        index = ReleaseIndex(self._releases)
+        self.assertEqual([r.version for r in index.select(query)],
+                         expectation)
+
+    @params(
+        ({"since_version": "2.0.0"}, ["2.0.1", "2.0.0"]),
+        ({"until_version": "1.5.3"}, ["1.5.3", "1.5.2"]),
+        ({"since_version": "1.5.3", "until_version": "2.0.0"},
+         ["1.5.3", "2.0.0"]),
+        ({"since_date": "2023-02-01"}, ["2.0.1", "1.5.3"]),
+        ({"since_version": "1.5.0", "limit": 3}, ["2.0.1", "1.5.3", "2.0.0"]),
+    )
+    def test_backports(self, options: dict, expectation: List[str]) -> None:
+        """Test backported releases between newer ones are selected"""
+        releases = create_releases([
+            ("2.0.1", "2023-03-01"),
+            ("1.5.3", "2023-02-15"),
+            ("2.0.0", "2023-01-01"),
+            ("1.5.2", "2022-12-01"),
+        ])
+        query = ReleaseQuery(**options)
+
+        self.assertEqual([r.version for r in query.filter(releases)],
+                         expectation)
+        self.assertEqual(
+            [r.version for r in ReleaseIndex(releases).select(query)],
+            expectation)
+
+    def test_select_unordered(self) -> None:
+        """Test bisection selects like a complete scan in any order"""
+        releases = create_releases([
+            ("{}.{}.{}".format(random.randrange(5), random.randrange(5),
+                               random.randrange(3)),
+             "2022-{:02d}-{:02d}".format(random.randrange(1, 13),
+                                         random.randrange(1, 29)))
+            for _ in range(200)])
+        index = ReleaseIndex(releases)
+
+        for _ in range(50):
+            since_version = "{}.{}.0".format(random.randrange(5),
+                                             random.randrange(5))
+            until_version = "{}.{}.1".format(random.randrange(5),
+                                             random.randrange(5))
+            since_date = "2022-{:02d}-15".format(random.randrange(1, 13))
+            query = ReleaseQuery(since_version=since_version,
+                                 until_version=until_version,
+                                 since_date=since_date,
+                                 limit=random.choice([None, 3]))
+
+            expectation = [
+                r for r in releases
+                if precedence_key(since_version) <= precedence_key(
+                    r.version) <= precedence_key(until_version) and
+                r.date >= since_date]
+            if query.limit is not None:
+                expectation = expectation[:query.limit]
+
+            self.assertEqual(list(index.select(query)), expectation)
+
+    @params(
+        ({"since_version": "1.2"}, "Invalid SemVer string: '1.2'"),
+        ({"until_version": "v1.2.3"}, "Invalid SemVer string: 'v1.2.3'"),
+        ({"since_date": "19.05.2022"}, "Invalid ISO8601 date: '19.05.2022'"),
+        ({"limit": 0}, "Limit has to be at least 1"),
+    )
+    def test_invalid(self, options: dict, message: str) -> None:
+        """Test invalid queries"""
+        with self.assertRaises(ValueError) as context:
+            ReleaseQuery(**options)
+
+        self.assertEqual(message, str(context.exception))
+
+    def test_dict(self) -> None:
+        """Test query of the given options only"""
+        self.assertIsNone(ReleaseQuery.from_dict({"limit": None, "x": 1}))
+
+        query = ReleaseQuery.from_dict({"since_version": "1.2.3",
+                                        "limit": 5,
+                                        "command": "parse"})
+        self.assertEqual(query, ReleaseQuery(since_version="1.2.3", limit=5))
+        self.assertEqual(query.to_dict(), {"since_version": "1.2.3",
+                                           "limit": 5})
+
+
+if __name__ == '__main__':
+    unittest.main()
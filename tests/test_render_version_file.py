@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""Unittest for testing the render_version_file file"""
+
+import os
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from changelog2version.render_version_file import (RenderTarget,
+                                                   RenderVersionFile,
+                                                   create_version_file_content,
+                                                   file_content_equals,
+                                                   get_environment,
+                                                   render_files,
+                                                   select_template_file,
+                                                   validate_files,
+                                                   write_file_if_changed)
+from unittest.mock import patch
+
+from nose2.tools import params
+from semver import VersionInfo
+
+
+class TestRenderVersionFile(unittest.TestCase):
+
+    def setUp(self) -> None:
+        """Run before every test method"""
+        self._tmp_dir = TemporaryDirectory()
+        self._dir = Path(self._tmp_dir.name)
+
+        self.content = create_version_file_content(
+            semver_data=VersionInfo.parse("1.2.3-rc.1"),
+            additional_version_info="-dev",
+            additional_template_data={"key": "value"})
+
+    def tearDown(self) -> None:
+        """Run after every test method"""
+        self._tmp_dir.cleanup()
+
+    def test_create_version_file_content(self) -> None:
+        """Test creating the template content"""
+        self.assertEqual(self.content, {
+            "major_version": 1,
+            "minor_version": 2,
+            "patch_version": 3,
+            "prerelease_data": "rc.1",
+            "build_data": None,
+            "additional_data": " + '-dev'",
+            "key": "value",
+        })
+
+    def test_select_template_file(self) -> None:
+        """Test selecting a template file"""
+        self.assertEqual(select_template_file(None, "py"),
+                         "version.py.template")
+        self.assertEqual(select_template_file(None, "c"),
+                         "version.h.template")
+        self.assertEqual(select_template_file("custom.template", "c"),
+                         "custom.template")
+
+        with self.assertRaises(KeyError):
+            select_template_file(None, "rs")
+
+    @params(
+        (1, ),
+        (2, ),
+    )
+    def test_render_files(self, workers: int) -> None:
+        """Test rendering several files with the same content"""
+        targets = [
+            RenderTarget(file_path=self._dir / 'version.py',
+                         template="version.py.template"),
+            RenderTarget(file_path=self._dir / 'include' / 'version.h',
+                         template="version.h.template"),
+        ]
+
+        rendered = render_files(targets=targets,
+                                content=self.content,
+                                workers=workers)
+
+        self.assertEqual(len(rendered), 2)
+        for target, content in zip(targets, rendered):
+            self.assertEqual(target.file_path.read_text(), content)
+        self.assertIn('__version_info__ = ("1", "2", "3")', rendered[0])
+        self.assertIn("+ '-dev'", rendered[0])
+        self.assertIn("#define MAJOR_VERSION   1", rendered[1])
+        # content of the caller is not modified by rendering
+        self.assertNotIn("file_name", self.content)
+
+        self.assertEqual(validate_files(targets=targets,
+                                        content=self.content,
+                                        workers=workers),
+                         [True, True])
+
+        targets[1].file_path.write_text("")
+        self.assertEqual(validate_files(targets=targets,
+                                        content=self.content,
+                                        workers=workers),
+                         [True, False])
+
+    @params(
+        (1, ),
+        (4, ),
+    )
+    def test_validate_files(self, workers: int) -> None:
+        """Test each template is only rendered once per file name"""
+        targets = [
+            RenderTarget(file_path=self._dir / str(index) / 'version.py',
+                         template="version.py.template")
+            for index in range(6)
+        ]
+        render_files(targets=targets, content=self.content)
+        targets[2].file_path.write_text("")
+        targets[3].file_path.unlink()
+        targets[4].file_path.write_bytes(
+            targets[4].file_path.read_bytes().replace(b"1", b"2"))
+
+        with patch.object(RenderVersionFile, 'render_file',
+                          autospec=True,
+                          side_effect=RenderVersionFile.render_file) as render:
+            results = validate_files(targets=targets,
+                                     content=self.content,
+                                     workers=workers)
+
+        self.assertEqual(results, [True, True, False, False, False, True])
+        self.assertEqual(render.call_count, 1)
+
+    def test_render_files_without_saving(self) -> None:
+        """Test rendering several files without saving them"""
+        targets = [RenderTarget(file_path=self._dir / 'version.py',
+                                template="version.py.template")]
+
+        rendered = render_files(targets=targets,
+                                content=self.content,
+                                save_file=False)
+
+        self.assertIn('__version_info__ = ("1", "2", "3")', rendered[0])
+        self.assertFalse(targets[0].file_path.exists())
+
+    def test_environment_cache(self) -> None:
+        """Test jinja2 environments are shared across renderings"""
+        template = self._dir / 'custom.template'
+        template.write_text("{{ major_version }}")
+
+        first_renderer = RenderVersionFile()
+        first_renderer.render_file(file_path=self._dir / 'first.txt',
+                                   content=dict(self.content),
+                                   template=template)
+        second_renderer = RenderVersionFile()
+        second_renderer.render_file(file_path=self._dir / 'second.txt',
+                                    content=dict(self.content),
+                                    template=template)
+
+        self.assertIs(first_renderer._env, second_renderer._env)
+        self.assertIs(first_renderer._env,
+                      get_environment(template_path=self._dir.resolve()))
+        self.assertEqual(second_renderer.content, "1")
+
+        # changed templates are compiled again
+        template.write_text("{{ minor_version }}")
+        stat = template.stat()
+        os.utime(template, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        second_renderer.render_file(file_path=self._dir / 'second.txt',
+                                    content=dict(self.content),
+                                    template=template)
+        self.assertEqual(second_renderer.content, "2")
+
+    def test_bytecode_cache(self) -> None:
+        """Test compiled templates are cached on disk"""
+        bytecode_cache_dir = self._dir / 'cache'
+        file_renderer = RenderVersionFile(
+            bytecode_cache_dir=str(bytecode_cache_dir))
+        self.assertEqual(file_renderer.bytecode_cache_dir,
+                         bytecode_cache_dir.resolve())
+
+        file_renderer.render_file(file_path=self._dir / 'version.py',
+                                  content=dict(self.content),
+                                  template="version.py.template")
+
+        self.assertEqual(len(list(bytecode_cache_dir.iterdir())), 1)
+        # environments with and without bytecode cache are not shared
+        template_path = file_renderer.default_template_path.resolve()
+        self.assertIsNot(file_renderer._env,
+                         get_environment(template_path=template_path))
+
+    def test_write_file_if_changed(self) -> None:
+        """Test files are only written if their content changed"""
+        file_path = self._dir / 'include' / 'version.h'
+
+        self.assertTrue(write_file_if_changed(file_path=file_path,
+                                              data=b"1.2.3\n"))
+        self.assertEqual(file_path.read_bytes(), b"1.2.3\n")
+
+        file_path.chmod(0o640)
+        stat = file_path.stat()
+        os.utime(file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns - 10**9))
+        stat = file_path.stat()
+
+        self.assertFalse(write_file_if_changed(file_path=file_path,
+                                               data=b"1.2.3\n"))
+        self.assertEqual(file_path.stat().st_mtime_ns, stat.st_mtime_ns)
+
+        self.assertTrue(write_file_if_changed(file_path=file_path,
+                                              data=b"1.2.4\n"))
+        self.assertEqual(file_path.read_bytes(), b"1.2.4\n")
+        self.assertNotEqual(file_path.stat().st_mtime_ns, stat.st_mtime_ns)
+        self.assertEqual(file_path.stat().st_mode & 0o777, 0o640)
+
+        # no temporary files are left
+        self.assertEqual(os.listdir(file_path.parent), ['version.h'])
+
+    def test_file_content_equals(self) -> None:
+        """Test file content comparison"""
+        file_path = self._dir / 'version.h'
+
+        self.assertFalse(file_content_equals(file_path=file_path, data=b""))
+
+        file_path.write_bytes(b"1.2.3\n")
+        self.assertTrue(file_content_equals(file_path=file_path,
+                                            data=b"1.2.3\n"))
+        self.assertFalse(file_content_equals(file_path=file_path,
+                                             data=b"1.2.4\n"))
+        self.assertFalse(file_content_equals(file_path=file_path,
+                                             data=b"1.2.3"))
+
+    def test_render_file_unchanged(self) -> None:
+        """Test rendering an unchanged file keeps the file untouched"""
+        file_path = self._dir / 'version.py'
+        file_renderer = RenderVersionFile()
+        file_renderer.render_file(file_path=file_path,
+                                  content=dict(self.content),
+                                  template="version.py.template")
+        stat = file_path.stat()
+        os.utime(file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns - 10**9))
+        stat = file_path.stat()
+
+        file_renderer.render_file(file_path=file_path,
+                                  content=dict(self.content),
+                                  template="version.py.template")
+
+        self.assertEqual(file_path.stat().st_mtime_ns, stat.st_mtime_ns)
+        self.assertEqual(file_path.read_bytes(),
+                         file_renderer.content.encode())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""Unittest for testing the semver_batch file"""
+
+import random
+import unittest
+from array import array
+from functools import cmp_to_key
+
+from nose2.tools import params
+from semver import VersionInfo
+
+from changelog2version.extract_version import ExtractVersion
+from changelog2version.semver_batch import (VersionArray, compare_versions,
+                                            sort_versions)
+
+# versions in ascending precedence of the SemVer 2.0.0 specification
+SPEC_ORDER = [
+    "1.0.0-alpha",
+    "1.0.0-alpha.1",
+    "1.0.0-alpha.beta",
+    "1.0.0-beta",
+    "1.0.0-beta.2",
+    "1.0.0-beta.11",
+    "1.0.0-rc.1",
+    "1.0.0",
+    "2.0.0",
+    "2.1.0",
+    "2.1.1",
+]
+
+
+class TestSemverBatch(unittest.TestCase):
+
+    def setUp(self) -> None:
+        """Run before every test method"""
+        random.seed(42)
+        self._versions = SPEC_ORDER + [
+            "0.0.0",
+            "0.2.0",
+            "1.0.0-0",
+            "1.0.0-0.3.7",
+            "1.0.0-x.7.z.92",
+            "1.0.0-x-y-z.--",
+            "1.0.0-alpha+001",
+            "1.0.0+20130313144700",
+            "1.0.0-beta+exp.sha.5114f85",
+            "1.0.0-alpha.1.2",
+            "1.0.0-a.10",
+            "1.0.0-a.9",
+            "1.0.0-A",
+            "1.0.0-a",
+            "10.0.0",
+            "9.10.0",
+            "9.9.100",
+        ]
+
+    def test_sort_like_semver(self) -> None:
+        """Test sorting by precedence like the semver package"""
+        self.assertEqual(sort_versions(reversed(SPEC_ORDER)), SPEC_ORDER)
+
+        key = cmp_to_key(lambda a, b: VersionInfo.parse(a).compare(b))
+        for _ in range(20):
+            random.shuffle(self._versions)
+
+            self.assertEqual(sort_versions(self._versions),
+                             sorted(self._versions, key=key))
+            self.assertEqual(sort_versions(self._versions, reverse=True),
+                             sorted(self._versions, key=key, reverse=True))
+
+    def test_compare_like_semver(self) -> None:
+        """Test comparing by precedence like the semver package"""
+        versions = VersionArray(self._versions)
+
+        for other in self._versions:
+            self.assertEqual(
+                versions.compare(other),
+                [VersionInfo.parse(v).compare(other) for v in self._versions])
+            self.assertEqual(compare_versions(self._versions[0], other),
+                             VersionInfo.parse(self._versions[0]).compare(
+                                 other))
+
+        others = list(reversed(self._versions))
+        self.assertEqual(
+            versions.compare(VersionArray(others)),
+            [VersionInfo.parse(a).compare(b)
+             for a, b in zip(self._versions, others)])
+
+        with self.assertRaises(ValueError):
+            versions.compare(VersionArray(["1.2.3"]))
+
+    def test_columns(self) -> None:
+        """Test compact columns with interned prerelease keys"""
+        versions = VersionArray(["1.2.3-rc.1", "4.5.6", "7.8.9-rc.1+build"])
+
+        self.assertEqual(len(versions), 3)
+        self.assertEqual(versions[1], "4.5.6")
+        self.assertEqual(list(versions), versions.versions)
+        self.assertEqual(versions.major, array('Q', [1, 4, 7]))
+        self.assertEqual(versions.minor, array('Q', [2, 5, 8]))
+        self.assertEqual(versions.patch, array('Q', [3, 6, 9]))
+
+        keys = versions.precedence_keys()
+        self.assertIs(keys[0][3], keys[2][3])
+        self.assertEqual(versions.argsort(), [0, 1, 2])
+        self.assertEqual(versions.argsort(reverse=True), [2, 1, 0])
+
+    def test_number_overflow(self) -> None:
+        """Test numbers beyond 64 bit are kept in lists"""
+        huge = "99999999999999999999999.999999999999999999.99999999999999999"
+        versions = VersionArray([huge, "18446744073709551615.0.0"])
+
+        self.assertIsInstance(versions.major, list)
+        self.assertIsInstance(versions.minor, array)
+        self.assertEqual(versions.major[0], 99999999999999999999999)
+        self.assertEqual(versions.sorted(), [versions[1], huge])
+
+    def test_empty(self) -> None:
+        """Test no versions"""
+        versions = VersionArray([])
+
+        self.assertEqual(len(versions), 0)
+        self.assertEqual(versions.sorted(), [])
+        self.assertEqual(versions.compare("1.2.3"), [])
+
+    @params(
+        ("",),
+        ("1.2",),
+        ("01.1.1",),
+        ("1.2.3.DEV",),
+        ("1.0.0-alpha..1",),
+        ("1.0.0-01",),
+        ("9.8.7+meta+meta",),
+        ("1.2.3\n1.2.4",),
+        ("1.2.3\n",),
+        (" 1.2.3",),
+    )
+    def test_invalid(self, version: str) -> None:
+        """Test invalid versions like the version line regex of the parser"""
+        semver_line_pattern = ExtractVersion().semver_line_pattern
+        self.assertIsNone(semver_line_pattern.fullmatch(version))
+
+        for versions in ([version], ["1.2.3", version, "1.2.4"],
+                         ["1.2.3", version]):
+            with self.assertRaises(ValueError) as context:
+                VersionArray(versions)
+            self.assertEqual("Invalid SemVer string: '{}'".format(version),
+                             str(context.exception))
+
+    def test_valid_like_version_line_regex(self) -> None:
+        """Test valid versions like the version line regex of the parser"""
+        semver_line_pattern = ExtractVersion().semver_line_pattern
+
+        for version in self._versions:
+            self.assertIsNotNone(semver_line_pattern.fullmatch(version))
+        self.assertEqual(len(VersionArray(self._versions)),
+                         len(self._versions))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""Unittest for testing the server file"""
+
+import socket
+import threading
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from changelog2version.extract_version import ExtractVersion
+
+
+@unittest.skipUnless(hasattr(socket, "AF_UNIX"),
+                     "Unix domain sockets not supported")
+class TestServer(unittest.TestCase):
+
+    def setUp(self) -> None:
+        """Run before every test method"""
+        from changelog2version.server import ChangelogServer
+
+        self._tmp_dir = TemporaryDirectory()
+        self._dir = Path(self._tmp_dir.name)
+
+        self.changelog = self._dir / 'changelog.md'
+        self.changelog.write_text("## [1.2.3] - 2022-07-31\n### Added\n- x\n")
+        self.version_file = self._dir / 'version.py'
+
+        self.server = ChangelogServer(socket_file=self._dir / 'server.sock')
+        self._thread = threading.Thread(target=self.server.serve_forever)
+        self._thread.start()
+
+    def tearDown(self) -> None:
+        """Run after every test method"""
+        self.server.shutdown()
+        self._thread.join()
+        self.server.server_close()
+        self._tmp_dir.cleanup()
+
+    def _request(self, **request) -> dict:
+        """
+        Send a request to the test server
+
+        :param      request:  The request
+        :type       request:  dict
+
+        :returns:   Response of the server
+        :rtype:     dict
+        """
+        from changelog2version.server import send_request
+
+        return send_request(socket_file=self.server.socket_file,
+                            request=request,
+                            timeout=10)
+
+    def test_socket_file(self) -> None:
+        """Test socket is only accessible by its user"""
+        self.assertTrue(self.server.socket_file.is_socket())
+        self.assertEqual(self.server.socket_file.stat().st_mode & 0o777,
+                         0o600)
+        self.assertEqual(self._request(command="ping"), {"ok": True})
+
+    def test_parse_cached(self) -> None:
+        """Test changelogs are only parsed again after a change"""
+        with patch.object(ExtractVersion, 'parse', autospec=True,
+                          side_effect=ExtractVersion.parse) as parse:
+            for _ in range(3):
+                response = self._request(command="parse",
+                                         changelog_file=str(self.changelog))
+                self.assertEqual(response["changelog"]["info"]["version"],
+                                 "1.2.3")
+            self.assertEqual(parse.call_count, 1)
+
+            self.changelog.write_text("## [1.3.0] - 2022-08-01\n")
+            response = self._request(command="parse",
+                                     changelog_file=str(self.changelog))
+            self.assertEqual(response["changelog"]["info"]["version"],
+                             "1.3.0")
+            self.assertEqual(parse.call_count, 2)
+
+    def test_parse_query(self) -> None:
+        """Test queries select releases of the cached changelog"""
+        from changelog2version.server import ServerError
+
+        self.changelog.write_text("## [1.3.0] - 2022-10-26\n"
+                                  "## [1.2.3] - 2022-07-31\n"
+                                  "## [1.2.2] - 2022-07-30\n")
+
+        with patch.object(ExtractVersion, 'parse', autospec=True,
+                          side_effect=ExtractVersion.parse) as parse:
+            for query, expectation in (
+                    ({}, ["1.3.0", "1.2.3", "1.2.2"]),
+                    ({"since_version": "1.2.3"}, ["1.3.0", "1.2.3"]),
+                    ({"since_date": "2022-07-31", "limit": 1}, ["1.3.0"])):
+                response = self._request(command="parse",
+                                         changelog_file=str(self.changelog),
+                                         **query)
+                self.assertEqual(
+                    list(response["changelog"]["releases"].keys()),
+                    expectation)
+                self.assertEqual(response["changelog"]["info"]["version"],
+                                 "1.3.0")
+            self.assertEqual(parse.call_count, 1)
+
+        with self.assertRaises(ServerError):
+            self._request(command="parse",
+                          changelog_file=str(self.changelog),
+                          since_version="1.2")
+
+    def test_release(self) -> None:
+        """Test requesting a single release"""
+        from changelog2version.server import ServerError
+
+        self.changelog.write_text("## [1.3.0] - 2022-10-26\n- added\n"
+                                  "## [1.2.3] - 2022-07-31\n- fixed\n")
+
+        response = self._request(command="parse",
+                                 changelog_file=str(self.changelog),
+                                 release="1.2.3")
+        self.assertEqual(response["changelog"]["info"]["version"], "1.2.3")
+        self.assertEqual(response["changelog"]["info"]["description"],
+                         "- fixed")
+
+        with self.assertRaises(ServerError):
+            self._request(command="parse",
+                          changelog_file=str(self.changelog),
+                          release="9.9.9")
+
+        response = self._request(command="parse",
+                                 changelog_file=str(self.changelog),
+                                 descriptions=True)
+        self.assertEqual(
+            response["changelog"]["releases"]["1.2.3"],
+            [{"upload_time": "2022-07-31", "description": "- fixed"}])
+
+    def test_render_and_validate(self) -> None:
+        """Test rendering and validating version files"""
+        targets = [{"version_file": str(self.version_file)}]
+
+        response = self._request(command="validate",
+                                 changelog_file=str(self.changelog),
+                                 targets=targets)
+        self.assertEqual(response["results"], [False])
+
+        self._request(command="render",
+                      changelog_file=str(self.changelog),
+                      targets=targets,
+                      additional_version_info="-rc1")
+        self.assertIn("-rc1", self.version_file.read_text())
+
+        response = self._request(command="validate",
+                                 changelog_file=str(self.changelog),
+                                 targets=targets,
+                                 additional_version_info="-rc1")
+        self.assertEqual(response["results"], [True])
+
+    def test_invalid_requests(self) -> None:
+        """Test invalid requests are answered with an error"""
+        from changelog2version.server import ServerError
+
+        for request in ({"command": "unknown"},
+                        {"command": "parse"},
+                        {"command": "parse", "changelog_file": "changelog.md"},
+                        {"command": "render",
+                         "changelog_file": str(self.changelog),
+                         "targets": [{"version_file": "version.py"}]},
+                        {"command": "parse",
+                         "changelog_file": str(self._dir / 'missing.md')}):
+            with self.assertRaises(ServerError):
+                self._request(**request)
+
+        self.assertFalse(self.version_file.exists())
+
+    def test_socket_file_in_use(self) -> None:
+        """Test a running server is not replaced, a stale socket file is"""
+        from changelog2version.server import ChangelogServer, ServerError
+
+        with self.assertRaises(ServerError):
+            ChangelogServer(socket_file=self.server.socket_file)
+
+        stale_socket_file = self._dir / 'stale.sock'
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.bind(str(stale_socket_file))
+
+        with ChangelogServer(socket_file=stale_socket_file) as server:
+            self.assertTrue(server.socket_file.is_socket())
+        self.assertFalse(stale_socket_file.exists())
+
+
+if __name__ == '__main__':
+    unittest.main()
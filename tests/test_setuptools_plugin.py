@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""Unittest for testing the setuptools_plugin file"""
+
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from changelog2version.extract_version import ExtractVersion
+from changelog2version.setuptools_plugin import (changelog2version_keyword,
+                                                 changelog_cache,
+                                                 update_package_version)
+from nose2.tools import params
+from setuptools.dist import Distribution
+from setuptools.errors import SetupError
+
+
+class TestSetuptoolsPlugin(unittest.TestCase):
+
+    def setUp(self) -> None:
+        """Run before every test method"""
+        self._tmp_dir = TemporaryDirectory()
+        self._dir = Path(self._tmp_dir.name)
+
+        self.changelog = self._dir / 'changelog.md'
+        self.changelog.write_text("## [1.2.3] - 2022-07-31\n")
+        changelog_cache.clear()
+
+    def tearDown(self) -> None:
+        """Run after every test method"""
+        changelog_cache.clear()
+        self._tmp_dir.cleanup()
+
+    def test_update_package_version(self) -> None:
+        """Test changelogs are only parsed again after a change"""
+        options = {"changelog_file": "changelog.md",
+                   "version_file": "src/version.py",
+                   "additional_version_info": "rc1"}
+
+        with patch.object(ExtractVersion, 'parse', autospec=True,
+                          side_effect=ExtractVersion.parse) as parse:
+            for _ in range(3):
+                self.assertEqual(update_package_version(options=options,
+                                                        root=self._dir),
+                                 "1.2.3rc1")
+            self.assertEqual(parse.call_count, 1)
+
+            self.changelog.write_text("## [1.3.0] - 2022-08-01\n")
+            self.assertEqual(update_package_version(options=options,
+                                                    root=self._dir),
+                             "1.3.0rc1")
+            self.assertEqual(parse.call_count, 2)
+
+            update_package_version(options=options,
+                                   root=self._dir,
+                                   use_cache=False)
+            self.assertEqual(parse.call_count, 3)
+
+        version_file = self._dir / 'src' / 'version.py'
+        self.assertIn('("1", "3", "0")', version_file.read_text())
+        self.assertIn("'rc1'", version_file.read_text())
+
+    def test_keyword(self) -> None:
+        """Test the keyword sets the package version"""
+        dist = Distribution({"name": "package", "version": "0.0.0"})
+        dist.src_root = str(self._dir)
+
+        changelog2version_keyword(
+            dist=dist,
+            attr="changelog2version",
+            value={"changelog_file": "changelog.md",
+                   "version_file": "version.h",
+                   "version_file_type": "c"})
+
+        self.assertEqual(dist.metadata.version, "1.2.3")
+        self.assertIn("1", (self._dir / 'version.h').read_text())
+
+    @params(
+        ("changelog.md", ),
+        ({"version_file": "version.py"}, ),
+        ({"changelog_file": "changelog.md", "unknown": 1}, ),
+        ({"changelog_file": "missing.md"}, ),
+    )
+    def test_keyword_invalid(self, value) -> None:
+        """Test invalid keyword values raise a setup error"""
+        dist = Distribution({"name": "package", "version": "0.0.0"})
+        dist.src_root = str(self._dir)
+
+        with self.assertRaises(SetupError):
+            changelog2version_keyword(dist=dist,
+                                      attr="changelog2version",
+                                      value=value)
+        self.assertEqual(dist.metadata.version, "0.0.0")
+
+
+if __name__ == '__main__':
+    unittest.main()
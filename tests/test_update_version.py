@@ -2,10 +2,25 @@
 # -*- coding: UTF-8 -*-
 """Unittest for testing the update_version file"""
 
+import json
 import logging
+import os
+import socket
+import subprocess
+import sys
+import threading
 import unittest
 from pathlib import Path
 from sys import stdout
+from tempfile import TemporaryDirectory
+from typing import List, Set
+from unittest.mock import patch
+
+import changelog2version
+from changelog2version.extract_version import ExtractVersion
+from changelog2version.update_version import main
+from changelog2version.watch import FileWatcher
+from nose2.tools import params
 
 
 class TestUpdateVersion(unittest.TestCase):
@@ -35,6 +50,390 @@ class TestUpdateVersion(unittest.TestCase):
         """Run after every test method"""
         pass
 
+    def _imported_modules(self, args: List[str]) -> Set[str]:
+        """
+        Get the modules imported by a call of the CLI
+
+        :param      args:  The CLI arguments
+        :type       args:  List[str]
+
+        :returns:   Names of all imported modules
+        :rtype:     Set[str]
+        """
+        env = dict(os.environ)
+        package_path = str(Path(changelog2version.__file__).parents[1])
+        env["PYTHONPATH"] = os.pathsep.join(
+            filter(None, [package_path, env.get("PYTHONPATH")]))
+
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime",
+             "-m", "changelog2version.update_version"] + args,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            universal_newlines=True,
+            check=True)
+
+        # lines like "import time:   123 |   456 |   package.module"
+        return {line.split("|")[-1].strip()
+                for line in result.stderr.splitlines()
+                if line.startswith("import time:")}
+
+    @params(
+        (["--print"], ),
+        (["--output", os.devnull, "--pretty"], ),
+    )
+    def test_print_without_renderer_imports(self, args: List[str]) -> None:
+        """Test printing a changelog does not import the renderer"""
+        changelog = self._here / 'data' / 'valid' / 'changelog_with_date.md'
+
+        modules = self._imported_modules(
+            ["--changelog_file", str(changelog)] + args)
+
+        self.assertIn("changelog2version.extract_version", modules)
+        for module in ("jinja2",
+                       "changelog2version.render_version_file",
+                       "changelog2version.batch",
+                       "changelog2version.changelog_index",
+                       "multiprocessing",
+                       "concurrent.futures",
+                       "fileinput",
+                       "socket",
+                       "changelog2version.release_query",
+                       "changelog2version.semver_batch"):
+            self.assertNotIn(module, modules)
+
+    def test_stamp_hit_without_renderer_imports(self) -> None:
+        """Test an unchanged call with a stamp file imports no renderer"""
+        changelog = self._here / 'data' / 'valid' / 'changelog_with_date.md'
+
+        with TemporaryDirectory() as tmp_dir:
+            args = ["--changelog_file", str(changelog),
+                    "--version_file", str(Path(tmp_dir) / 'version.py'),
+                    "--stamp_file", str(Path(tmp_dir) / 'stamp.json')]
+            modules = self._imported_modules(args)
+            self.assertIn("jinja2", modules)
+
+            modules = self._imported_modules(args)
+
+        self.assertIn("changelog2version.build_stamp", modules)
+        for module in ("jinja2",
+                       "semver",
+                       "changelog2version.api",
+                       "changelog2version.extract_version",
+                       "changelog2version.render_version_file"):
+            self.assertNotIn(module, modules)
+
+    def test_render_imports_renderer(self) -> None:
+        """Test rendering a version file imports the renderer"""
+        changelog = self._here / 'data' / 'valid' / 'changelog_with_date.md'
+
+        with TemporaryDirectory() as tmp_dir:
+            modules = self._imported_modules(
+                ["--changelog_file", str(changelog),
+                 "--version_file", str(Path(tmp_dir) / 'version.py')])
+
+        self.assertIn("jinja2", modules)
+        self.assertNotIn("changelog2version.batch", modules)
+
+    @unittest.skipUnless(hasattr(socket, "AF_UNIX"),
+                         "Unix domain sockets not supported")
+    def test_client(self) -> None:
+        """Test the client lets the server parse and render"""
+        from changelog2version.server import ChangelogServer
+
+        changelog = self._here / 'data' / 'valid' / 'changelog_with_date.md'
+
+        with TemporaryDirectory() as tmp_dir:
+            version_file = Path(tmp_dir) / 'version.py'
+            socket_file = Path(tmp_dir) / 'server.sock'
+            argv = ['changelog2version',
+                    '--connect', str(socket_file),
+                    '--changelog_file', str(changelog),
+                    '--version_file', str(version_file)]
+
+            with ChangelogServer(socket_file=socket_file) as server:
+                thread = threading.Thread(target=server.serve_forever)
+                thread.start()
+                try:
+                    modules = self._imported_modules(argv[1:] + ['--print'])
+
+                    with patch('sys.argv', argv + ['--validate']), \
+                            patch('changelog2version.update_version.stderr'):
+                        main()
+                finally:
+                    server.shutdown()
+                    thread.join()
+
+            self.assertTrue(version_file.is_file())
+            with patch('sys.argv', argv), self.assertRaises(SystemExit):
+                main()
+
+        self.assertIn("changelog2version.server", modules)
+        for module in ("changelog2version.extract_version",
+                       "changelog2version.render_version_file",
+                       "semver",
+                       "jinja2"):
+            self.assertNotIn(module, modules)
+
+    def test_stamp_file(self) -> None:
+        """Test an unchanged call is skipped with a stamp file"""
+        changelog = self._here / 'data' / 'valid' / 'changelog_with_date.md'
+
+        with TemporaryDirectory() as tmp_dir:
+            version_file = Path(tmp_dir) / 'version.py'
+            argv = ['changelog2version',
+                    '--changelog_file', str(changelog),
+                    '--version_file', str(version_file),
+                    '--stamp_file', str(Path(tmp_dir) / 'stamp.json')]
+
+            with patch('sys.argv', argv):
+                main()
+                self.assertTrue(version_file.is_file())
+
+                with patch.object(ExtractVersion, 'parse') as parse:
+                    main()
+                parse.assert_not_called()
+
+                # changed options outdate the stamp
+                with patch('sys.argv',
+                           argv + ['--additional_version_info=-rc1']):
+                    main()
+                self.assertIn("-rc1", version_file.read_text())
+
+                # changed outputs outdate the stamp
+                version_file.write_text("")
+                main()
+                self.assertIn("__version__", version_file.read_text())
+
+    @params(
+        (["--since-version", "1.3.0"], ["1.3.0"]),
+        (["--until_version", "1.2.3"], ["1.2.3"]),
+        (["--since-date", "2022-07-31", "--limit", "1"], ["1.3.0"]),
+    )
+    def test_release_query(self,
+                           args: List[str],
+                           expectation: List[str]) -> None:
+        """Test only the queried releases are output"""
+        changelog = self._here / 'data' / 'valid' / 'changelog_with_date.md'
+
+        with TemporaryDirectory() as tmp_dir:
+            output = Path(tmp_dir) / 'changelog.json'
+            argv = ['changelog2version',
+                    '--changelog_file', str(changelog),
+                    '--output', str(output)] + args
+
+            with patch('sys.argv', argv):
+                main()
+
+            changelog_data = json.loads(output.read_text())
+            self.assertEqual(changelog_data["info"]["version"], "1.3.0")
+            self.assertEqual(list(changelog_data["releases"].keys()),
+                             expectation)
+
+        for args in (["--since-version", "1.2"],
+                     ["--since-date", "yesterday"],
+                     ["--limit", "0"],
+                     ["--batch_glob", "*.md", "--limit", "1"]):
+            with patch('sys.argv', ['changelog2version',
+                                    '--changelog_file', str(changelog)] +
+                       args), \
+                    patch('sys.stderr'), \
+                    self.assertRaises(SystemExit):
+                main()
+
+    @params(
+        ("{'type': ", ),
+        ("{'scope': {'all'}}", ),
+        ("{'data': b'bytes'}", ),
+    )
+    def test_invalid_meta_of_old_release(self, payload: str) -> None:
+        """Test an invalid meta comment of an old release is skipped"""
+        with TemporaryDirectory() as tmp_dir:
+            changelog = Path(tmp_dir) / 'changelog.md'
+            changelog.write_text(
+                "## [1.3.0] - 2022-10-26\n"
+                "<!-- meta = {'type': 'feature'} -->\n- added\n"
+                "## [1.2.3] - 2022-07-31\n"
+                "<!-- meta = " + payload + " -->\n- fixed\n")
+            version_file = Path(tmp_dir) / 'version.py'
+            output = Path(tmp_dir) / 'changelog.json'
+
+            for engine in ("line", "mmap"):
+                with patch('sys.argv', ['changelog2version',
+                                        '--changelog_file', str(changelog),
+                                        '--version_file', str(version_file),
+                                        '--engine', engine]):
+                    main()
+                self.assertIn('("1", "3", "0")', version_file.read_text())
+
+                with patch('sys.argv', ['changelog2version',
+                                        '--changelog_file', str(changelog),
+                                        '--output', str(output),
+                                        '--engine', engine]), \
+                        self.assertLogs('changelog2version.changelog_data',
+                                        level=logging.WARNING):
+                    main()
+                changelog_data = json.loads(output.read_text())
+                self.assertEqual(changelog_data["info"]["meta"],
+                                 {'type': 'feature'})
+                self.assertEqual(changelog_data["releases"]["1.2.3"],
+                                 [{"upload_time": "2022-07-31"}])
+
+    @params(
+        ('[{"changelog_file": "changelog.md", "unknown": 1}]',
+         "Unknown job options: unknown"),
+        ('[{"changelog_file": ', "is no valid JSON"),
+        ('{"changelog_file": "changelog.md"}', "has to contain a list"),
+        ('["changelog.md"]', "Job has to be an object"),
+    )
+    def test_batch_invalid_jobs_file(self, content: str, message: str) -> None:
+        """Test an invalid jobs file exits with an error message"""
+        with TemporaryDirectory() as tmp_dir:
+            jobs_file = Path(tmp_dir) / 'jobs.json'
+            jobs_file.write_text(content)
+
+            with patch('sys.argv', ['changelog2version',
+                                    '--batch', str(jobs_file)]), \
+                    self.assertRaises(SystemExit) as context:
+                main()
+
+        self.assertIsInstance(context.exception.code, str)
+        self.assertIn(message, context.exception.code)
+
+    def test_release(self) -> None:
+        """Test only the given release is output"""
+        changelog = self._here / 'data' / 'valid' / 'changelog_with_date.md'
+
+        with TemporaryDirectory() as tmp_dir:
+            output = Path(tmp_dir) / 'changelog.json'
+            version_file = Path(tmp_dir) / 'version.py'
+            argv = ['changelog2version',
+                    '--changelog_file', str(changelog),
+                    '--output', str(output),
+                    '--release', '1.2.3']
+
+            with patch('sys.argv', argv):
+                main()
+
+            changelog_data = json.loads(output.read_text())
+            self.assertEqual(changelog_data["info"]["version"], "1.2.3")
+            self.assertEqual(changelog_data["urls"],
+                             [{"upload_time": "2022-07-31"}])
+            self.assertNotIn("releases", changelog_data)
+
+            # version files are still rendered with the latest release
+            with patch('sys.argv', argv + ['--version_file',
+                                           str(version_file)]):
+                main()
+            self.assertIn('("1", "3", "0")', version_file.read_text())
+
+        for args in (["--release", "9.9.9"],
+                     ["--release", "1.2"],
+                     ["--release", "1.2.3", "--limit", "1"],
+                     ["--release", "1.2.3", "--batch_glob", "*.md"]):
+            with patch('sys.argv', ['changelog2version',
+                                    '--changelog_file', str(changelog)] +
+                       args), \
+                    patch('sys.stderr'), \
+                    self.assertRaises(SystemExit):
+                main()
+
+    def test_descriptions(self) -> None:
+        """Test the descriptions of all releases are output"""
+        changelog = self._here / 'data' / 'valid' / 'changelog_with_date.md'
+
+        with TemporaryDirectory() as tmp_dir:
+            output = Path(tmp_dir) / 'changelog.json'
+            argv = ['changelog2version',
+                    '--changelog_file', str(changelog),
+                    '--output', str(output),
+                    '--engine', 'mmap',
+                    '--descriptions']
+
+            with patch('sys.argv', argv):
+                main()
+
+            changelog_data = json.loads(output.read_text())
+            releases = changelog_data["releases"]
+            self.assertEqual(releases["1.3.0"][0]["description"],
+                             changelog_data["info"]["description"])
+            self.assertTrue(all(release[0]["description"]
+                                for release in releases.values()))
+
+        with patch('sys.argv', ['changelog2version',
+                                '--changelog_file', str(changelog),
+                                '--batch_glob', '*.md',
+                                '--descriptions']), \
+                patch('sys.stderr'), \
+                self.assertRaises(SystemExit):
+            main()
+
+    def test_depfile(self) -> None:
+        """Test depfile lists changelog and template of the version file"""
+        changelog = self._here / 'data' / 'valid' / 'changelog_with_date.md'
+
+        with TemporaryDirectory() as tmp_dir:
+            version_file = Path(tmp_dir) / 'version.py'
+            template_file = Path(tmp_dir) / 'my template.py'
+            template_file.write_text("{{ major_version }}\n")
+            depfile = Path(tmp_dir) / 'version.d'
+            argv = ['changelog2version',
+                    '--changelog_file', str(changelog),
+                    '--version_file', str(version_file),
+                    '--template_file', str(template_file),
+                    '--depfile', str(depfile)]
+
+            with patch('sys.argv', argv):
+                main()
+
+            template_dir = str(template_file.resolve().parent)
+            expectation = "{}: \\\n  {} \\\n  {} \\\n  {}\n".format(
+                version_file, changelog,
+                str(template_file.resolve()).replace(" ", "\\ "),
+                template_dir.replace(" ", "\\ "))
+            self.assertEqual(depfile.read_text(), expectation)
+
+    def test_watch(self) -> None:
+        """Test watching updates only the version files of changed files"""
+        with TemporaryDirectory() as tmp_dir:
+            changelog = Path(tmp_dir) / 'changelog.md'
+            changelog.write_text("## [1.2.3] - 2022-07-31\n")
+            template_file = Path(tmp_dir) / 'version.txt.template'
+            template_file.write_text("{{ major_version }}\n")
+            version_file = Path(tmp_dir) / 'version.py'
+            info_file = Path(tmp_dir) / 'version.txt'
+            templates = Path(changelog2version.__file__).parent / 'templates'
+            argv = ['changelog2version',
+                    '--changelog_file', str(changelog),
+                    '--version_file', str(version_file),
+                    '--version_file', str(info_file),
+                    '--template_file', str(templates / 'version.py.template'),
+                    '--template_file', str(template_file),
+                    '--watch']
+
+            def changes(watcher, interval):
+                changelog.write_text("## [2.0.0] - 2022-08-01\n")
+                yield {changelog.resolve()}
+                self.assertIn('("2", "0", "0")', version_file.read_text())
+                self.assertEqual(info_file.read_text(), "2\n")
+
+                version_file.write_text("")
+                template_file.write_text("v{{ major_version }}\n")
+                yield {template_file.resolve()}
+                self.assertEqual(version_file.read_text(), "")
+                self.assertEqual(info_file.read_text(), "v2\n")
+
+                raise KeyboardInterrupt
+
+            with patch('sys.argv', argv), \
+                    patch.object(FileWatcher, 'watch', autospec=True,
+                                 side_effect=changes), \
+                    patch('changelog2version.update_version.stderr'):
+                main()
+
+            self.assertEqual(info_file.read_text(), "v2\n")
+
     @unittest.skip("Not yet implemented")
     def test_parser_valid_file(self) -> None:
         pass
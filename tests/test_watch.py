@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+"""Unittest for testing the watch file"""
+
+import os
+import threading
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from changelog2version.watch import FileWatcher, get_file_state
+
+
+class TestWatch(unittest.TestCase):
+
+    def setUp(self) -> None:
+        """Run before every test method"""
+        self._tmp_dir = TemporaryDirectory()
+        self._dir = Path(self._tmp_dir.name)
+
+        self.changelog = self._dir / 'changelog.md'
+        self.changelog.write_text("## [1.2.3] - 2022-07-31\n")
+        self.template = self._dir / 'version.py.template'
+        self.template.write_text("{{ major_version }}\n")
+
+    def tearDown(self) -> None:
+        """Run after every test method"""
+        self._tmp_dir.cleanup()
+
+    def test_get_file_state(self) -> None:
+        """Test state of existing and missing files"""
+        state = get_file_state(self.changelog)
+        self.assertEqual(state[0], self.changelog.stat().st_size)
+        self.assertIsNone(get_file_state(self._dir / 'missing.md'))
+
+    def test_poll(self) -> None:
+        """Test changed files are reported once"""
+        watcher = FileWatcher(files=[self.changelog, str(self.template)])
+        self.assertEqual(watcher.files, {self.changelog, self.template})
+        self.assertEqual(watcher.poll(), set())
+
+        # same size, only the modification time differs
+        stat = self.changelog.stat()
+        os.utime(self.changelog,
+                 ns=(stat.st_atime_ns, stat.st_mtime_ns - 10**9))
+        self.assertEqual(watcher.poll(), {self.changelog})
+        self.assertEqual(watcher.poll(), set())
+
+        self.template.unlink()
+        self.assertEqual(watcher.poll(), {self.template})
+        self.template.write_text("")
+        self.assertEqual(watcher.poll(), {self.template})
+
+    def test_watch(self) -> None:
+        """Test watching reports a change after it completed"""
+        watcher = FileWatcher(files=[self.changelog, self.template])
+
+        timer = threading.Timer(
+            0.05, self.changelog.write_text, args=("## [1.3.0]\n", ))
+        timer.start()
+        try:
+            changes = list(watcher.watch(interval=0.02, max_changes=1))
+        finally:
+            timer.cancel()
+
+        self.assertEqual(changes, [{self.changelog}])
+
+
+if __name__ == '__main__':
+    unittest.main()